@@ -7,6 +7,7 @@ from rlcard.agents.cfr_agent import CFRAgent
 from rlcard import models
 from rlcard.utils.utils import set_global_seed
 from rlcard.utils.logger import Logger
+from rlcard.utils.exploitability import exploitability
 
 # Make environment and enable human mode
 env = rlcard.make('leduc-holdem', allow_step_back=True)
@@ -52,6 +53,7 @@ for episode in range(episode_num):
 
         logger.log('\n########## Evaluation ##########')
         logger.log('Iteration: {} Average reward is {}'.format(episode, float(reward)/evaluate_num))
+        logger.log('Iteration: {} Exploitability is {}'.format(episode, exploitability(eval_env, [agent, agent])))
 
         # Add point to logger
         logger.add_point(x=env.timestep, y=float(reward)/evaluate_num)
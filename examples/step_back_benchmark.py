@@ -0,0 +1,85 @@
+''' Benchmark the cost of stepping forward and back in each game
+
+At every state of a random game, each legal action is stepped and stepped
+back, as the tree traversal of CFR does, and then a random action is taken.
+The cost is reported per step, with and without step back.
+'''
+
+import time
+import random
+import numpy as np
+
+from rlcard.games.blackjack.game import BlackjackGame
+from rlcard.games.limitholdem.game import LimitholdemGame
+from rlcard.games.leducholdem.game import LeducholdemGame
+from rlcard.games.nolimitholdem.game import NolimitholdemGame
+from rlcard.games.uno.game import UnoGame
+from rlcard.games.mahjong.game import MahjongGame
+from rlcard.games.hearts.game import HeartsGame
+
+GAMES = [('blackjack', BlackjackGame),
+         ('leduc-holdem', LeducholdemGame),
+         ('limit-holdem', LimitholdemGame),
+         ('no-limit-holdem', NolimitholdemGame),
+         ('uno', UnoGame),
+         ('mahjong', MahjongGame),
+         ('hearts', HeartsGame)]
+
+def get_legal_actions(game):
+    if isinstance(game, BlackjackGame):
+        return ['hit', 'stand']
+    if isinstance(game, MahjongGame):
+        return game.get_legal_actions(game.cur_state)
+    return game.get_legal_actions()
+
+def play(game_class, allow_step_back, max_steps=200):
+    ''' Play a random game
+
+    Returns:
+        (tuple): the number of steps and the time spent in step and step_back
+    '''
+    game = game_class(allow_step_back=allow_step_back)
+    game.init_game()
+    steps, spent = 0, 0.0
+    while not game.is_over() and steps < max_steps:
+        legal_actions = list(get_legal_actions(game))
+        if allow_step_back:
+            depth = len(game.history)
+            for action in legal_actions:
+                start = time.perf_counter()
+                game.step(action)
+                # Hearts records one more step when the game is over
+                while len(game.history) > depth:
+                    game.step_back()
+                spent += time.perf_counter() - start
+                steps += 1
+        action = legal_actions[np.random.randint(len(legal_actions))]
+        start = time.perf_counter()
+        game.step(action)
+        spent += time.perf_counter() - start
+        steps += 1
+    return steps, spent
+
+def benchmark(game_class, episode_num):
+    ''' Measure the cost per step of a game
+
+    Returns:
+        (tuple): microseconds per step without and with step back
+    '''
+    costs = []
+    for allow_step_back in (False, True):
+        total_steps, total_spent = 0, 0.0
+        for _ in range(episode_num):
+            steps, spent = play(game_class, allow_step_back)
+            total_steps += steps
+            total_spent += spent
+        costs.append(total_spent / total_steps * 1e6)
+    return costs
+
+if __name__ == '__main__':
+    random.seed(0)
+    np.random.seed(0)
+    print('{:<16}{:>20}{:>26}'.format('game', 'step (us)', 'step + step_back (us)'))
+    for name, game_class in GAMES:
+        plain, with_back = benchmark(game_class, episode_num=200)
+        print('{:<16}{:>20.1f}{:>26.1f}'.format(name, plain, with_back))
@@ -1,37 +1,91 @@
 import numpy as np
-import collections
 
 import os
-import pickle
 
+from rlcard.agents.cfr_table import CFRTable, TableView
 from rlcard.utils.utils import *
 
 class CFRAgent():
     ''' Implement CFR algorithm
+
+    The variants differ in how the regrets and the average policy are
+    accumulated:
+
+        vanilla: CFR with the average policy weighted by the iteration
+        cfr+: CFR+, the regrets are floored at zero after each update
+        linear: Linear CFR, the regrets and the average policy of iteration t
+          are weighted by t
+        dcfr: Discounted CFR, after iteration t, the positive regrets are
+          scaled by t^alpha/(t^alpha+1), the negative regrets by
+          t^beta/(t^beta+1) and the average policy by (t/(t+1))^gamma
     '''
 
-    def __init__(self, env, model_path='./cfr_model'):
+    variants = ('vanilla', 'cfr+', 'linear', 'dcfr')
+
+    def __init__(self, env, model_path='./cfr_model', variant='vanilla', alternating=None,
+                 alpha=1.5, beta=0.0, gamma=2.0, canonical=False):
         ''' Initilize Agent
 
         Args:
             env (Env): Env class
+            model_path (str): The directory to save the model
+            variant (str): The variant of CFR, one of 'vanilla', 'cfr+', 'linear' and 'dcfr'
+            alternating (boolean): True if the policy is updated after the
+              traversal of each player, instead of after the traversals of all
+              the players. Default to True except for vanilla CFR
+            alpha (float): The discount of the positive regrets in DCFR
+            beta (float): The discount of the negative regrets in DCFR
+            gamma (float): The discount of the average policy in DCFR
+            canonical (boolean): True if the information sets are keyed by the
+              canonical_key of the states, which is the same for the states
+              that only differ by a permutation of the suits. Only the poker
+              environments provide it, and it is enabled in env. The states
+              given to eval_step need it too
         '''
+        if variant not in self.variants:
+            raise ValueError('Unknown CFR variant {}. Supported variants: {}'.format(variant, self.variants))
         self.env = env
         self.model_path = model_path
+        self.variant = variant
+        self.alternating = variant != 'vanilla' if alternating is None else alternating
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.canonical = canonical
+        if canonical:
+            self.env.enable_canonical_key()
+
+        # The regrets, policy and average policy of each state_str are rows
+        # of the arrays of the table, indexed by the id of the state_str
+        self.table = CFRTable(self.env.action_num)
+
+        self.iteration = 0
+        # The weight of the current iteration in the average policy
+        self.average_weight = 1.0
 
-        # A policy is a dict state_str -> action probabilities
-        self.policy = collections.defaultdict(list)
-        self.average_policy =collections.defaultdict(np.array)
+    @property
+    def policy(self):
+        ''' (Mapping): state_str -> action probabilities
+        '''
+        return TableView(self.table, 'policy')
 
-        # Regret is a dict state_str -> action regrets
-        self.regrets = collections.defaultdict(np.array)
+    @property
+    def average_policy(self):
+        ''' (Mapping): state_str -> cumulative action probabilities
+        '''
+        return TableView(self.table, 'average_policy')
 
-        self.iteration = 0
+    @property
+    def regrets(self):
+        ''' (Mapping): state_str -> action regrets
+        '''
+        return TableView(self.table, 'regrets')
 
     def train(self):
         ''' Do one iteration of CFR
         '''
-        self.iteration += 1
+        self.start_iteration()
+
         # Firstly, tranvers tree to compute counterfactual regret for each player
         # The regrets are recorded in traversal
         for player_id in range(self.env.player_num):
@@ -39,8 +93,25 @@ class CFRAgent():
             probs = np.ones(self.env.player_num)
             self.traverse_tree(probs, player_id)
 
+            # With alternating updates, the next player plays against the updated policy
+            if self.alternating:
+                self.update_policy()
+
+        self.discount()
+
         # Update policy
-        self.update_policy()
+        if not self.alternating:
+            self.update_policy()
+
+    def start_iteration(self):
+        ''' Count a new iteration and set the weight of its average policy
+        '''
+        self.iteration += 1
+        # Linear CFR and DCFR weight the past iterations by discounting them
+        if self.variant in ('linear', 'dcfr'):
+            self.average_weight = 1.0
+        else:
+            self.average_weight = self.iteration
 
     def traverse_tree(self, probs, player_id):
         ''' Traverse the game tree, update the regrets
@@ -57,12 +128,13 @@ class CFRAgent():
 
         current_player = self.env.get_player_id()
 
-        action_utilities = {}
         state_utility = np.zeros(self.env.player_num)
         obs, legal_actions = self.get_state(current_player)
-        action_probs = self.action_probs(obs, legal_actions, self.policy)
+        infoset_id = self.table.get_id(obs)
+        action_probs = remove_illegal(self.table.policy[infoset_id], legal_actions)
 
-        for action in legal_actions:
+        action_utilities = np.zeros((len(legal_actions), self.env.player_num))
+        for i, action in enumerate(legal_actions):
             action_prob = action_probs[action]
             new_probs = probs.copy()
             new_probs[current_player] *= action_prob
@@ -73,7 +145,7 @@ class CFRAgent():
             self.env.step_back()
 
             state_utility += action_prob * utility
-            action_utilities[action] = utility
+            action_utilities[i] = utility
 
         if not current_player == player_id:
             return state_utility
@@ -84,23 +156,29 @@ class CFRAgent():
                                 np.prod(probs[current_player + 1:]))
         player_state_utility = state_utility[current_player]
 
-        if obs not in self.regrets:
-            self.regrets[obs] = np.zeros(self.env.action_num)
-        if obs not in self.average_policy:
-            self.average_policy[obs] = np.zeros(self.env.action_num)
-        for action in legal_actions:
-            action_prob = action_probs[action]
-            regret = counterfactual_prob * (action_utilities[action][current_player]
-                    - player_state_utility)
-            self.regrets[obs][action] += regret
-            self.average_policy[obs][action] += self.iteration * player_prob * action_prob
+        regrets = counterfactual_prob * (action_utilities[:, current_player] - player_state_utility)
+        self.table.regrets[infoset_id, legal_actions] += regrets
+        self.table.average_policy[infoset_id, legal_actions] += self.average_weight * player_prob * action_probs[legal_actions]
         return state_utility
 
+    def discount(self):
+        ''' Discount the regrets and the average policy at the end of an iteration
+        '''
+        t = self.iteration
+        if self.variant == 'linear':
+            scale = t / (t + 1)
+            self.table.discount(scale, scale, scale)
+        elif self.variant == 'dcfr':
+            positive_scale = t ** self.alpha / (t ** self.alpha + 1)
+            negative_scale = t ** self.beta / (t ** self.beta + 1)
+            self.table.discount(positive_scale, negative_scale, (t / (t + 1)) ** self.gamma)
+
     def update_policy(self):
         ''' Update policy based on the current regrets
         '''
-        for obs in self.regrets:
-            self.policy[obs] = self.regret_matching(obs)
+        if self.variant == 'cfr+':
+            self.table.floor_regrets()
+        self.table.update_policy()
 
     def regret_matching(self, obs):
         ''' Apply regret matching
@@ -108,18 +186,8 @@ class CFRAgent():
         Args:
             obs (string): The state_str
         '''
-        regret = self.regrets[obs]
-        positive_regret_sum = sum([r for r in regret if r > 0])
-
-        action_probs = np.zeros(self.env.action_num)
-        if positive_regret_sum > 0:
-            for action in range(self.env.action_num):
-                action_probs[action] = max(0.0, regret[action] / positive_regret_sum)
-        else:
-            for action in range(self.env.action_num):
-                action_probs[action] = 1.0 / self.env.action_num
-
-        return action_probs
+        regret = self.table.regrets[self.table.index[obs]]
+        return self.table.regret_matching(regret[np.newaxis])[0]
 
     def action_probs(self, obs, legal_actions, policy):
         ''' Obtain the action probabilities of the current state
@@ -127,19 +195,17 @@ class CFRAgent():
         Args:
             obs (str): state_str
             legal_actions (list): List of leagel actions
-            player_id (int): The current player
-            policy (dict): The used policy
+            policy (numpy.array): The used policy, the policy or the average
+              policy of the table
 
         Returns:
-            (tuple) that contains:
-                action_probs(numpy.array): The action probabilities
-                legal_actions (list): Indices of legal actions
+            action_probs(numpy.array): The action probabilities
         '''
-        if obs not in policy:
-            action_probs = np.array([1.0/self.env.action_num for _ in range(self.env.action_num)])
-            self.policy[obs] = action_probs
+        infoset_id = self.table.index.get(obs)
+        if infoset_id is None:
+            action_probs = np.full(self.env.action_num, 1.0 / self.env.action_num)
         else:
-            action_probs = policy[obs]
+            action_probs = policy[infoset_id]
         action_probs = remove_illegal(action_probs, legal_actions)
         return action_probs
 
@@ -152,7 +218,7 @@ class CFRAgent():
         Returns:
             action (int): Predicted action
         '''
-        probs = self.action_probs(state['obs'].tostring(), state['legal_actions'], self.average_policy)
+        probs = self.action_probs(self.state_key(state), state['legal_actions'], self.table.average_policy)
         action = np.random.choice(len(probs), p=probs)
         return action
 
@@ -168,7 +234,20 @@ class CFRAgent():
                 legal_actions (list): Indices of legal actions
         '''
         state = self.env.get_state(player_id)
-        return state['obs'].tostring(), state['legal_actions']
+        return self.state_key(state), state['legal_actions']
+
+    def state_key(self, state):
+        ''' Get the key of the information set of a state
+
+        Args:
+            state (dict): The state
+
+        Returns:
+            (bytes): The canonical key if canonical is True, otherwise the observation as bytes
+        '''
+        if self.canonical:
+            return state['canonical_key']
+        return state['obs'].tostring()
 
     def save(self):
         ''' Save model
@@ -176,41 +255,14 @@ class CFRAgent():
         if not os.path.exists(self.model_path):
             os.makedirs(self.model_path)
 
-        policy_file = open(os.path.join(self.model_path, 'policy.pkl'),'wb')
-        pickle.dump(self.policy, policy_file)
-        policy_file.close()
-
-        average_policy_file = open(os.path.join(self.model_path, 'average_policy.pkl'),'wb')
-        pickle.dump(self.average_policy, average_policy_file)
-        average_policy_file.close()
-
-        regrets_file = open(os.path.join(self.model_path, 'regrets.pkl'),'wb')
-        pickle.dump(self.regrets, regrets_file)
-        regrets_file.close()
-
-        iteration_file = open(os.path.join(self.model_path, 'iteration.pkl'),'wb')
-        pickle.dump(self.iteration, iteration_file)
-        iteration_file.close()
+        self.table.save(os.path.join(self.model_path, 'cfr_table.npz'), iteration=self.iteration)
 
     def load(self):
         ''' Load model
         '''
-        if not os.path.exists(self.model_path):
+        table_path = os.path.join(self.model_path, 'cfr_table.npz')
+        if not os.path.exists(table_path):
             return
 
-        policy_file = open(os.path.join(self.model_path, 'policy.pkl'),'rb')
-        self.policy = pickle.load(policy_file)
-        policy_file.close()
-
-        average_policy_file = open(os.path.join(self.model_path, 'average_policy.pkl'),'rb')
-        self.average_policy = pickle.load(average_policy_file)
-        average_policy_file.close()
-
-        regrets_file = open(os.path.join(self.model_path, 'regrets.pkl'),'rb')
-        self.regrets = pickle.load(regrets_file)
-        regrets_file.close()
-
-        iteration_file = open(os.path.join(self.model_path, 'iteration.pkl'),'rb')
-        self.iteration = pickle.load(iteration_file)
-        iteration_file.close()
-
+        self.table, extra = CFRTable.load(table_path)
+        self.iteration = int(extra['iteration'])
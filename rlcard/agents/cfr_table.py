@@ -0,0 +1,204 @@
+''' Array-backed tables of tabular CFR
+
+Every information set is interned to a dense integer id on first visit. The
+regrets, the current policy and the cumulative average policy of all the
+information sets are rows of contiguous 2-D arrays, so regret matching and
+updates are vectorized over rows instead of Python loops over actions.
+'''
+
+from collections.abc import Mapping
+import numpy as np
+
+
+class CFRTable(object):
+    ''' Regrets and policies of all the information sets, indexed by id
+    '''
+
+    _saved_arrays = ('keys', 'key_offsets', 'regrets', 'average_policy', 'policy')
+
+    def __init__(self, action_num, capacity=64):
+        ''' Initialize an empty table
+
+        Args:
+            action_num (int): the number of actions
+            capacity (int): the number of rows allocated at first. The arrays
+              grow by doubling when they are full
+        '''
+        self.action_num = action_num
+        # Information set key (bytes) -> id, and id -> key
+        self.index = {}
+        self.keys = []
+        self.regrets = np.zeros((capacity, action_num))
+        self.average_policy = np.zeros((capacity, action_num))
+        self.policy = np.full((capacity, action_num), 1.0 / action_num)
+
+    def __len__(self):
+        ''' Return the number of information sets
+        '''
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def get_id(self, key):
+        ''' Get the id of an information set, interning it on first visit
+
+        Args:
+            key (bytes): the key of the information set. Eg: obs.tostring()
+
+        Returns:
+            (int): the id of the information set
+        '''
+        infoset_id = self.index.get(key)
+        if infoset_id is None:
+            infoset_id = len(self.keys)
+            if infoset_id == self.regrets.shape[0]:
+                self._grow(2 * infoset_id)
+            self.index[key] = infoset_id
+            self.keys.append(key)
+        return infoset_id
+
+    def _grow(self, capacity):
+        ''' Enlarge the arrays to a capacity
+        '''
+        size = len(self.keys)
+        for name, fill in (('regrets', 0.0), ('average_policy', 0.0), ('policy', 1.0 / self.action_num)):
+            array = np.full((capacity, self.action_num), fill)
+            array[:size] = getattr(self, name)[:size]
+            setattr(self, name, array)
+
+    def regret_matching(self, regrets=None):
+        ''' Compute the policy proportional to the positive regrets
+
+        Args:
+            regrets (numpy.array): regrets of shape (n, action_num), default to
+              the regrets of all the information sets
+
+        Returns:
+            (numpy.array): the policy of shape (n, action_num). Rows without
+              positive regret are uniform
+        '''
+        if regrets is None:
+            regrets = self.regrets[:len(self)]
+        positive_regrets = np.maximum(regrets, 0.0)
+        positive_sums = positive_regrets.sum(axis=1, keepdims=True)
+        uniform = np.full_like(positive_regrets, 1.0 / self.action_num)
+        return np.divide(positive_regrets, positive_sums, out=uniform, where=positive_sums > 0)
+
+    def current_policy(self, infoset_id, legal_actions):
+        ''' Regret matching of one information set over its legal actions
+
+        Args:
+            infoset_id (int): the id of the information set
+            legal_actions (list): the indices of the legal actions
+
+        Returns:
+            (numpy.array): the policy over all the actions, which is also
+              stored as the policy of the information set
+        '''
+        positive_regrets = np.maximum(self.regrets[infoset_id, legal_actions], 0.0)
+        positive_sum = positive_regrets.sum()
+        probs = np.zeros(self.action_num)
+        if positive_sum > 0:
+            probs[legal_actions] = positive_regrets / positive_sum
+        else:
+            probs[legal_actions] = 1.0 / len(legal_actions)
+        self.policy[infoset_id] = probs
+        return probs
+
+    def floor_regrets(self):
+        ''' Floor the regrets at zero, as in CFR+
+        '''
+        regrets = self.regrets[:len(self)]
+        np.maximum(regrets, 0.0, out=regrets)
+
+    def discount(self, positive_scale, negative_scale, average_scale):
+        ''' Discount the accumulated regrets and average policy
+
+        Args:
+            positive_scale (float): the scale of the positive regrets
+            negative_scale (float): the scale of the negative regrets
+            average_scale (float): the scale of the average policy
+        '''
+        regrets = self.regrets[:len(self)]
+        regrets *= np.where(regrets > 0, positive_scale, negative_scale)
+        self.average_policy[:len(self)] *= average_scale
+
+    def update_policy(self):
+        ''' Update the policy of all the information sets by regret matching
+        '''
+        self.policy[:len(self)] = self.regret_matching()
+
+    def save(self, path, **extra):
+        ''' Save the table into one .npz file
+
+        The keys are stored as one byte string with the offsets of each key.
+
+        Args:
+            path (str): the path of the file
+            extra (dict): other values to be saved with the table. Eg: iteration=10
+        '''
+        size = len(self)
+        key_offsets = np.zeros(size + 1, dtype=np.int64)
+        key_offsets[1:] = np.cumsum([len(key) for key in self.keys])
+        keys = np.frombuffer(b''.join(self.keys), dtype=np.uint8)
+        with open(path, 'wb') as file:
+            np.savez(file,
+                     keys=keys,
+                     key_offsets=key_offsets,
+                     regrets=self.regrets[:size],
+                     average_policy=self.average_policy[:size],
+                     policy=self.policy[:size],
+                     **extra)
+
+    @classmethod
+    def load(cls, path):
+        ''' Load a table saved by save()
+
+        Args:
+            path (str): the path of the file
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (CFRTable): the loaded table
+                (dict): the other values saved with the table
+        '''
+        with np.load(path) as data:
+            regrets = data['regrets']
+            table = cls(regrets.shape[1], capacity=max(1, regrets.shape[0]))
+            keys = data['keys'].tobytes()
+            key_offsets = data['key_offsets']
+            table.keys = [keys[key_offsets[i]:key_offsets[i+1]] for i in range(len(key_offsets) - 1)]
+            table.index = {key: i for i, key in enumerate(table.keys)}
+            size = len(table.keys)
+            table.regrets[:size] = regrets
+            table.average_policy[:size] = data['average_policy']
+            table.policy[:size] = data['policy']
+            extra = {name: data[name] for name in data.files if name not in cls._saved_arrays}
+        return table, extra
+
+
+class TableView(Mapping):
+    ''' Read-only mapping from the key of an information set to its row in
+    one of the arrays of a table
+    '''
+
+    def __init__(self, table, name):
+        ''' Initialize
+
+        Args:
+            table (CFRTable): the table
+            name (str): the name of the array. Eg: 'regrets'
+        '''
+        self.table = table
+        self.name = name
+
+    def __getitem__(self, key):
+        return getattr(self.table, self.name)[self.table.index[key]]
+
+    def __iter__(self):
+        return iter(self.table.keys)
+
+    def __len__(self):
+        return len(self.table)
@@ -34,13 +34,14 @@ from __future__ import division
 from __future__ import print_function
 
 import sys
+import copy
 import collections
-import random
 import numpy as np
 import tensorflow as tf
 import sonnet as snt
 
 from rlcard.utils.utils import remove_illegal
+from rlcard.utils.buffers import ArrayBuffer
 sys.setrecursionlimit(10000000)
 
 AdvantageMemory = collections.namedtuple(
@@ -49,20 +50,19 @@ AdvantageMemory = collections.namedtuple(
 StrategyMemory = collections.namedtuple(
     'StrategyMemory', 'info_state iteration strategy_action_probs')
 
-class FixedSizeRingBuffer(object):
+class FixedSizeRingBuffer(ArrayBuffer):
     ''' ReplayBuffer of fixed size with a FIFO replacement policy.
 
     Stored transitions can be sampled uniformly.
 
-    The underlying datastructure is a ring buffer, allowing 0(1) adding and
-    sampling.
+    The underlying datastructure is a ring buffer of preallocated arrays, see
+    rlcard.utils.buffers, allowing 0(1) adding and sampling.
     '''
     def __init__(self, replay_buffer_capacity):
         ''' Initialize the buffer
         '''
-
-        self._replay_buffer_capacity = replay_buffer_capacity
-        self._data = []
+        super(FixedSizeRingBuffer, self).__init__(replay_buffer_capacity)
+        self._replay_buffer_capacity = self._capacity
         self._next_entry_index = 0
 
     def add(self, element):
@@ -73,43 +73,36 @@ class FixedSizeRingBuffer(object):
         Args:
             element: data to be added to the buffer.
         '''
-        if len(self._data) < self._replay_buffer_capacity:
-            self._data.append(element)
-        else:
-            self._next_entry_index = int(self._next_entry_index)
-            self._data[self._next_entry_index] = element
-            self._next_entry_index += 1
-            self._next_entry_index %= self._replay_buffer_capacity
+        values = self._split(element)
+        self._reserve(self._size + 1)
+        self._store(self._next_entry_index, values)
+        self._next_entry_index = (self._next_entry_index + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
 
-    def sample(self, num_samples):
-        ''' Returns `num_samples` uniformly sampled from the buffer.
+    def add_batch(self, elements):
+        ''' Adds a batch of elements, the same as adding them one by one
 
         Args:
-            num_samples (int): number of samples to draw.
-
-        Returns:
-            sample data (list): a list of random sampled elements of the buffer
-
-        Raises:
-            ValueError: If there are less than `num_samples` elements in the buffer
+            elements (object): An element whose fields are the batches of the
+              fields of the elements
         '''
-        if len(self._data) < num_samples:
-            raise ValueError("{} elements could not be sampled from size {}".format(
-                num_samples, len(self._data)))
-        return random.sample(self._data, num_samples)
+        values = self._split_batch(elements)
+        num = len(values[0])
+        if num > self._capacity:
+            values = [value[num - self._capacity:] for value in values]
+            self._next_entry_index = (self._next_entry_index + num - self._capacity) % self._capacity
+            num = self._capacity
+        self._reserve(min(self._size + num, self._capacity))
+        self._store((self._next_entry_index + np.arange(num)) % self._capacity, values)
+        self._next_entry_index = (self._next_entry_index + num) % self._capacity
+        self._size = min(self._size + num, self._capacity)
 
     def clear(self):
         ''' Clear the buffer
         '''
-        self._data = []
+        super(FixedSizeRingBuffer, self).clear()
         self._next_entry_index = 0
 
-    def __len__(self):
-        return len(self._data)
-
-    def __iter__(self):
-        return iter(self._data)
-
 
 class DeepCFR():
     ''' Implement the Deep CFR Algorithm.
@@ -135,7 +128,8 @@ class DeepCFR():
              learning_rate=1e-4,
              batch_size_advantage=16,
              batch_size_strategy=16,
-             memory_capacity=int(1e7)):
+             memory_capacity=int(1e7),
+             traversal_batch_size=1):
         ''' Initialize the Deep CFR
 
         Args:
@@ -150,6 +144,9 @@ class DeepCFR():
             batch_size_strategy (int or None): Batch size to sample from strategy
             memories
             memory_capacity (int): Number af samples that can be stored in memory
+            traversal_batch_size (int): Number of traversals run at once, each
+            on its own copy of the environment. The pending information sets of
+            all of them are evaluated with one call of the advantage network
         '''
         self._env = env
         self._session = session
@@ -158,7 +155,6 @@ class DeepCFR():
         self._num_players = env.player_num
         self._num_step = num_step
         self.advantage_losses = collections.defaultdict(list)
-        self.traverse = []
 
         # get initial state and players
         init_state, _ = self._env.init_game()
@@ -168,6 +164,7 @@ class DeepCFR():
         self._num_actions = self._env.action_num
         self._iteration = 1
         self._traverse_count = 0
+        self._traversal_batch_size = traversal_batch_size
 
         info_state_shape = [None]
         info_state_shape.extend(self._embedding_size)
@@ -257,14 +254,8 @@ class DeepCFR():
             average advantage loss (float): players average advantage loss
             policy loss (float): policy loss
         '''
-        init_state, init_player = self._env.init_game()
-        self._root_node = init_state
         for p in range(self._num_players):
-            while init_player != p:
-                init_state, init_player = self._env.init_game()
-                self._root_node = init_state
-            for _ in range(self._num_traversals):
-                self._traverse_game_tree(self._root_node, init_player)
+            self._traverse(p, self._num_traversals)
 
             # Re-initialize advantage networks and train from scratch.
             self.reinitialize_advantage_networks()
@@ -283,6 +274,19 @@ class DeepCFR():
 
         return self._policy_network, avg_adv_loss, policy_loss
 
+    def _traverse(self, player, num_traversals):
+        ''' Deal a game where the player acts first, and traverse it
+
+        Args:
+            player (int): Player index for the traversals.
+            num_traversals (int): The number of traversals.
+        '''
+        init_state, init_player = self._env.init_game()
+        while init_player != player:
+            init_state, init_player = self._env.init_game()
+        self._root_node = init_state
+        self._traverse_game_trees(self._root_node, player, num_traversals)
+
     def eval_step(self, state):
         ''' Predict the action given state for evaluation
 
@@ -356,54 +360,158 @@ class DeepCFR():
             state (dict): Current rlcard game state.
             player (int): Player index for this traversal.
 
+        Returns:
+            payoff (list): Recursively returns expected payoffs for each action.
+        '''
+        traversal = self._traversal(self._env, state, player)
+        try:
+            query = next(traversal)
+            while True:
+                query_player, info_state, legal_actions = query
+                _, strategy = self._sample_action_from_advantage(
+                    {'obs': info_state, 'legal_actions': legal_actions}, query_player)
+                query = traversal.send(strategy)
+        except StopIteration as stop:
+            return stop.value
+
+    def _traverse_game_trees(self, state, player, num_traversals):
+        ''' Performs traversals of the game tree from the same state, with
+        traversal_batch_size of them at once.
+
+        Each traversal is a generator that yields the information sets it
+        needs a strategy for. The pending information sets of all the
+        traversals are grouped by player, and evaluated with one call of the
+        advantage network of the player.
+
+        Args:
+            state (dict): The state of the environment, where the traversals start.
+            player (int): Player index for these traversals.
+            num_traversals (int): The number of traversals.
+        '''
+        batch_size = min(max(self._traversal_batch_size, 1), num_traversals)
+        # The copies start at the same state and are back to it after each traversal
+        envs = [self._env] + [copy.deepcopy(self._env) for _ in range(batch_size - 1)]
+        free_envs = list(envs)
+        # The running traversals: [generator, env, pending query]
+        running = []
+        started = 0
+        while started < num_traversals or running:
+            while free_envs and started < num_traversals:
+                env = free_envs.pop()
+                traversal = self._traversal(env, state, player)
+                started += 1
+                try:
+                    running.append([traversal, env, next(traversal)])
+                except StopIteration:
+                    free_envs.append(env)
+            if not running:
+                continue
+
+            strategies = [None] * len(running)
+            for query_player in set(query[0] for _, _, query in running):
+                indexes = [i for i, (_, _, query) in enumerate(running) if query[0] == query_player]
+                info_states = np.array([running[i][2][1] for i in indexes])
+                legal_masks = np.zeros((len(indexes), self._num_actions), dtype=bool)
+                for row, i in enumerate(indexes):
+                    legal_masks[row, running[i][2][2]] = True
+                advantages = self._advantages(query_player, info_states)
+                matched_regrets = self._regret_matching(advantages, legal_masks)
+                for row, i in enumerate(indexes):
+                    strategies[i] = matched_regrets[row]
+
+            still_running = []
+            for (traversal, env, _), strategy in zip(running, strategies):
+                try:
+                    still_running.append([traversal, env, traversal.send(strategy)])
+                except StopIteration:
+                    free_envs.append(env)
+            running = still_running
+
+    def _advantages(self, player, info_states):
+        ''' Evaluate the advantage network of a player on a batch of flattened info states
+        '''
+        return self._session.run(
+            self._advantage_outputs[player],
+            feed_dict={self._info_state_ph: info_states})
+
+    def _traversal(self, env, state, player):
+        ''' A traversal of the game tree in an environment, as a generator.
+
+        It yields (player, info_state, legal_actions) for each information
+        set whose strategy is needed, and expects to be sent the matched
+        regrets of the information set.
+
+        Args:
+            env (Env): The environment of the traversal.
+            state (dict): Current rlcard game state.
+            player (int): Player index for this traversal.
+
         Returns:
             payoff (list): Recursively returns expected payoffs for each action.
         '''
         expected_payoff = collections.defaultdict(float)
-        current_player = self._env.get_player_id()
+        current_player = env.get_player_id()
         actions = state['legal_actions']
-        if self._env.is_over():
+        if env.is_over():
             # Terminal state get returns.
-            payoff = self._env.get_payoffs()
+            payoff = env.get_payoffs()
             while True:
-                self._env.step_back()
-                if self._env.get_player_id() == player:
+                env.step_back()
+                if env.get_player_id() == player:
                     break
-            self.traverse = []
             return payoff
 
+        info_state = state['obs'].flatten()
         if current_player == player:
-            sampled_regret = collections.defaultdict(float)
             # Update the policy over the info set & actions via regret matching.
-            _, strategy = self._sample_action_from_advantage(state, player)
-            for action in actions:
-                child_state, _ = self._env.step(action)
-                self.traverse.append((action, state, child_state))
-                expected_payoff[action] = self._traverse_game_tree(child_state, player)
-            for _ in range(self._env.player_num):
-                self._env.step_back()
-
+            strategy = yield (player, info_state, actions)
             for action in actions:
-                sampled_regret[action] = expected_payoff[action][player]
-                for a_ in actions:
-                    sampled_regret[action] -= strategy[a_] * expected_payoff[a_][player]
-            for act in actions:
-                self._advantage_memories[player].add(AdvantageMemory(state['obs'].flatten(), self._iteration, sampled_regret[act], act))
+                child_state, _ = env.step(action)
+                expected_payoff[action] = yield from self._traversal(env, child_state, player)
+            for _ in range(env.player_num):
+                env.step_back()
+
+            payoffs = np.array([expected_payoff[action][player] for action in actions])
+            sampled_regrets = payoffs - np.dot(strategy[actions], payoffs)
+            self._advantage_memories[player].add_batch(AdvantageMemory(
+                np.tile(info_state, (len(actions), 1)),
+                np.full(len(actions), self._iteration),
+                sampled_regrets,
+                np.array(actions)))
             players_payoff = [max(expected_payoff[act_]) for act_ in expected_payoff.keys()]
             return players_payoff
         else:
             other_player = current_player
-            _, strategy = self._sample_action_from_advantage(state, other_player)
+            strategy = yield (other_player, info_state, actions)
             # Recompute distribution dor numerical errors.
             probs = np.array(strategy)
             probs /= probs.sum()
             action = np.random.choice(range(self._num_actions), p=probs)
-            child_state, _ = self._env.step(action)
+            child_state, _ = env.step(action)
             self._strategy_memories.add(
                 StrategyMemory(
-                    state['obs'].flatten(),
+                    info_state,
                     self._iteration, strategy))
-            return self._traverse_game_tree(child_state, player)
+            return (yield from self._traversal(env, child_state, player))
+
+    def _regret_matching(self, advantages, legal_masks):
+        ''' Match the regrets of a batch of information sets.
+
+        Args:
+            advantages (numpy.array): The advantages of shape (batch_size, action_num).
+            legal_masks (numpy.array): The boolean masks of the legal actions.
+
+        Returns:
+            (numpy.array): The matched regrets. Each legal action gets its
+            share of the positive advantages of the legal actions, or
+            1 / action_num if none is positive.
+        '''
+        advantages = np.where(legal_masks, np.maximum(advantages, 0.), 0.).astype(np.float64)
+        cumulative_regrets = advantages.sum(axis=1, keepdims=True)
+        uniform = np.where(legal_masks, 1. / self._num_actions, 0.)
+        return np.where(cumulative_regrets > 0.,
+                        advantages / np.where(cumulative_regrets > 0., cumulative_regrets, 1.),
+                        uniform)
 
     def _sample_action_from_advantage(self, state, player):
         ''' Returns an info state policy by applying regret-matching.
@@ -417,18 +525,13 @@ class DeepCFR():
             2. (list) Matched regrets, prob for actions indexed by action.
         '''
         info_state = state['obs'].flatten()
-        legal_actions = state['legal_actions']
+        legal_masks = np.zeros((1, self._num_actions), dtype=bool)
+        legal_masks[0, state['legal_actions']] = True
         advantages = self._session.run(
             self._advantage_outputs[player],
-            feed_dict={self._info_state_ph: np.expand_dims(info_state, axis=0)})[0]
-        advantages = [max(0., advantage) for advantage in advantages]
-        cumulative_regret = np.sum([advantages[action] for action in legal_actions])
-        matched_regrets = np.array([0.] * self._num_actions)
-        for action in legal_actions:
-            if cumulative_regret > 0.:
-                matched_regrets[action] = advantages[action] / cumulative_regret
-            else:
-                matched_regrets[action] = 1 / self._num_actions
+            feed_dict={self._info_state_ph: np.expand_dims(info_state, axis=0)})
+        matched_regrets = self._regret_matching(advantages, legal_masks)[0]
+        advantages = [max(0., advantage) for advantage in advantages[0]]
         return advantages, matched_regrets
 
     @staticmethod
@@ -458,29 +561,21 @@ class DeepCFR():
         Returns:
             loss advantages (float): The average loss over the advantage network.
         '''
-        if self._batch_size_advantage and self._batch_size_advantage < len(self._advantage_memories[player]._data):
-            samples = self._advantage_memories[player].sample(self._batch_size_advantage)
-        else:
-            samples = self._advantage_memories[player]
-        info_states = []
-        advantages = []
-        iterations = []
-        acts = []
-        for s in samples:
-            info_states.append(s.info_state)
-            advantages.append(s.advantage)
-            iterations.append(s.iteration)
-            acts.append(s.action)
-        if info_states == []:
-            return None
+        memory = self._advantage_memories[player]
         # Ensure some samples have been gathered.
+        if len(memory) == 0:
+            return None
+        if self._batch_size_advantage and self._batch_size_advantage < len(memory):
+            samples = memory.sample(self._batch_size_advantage)
+        else:
+            samples = memory.all()
         loss_advantages, _ = self._session.run(
             [self._loss_advantages[player], self._learn_step_advantages[player]],
             feed_dict={
-                self._info_state_ph: np.array(info_states),
-                self._advantage_ph[player]: np.array(advantages),
-                self._action_ph[player]: np.array(acts),
-                self._iter_ph: np.array(iterations)
+                self._info_state_ph: samples.info_state,
+                self._advantage_ph[player]: samples.advantage,
+                self._action_ph[player]: samples.action,
+                self._iter_ph: samples.iteration
             })
         return loss_advantages
 
@@ -490,24 +585,17 @@ class DeepCFR():
         Returns:
             The average loss obtained on this batch of transitions or `None`.
         '''
-        if self._batch_size_strategy and self._batch_size_strategy < len(self._strategy_memories._data):
+        if len(self._strategy_memories) == 0:
+            return None
+        if self._batch_size_strategy and self._batch_size_strategy < len(self._strategy_memories):
             samples = self._strategy_memories.sample(self._batch_size_strategy)
         else:
-            samples = self._strategy_memories
-        info_states = []
-        action_probs = []
-        iterations = []
-        for s in samples:
-            info_states.append(s.info_state)
-            action_probs.append(s.strategy_action_probs)
-            iterations.append(s.iteration)
-        if info_states == []:
-            return None
+            samples = self._strategy_memories.all()
         loss_strategy, _ = self._session.run(
             [self._loss_policy, self._learn_step_policy],
             feed_dict={
-                self._info_state_ph: np.array(info_states),
-                self._action_probs_ph: np.array(np.squeeze(action_probs)),
-                self._iter_ph: np.array(iterations),
+                self._info_state_ph: samples.info_state,
+                self._action_probs_ph: samples.strategy_action_probs,
+                self._iter_ph: samples.iteration,
             })
         return loss_strategy
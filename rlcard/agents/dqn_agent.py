@@ -24,12 +24,12 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
-import random
 import numpy as np
 import tensorflow as tf
 from collections import namedtuple
 
 from rlcard.utils.utils import remove_illegal
+from rlcard.utils.buffers import SumTree
 
 Transition = namedtuple('Transition', ['state', 'action', 'reward', 'next_state', 'done'])
 
@@ -51,7 +51,11 @@ class DQNAgent(object):
                  state_shape=None,
                  norm_step=100,
                  mlp_layers=None,
-                 learning_rate=0.00005):
+                 learning_rate=0.00005,
+                 prioritized_replay=False,
+                 priority_alpha=0.6,
+                 priority_beta=0.4,
+                 priority_beta_steps=100000):
 
         '''
         Q-Learning algorithm for off-policy TD control using Function Approximation.
@@ -77,6 +81,12 @@ class DQNAgent(object):
             norm_step (int): The number of the step used form noramlize state
             mlp_layers (list): The layer number and the dimension of each layer in MLP
             learning_rate (float): The learning rate of the DQN agent.
+            prioritized_replay (boolean): Whether to sample the replay memory by
+              priority, with the TD errors as priorities. See PrioritizedMemory
+            priority_alpha (float): How much the priorities are used
+            priority_beta (float): The initial exponent of the importance-sampling
+              weights, annealed to 1 over priority_beta_steps training steps
+            priority_beta_steps (int): The number of steps to anneal the exponent
         '''
         self.sess = sess
         self.scope = scope
@@ -87,6 +97,7 @@ class DQNAgent(object):
         self.batch_size = batch_size
         self.action_num = action_num
         self.norm_step = norm_step
+        self.prioritized_replay = prioritized_replay
 
 
         # Total timesteps
@@ -107,7 +118,11 @@ class DQNAgent(object):
         self.normalizer = Normalizer()
 
         # Create replay memory
-        self.memory = Memory(replay_memory_size, batch_size)
+        if prioritized_replay:
+            self.memory = PrioritizedMemory(replay_memory_size, batch_size, action_num, alpha=priority_alpha,
+                                            beta_start=priority_beta, beta_steps=priority_beta_steps)
+        else:
+            self.memory = Memory(replay_memory_size, batch_size, action_num)
 
     def feed(self, ts):
         ''' Store data in to replay buffer and train the agent. There are two stages.
@@ -122,7 +137,7 @@ class DQNAgent(object):
         if self.total_t < self.norm_step:
             self.feed_norm(state['obs'])
         else:
-            self.feed_memory(state['obs'], action, reward, next_state['obs'], done)
+            self.feed_memory(state['obs'], action, reward, next_state['obs'], done, next_state['legal_actions'])
         self.total_t += 1
 
     def step(self, state):
@@ -175,18 +190,28 @@ class DQNAgent(object):
         Returns:
             loss (float): The loss of the current batch.
         '''
-        state_batch, action_batch, reward_batch, next_state_batch, done_batch = self.memory.sample()
+        if self.prioritized_replay:
+            state_batch, action_batch, reward_batch, next_state_batch, done_batch, legal_actions_batch, \
+                weight_batch, index_batch = self.memory.sample()
+        else:
+            state_batch, action_batch, reward_batch, next_state_batch, done_batch, legal_actions_batch = self.memory.sample()
+            weight_batch = None
         # Calculate q values and targets (Double DQN)
         q_values_next = self.q_estimator.predict(self.sess, next_state_batch)
+        # Only the legal actions of the next states are considered
+        q_values_next[np.logical_not(legal_actions_batch)] = -np.inf
         best_actions = np.argmax(q_values_next, axis=1)
         q_values_next_target = self.target_estimator.predict(self.sess, next_state_batch)
         target_batch = reward_batch + np.invert(done_batch).astype(np.float32) * \
             self.discount_factor * q_values_next_target[np.arange(self.batch_size), best_actions]
 
-        # Perform gradient descent update
-        state_batch = np.array(state_batch)
+        # The TD errors before the update are the new priorities
+        if self.prioritized_replay:
+            q_values = self.q_estimator.predict(self.sess, state_batch)
+            self.memory.update_priorities(index_batch, target_batch - q_values[np.arange(self.batch_size), action_batch])
 
-        loss = self.q_estimator.update(self.sess, state_batch, action_batch, target_batch)
+        # Perform gradient descent update
+        loss = self.q_estimator.update(self.sess, state_batch, action_batch, target_batch, weight_batch)
 
         # Update the target estimator
         if self.train_t % self.update_target_estimator_every == 0:
@@ -204,7 +229,7 @@ class DQNAgent(object):
         '''
         self.normalizer.append(state)
 
-    def feed_memory(self, state, action, reward, next_state, done):
+    def feed_memory(self, state, action, reward, next_state, done, legal_actions=None):
         ''' Feed transition to memory
 
         Args:
@@ -213,8 +238,13 @@ class DQNAgent(object):
             reward (float): the reward received
             next_state (numpy.array): the next state after performing the action
             done (boolean): whether the episode is finished
+            legal_actions (list): the legal actions of the next state
         '''
-        self.memory.save(self.normalizer.normalize(state), action, reward, self.normalizer.normalize(next_state), done)
+        i = self.memory.position
+        self.memory.save(state, action, reward, next_state, done, legal_actions)
+        # Normalize the stored states in place
+        self.normalizer.normalize(self.memory.states[i], out=self.memory.states[i])
+        self.normalizer.normalize(self.memory.next_states[i], out=self.memory.next_states[i])
 
     def copy_params_op(self, global_vars):
         ''' Copys the variables of two estimator to others.
@@ -233,29 +263,48 @@ class DQNAgent(object):
 
 class Normalizer(object):
     ''' Normalizer class that tracks the running statistics for normlization
+
+    The mean and the variance are updated in O(1) per state with Welford's
+    algorithm, or with exponentially weighted averages if a momentum is
+    given, so that old states are forgotten.
     '''
 
-    def __init__(self):
+    def __init__(self, momentum=None):
         ''' Initialize a Normalizer instance.
+
+        Args:
+            momentum (float): The weight of the previous statistics in the
+              exponentially weighted averages, Eg: 0.999. If None, the
+              statistics are over all the appended states
         '''
+        self.momentum = momentum
+        self.length = 0
+        # The statistics are accumulated in float64, and their float32 copies
+        # are used for normalization
+        self._mean = None
+        self._var = None
         self.mean = None
         self.std = None
-        self.state_memory = []
-        self.max_size = 1000
-        self.length = 0
+        self._scale = None
 
-    def normalize(self, s):
+    def normalize(self, s, out=None):
         ''' Normalize the state with the running mean and std.
 
         Args:
-            s (numpy.array): the input state
+            s (numpy.array): the input state, or a batch of states
+            out (numpy.array): the array to write the normalized state into,
+              which may be s itself. If None, a new array is returned
 
         Returns:
-            a (int):  normalized state
+            (numpy.array): the normalized state
         '''
         if self.length == 0:
-            return s
-        return (s - self.mean) / (self.std + 1e-8)
+            if out is None:
+                return s
+            out[...] = s
+            return out
+        out = np.subtract(s, self.mean, out=out)
+        return np.multiply(out, self._scale, out=out)
 
     def append(self, s):
         ''' Append a new state and update the running statistics
@@ -263,12 +312,58 @@ class Normalizer(object):
         Args:
             s (numpy.array): the input state
         '''
-        if len(self.state_memory) > self.max_size:
-            self.state_memory.pop(0)
-        self.state_memory.append(s)
-        self.mean = np.mean(self.state_memory, axis=0)
-        self.std = np.std(self.state_memory, axis=0)
-        self.length = len(self.state_memory)
+        s = np.asarray(s, dtype=np.float64)
+        self.length += 1
+        if self._mean is None:
+            self._mean = s.copy()
+            self._var = np.zeros_like(s)
+        elif self.momentum is None:
+            delta = s - self._mean
+            self._mean += delta / self.length
+            # Welford: the running mean of delta * (s - new mean) is the variance
+            self._var += (delta * (s - self._mean) - self._var) / self.length
+        else:
+            delta = s - self._mean
+            self._mean += (1 - self.momentum) * delta
+            self._var = self.momentum * (self._var + (1 - self.momentum) * delta * delta)
+        self._update()
+
+    def _update(self):
+        ''' Update the float32 statistics used for normalization
+        '''
+        self.mean = self._mean.astype(np.float32)
+        self.std = np.sqrt(self._var).astype(np.float32)
+        self._scale = 1 / (self.std + np.float32(1e-8))
+
+    def save(self, path):
+        ''' Save the statistics into one .npz file
+
+        Args:
+            path (str): the path of the file
+        '''
+        with open(path, 'wb') as file:
+            np.savez(file,
+                     length=self.length,
+                     momentum=np.nan if self.momentum is None else self.momentum,
+                     mean=self._mean if self._mean is not None else np.zeros(0),
+                     var=self._var if self._var is not None else np.zeros(0))
+
+    def load(self, path):
+        ''' Load the statistics saved by save()
+
+        Args:
+            path (str): the path of the file
+        '''
+        with np.load(path) as data:
+            self.length = int(data['length'])
+            momentum = float(data['momentum'])
+            self.momentum = None if np.isnan(momentum) else momentum
+            if self.length == 0:
+                self._mean = self._var = self.mean = self.std = self._scale = None
+            else:
+                self._mean = data['mean']
+                self._var = data['var']
+                self._update()
 
 
 class Estimator():
@@ -322,9 +417,12 @@ class Estimator():
         gather_indices = tf.range(batch_size) * tf.shape(self.predictions)[1] + self.actions_pl
         self.action_predictions = tf.gather(tf.reshape(self.predictions, [-1]), gather_indices)
 
+        # The importance-sampling weights of prioritized replay, default to 1
+        self.weights_pl = tf.placeholder_with_default(tf.ones([batch_size]), shape=[None], name="weights")
+
         # Calculate the loss
         self.losses = tf.squared_difference(self.y_pl, self.action_predictions)
-        self.loss = tf.reduce_mean(self.losses)
+        self.loss = tf.reduce_mean(self.weights_pl * self.losses)
 
     def predict(self, sess, s):
         ''' Predicts action values.
@@ -339,7 +437,7 @@ class Estimator():
         '''
         return sess.run(self.predictions, { self.X_pl: s })
 
-    def update(self, sess, s, a, y):
+    def update(self, sess, s, a, y, weights=None):
         ''' Updates the estimator towards the given targets.
 
         Args:
@@ -347,11 +445,15 @@ class Estimator():
           s (list): State input of shape [batch_size, 4, 160, 160, 3]
           a (list): Chosen actions of shape [batch_size]
           y (list): Targets of shape [batch_size]
+          weights (numpy.array): Importance-sampling weights of the losses of
+            shape [batch_size], None for equal weights
 
         Returns:
           The calculated loss on the batch.
         '''
         feed_dict = { self.X_pl: s, self.y_pl: y, self.actions_pl: a }
+        if weights is not None:
+            feed_dict[self.weights_pl] = weights
         _, _, loss = sess.run(
                 [tf.contrib.framework.get_global_step(), self.train_op, self.loss],
                 feed_dict)
@@ -359,18 +461,44 @@ class Estimator():
 
 class Memory(object):
     ''' Memory for saving transitions
+
+    The transitions are stored in preallocated arrays, one per field, which
+    are used as a ring buffer. The arrays are allocated on the first save,
+    when the shape of the states is known.
     '''
 
-    def __init__(self, memory_size, batch_size):
+    def __init__(self, memory_size, batch_size, action_num=None):
         ''' Initialize
         Args:
             memory_size (int): the size of the memroy buffer
+            batch_size (int): the size of the sampled batches
+            action_num (int): the number of actions, used to store the legal
+              actions of the next states. Without it, the legal actions
+              cannot be saved
         '''
         self.memory_size = memory_size
         self.batch_size = batch_size
-        self.memory = []
+        self.action_num = action_num if action_num else 0
+        # The number of stored transitions and the position of the next one
+        self.size = 0
+        self.position = 0
+        self.states = None
 
-    def save(self, state, action, reward, next_state, done):
+    def __len__(self):
+        return self.size
+
+    def _allocate(self, state):
+        ''' Allocate the arrays for states of the shape of a state
+        '''
+        state_shape = np.shape(state)
+        self.states = np.zeros((self.memory_size,) + state_shape, dtype=np.float32)
+        self.next_states = np.zeros((self.memory_size,) + state_shape, dtype=np.float32)
+        self.actions = np.zeros(self.memory_size, dtype=np.int32)
+        self.rewards = np.zeros(self.memory_size, dtype=np.float32)
+        self.dones = np.zeros(self.memory_size, dtype=np.bool_)
+        self.legal_actions = np.zeros((self.memory_size, self.action_num), dtype=np.bool_)
+
+    def save(self, state, action, reward, next_state, done, legal_actions=None):
         ''' Save transition into memory
 
         Args:
@@ -379,24 +507,119 @@ class Memory(object):
             reward (float): the reward received
             next_state (numpy.array): the next state after performing the action
             done (boolean): whether the episode is finished
+            legal_actions (list): the legal actions of the next state, default
+              to all the actions
+
+        Raises:
+            ValueError: If legal_actions is given to a memory without action_num
         '''
-        if len(self.memory) == self.memory_size:
-            self.memory.pop(0)
-        transition = Transition(state, action, reward, next_state, done)
-        self.memory.append(transition)
+        if legal_actions is not None and not self.action_num:
+            raise ValueError('The legal actions can only be saved in a memory with action_num')
+        if self.states is None:
+            self._allocate(state)
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        if legal_actions is None:
+            self.legal_actions[i] = True
+        else:
+            self.legal_actions[i] = False
+            self.legal_actions[i, legal_actions] = True
+        # Overwrite the oldest transition when the memory is full
+        self.position = (i + 1) % self.memory_size
+        self.size = min(self.size + 1, self.memory_size)
 
     def sample(self):
         ''' Sample a minibatch from the replay memory
 
         Returns:
-            state_batch (list): a batch of states
-            action_batch (list): a batch of actions
-            reward_batch (list): a batch of rewards
-            next_state_batch (list): a batch of states
-            done_batch (list): a batch of dones
+            state_batch (numpy.array): a batch of states
+            action_batch (numpy.array): a batch of actions
+            reward_batch (numpy.array): a batch of rewards
+            next_state_batch (numpy.array): a batch of states
+            done_batch (numpy.array): a batch of dones
+            legal_actions_batch (numpy.array): a batch of boolean masks of
+              the legal actions of the next states
+        '''
+        samples = np.random.randint(0, self.size, size=self.batch_size)
+        return (self.states[samples], self.actions[samples], self.rewards[samples],
+                self.next_states[samples], self.dones[samples], self.legal_actions[samples])
+
+class PrioritizedMemory(Memory):
+    ''' Memory with prioritized experience replay
+
+    The transitions are sampled with probabilities proportional to their
+    priorities to the power alpha, kept in a sum tree. A new transition gets
+    the highest priority seen so far, and the priorities of the sampled
+    transitions are updated with their TD errors. The bias of the sampling
+    is corrected by importance-sampling weights, with an exponent beta that
+    is annealed from beta_start to 1 over beta_steps samples.
+
+    See https://arxiv.org/abs/1511.05952.
+    '''
+
+    def __init__(self, memory_size, batch_size, action_num=None, alpha=0.6, beta_start=0.4, beta_steps=100000, epsilon=1e-6):
+        ''' Initialize
+        Args:
+            memory_size (int): the size of the memroy buffer
+            batch_size (int): the size of the sampled batches
+            action_num (int): the number of actions
+            alpha (float): how much the priorities are used, 0 for uniform sampling
+            beta_start (float): the initial exponent of the importance-sampling weights
+            beta_steps (int): the number of samples to anneal beta to 1
+            epsilon (float): added to the TD errors so that no priority is zero
+        '''
+        super(PrioritizedMemory, self).__init__(memory_size, batch_size, action_num)
+        self.alpha = alpha
+        self.beta_start = beta_start
+        self.beta_steps = beta_steps
+        self.epsilon = epsilon
+        self.tree = SumTree(memory_size)
+        self.max_priority = 1.0
+        self.sample_t = 0
+
+    def save(self, state, action, reward, next_state, done, legal_actions=None):
+        ''' Save transition into memory with the highest priority. See Memory.save
+        '''
+        i = self.position
+        super(PrioritizedMemory, self).save(state, action, reward, next_state, done, legal_actions)
+        self.tree.update([i], [self.max_priority ** self.alpha])
+
+    def sample(self):
+        ''' Sample a minibatch from the replay memory by priority
+
+        Returns:
+            The batches of Memory.sample, and:
+            weight_batch (numpy.array): the importance-sampling weights
+            index_batch (numpy.array): the indexes of the transitions, to update their priorities
+        '''
+        # One sample in each of batch_size segments of the total priority
+        total = self.tree.total
+        values = (np.arange(self.batch_size) + np.random.random(self.batch_size)) * (total / self.batch_size)
+        samples = np.minimum(self.tree.find(values), self.size - 1)
+
+        beta = min(1.0, self.beta_start + (1.0 - self.beta_start) * self.sample_t / self.beta_steps)
+        self.sample_t += 1
+        probs = self.tree.get(samples) / total
+        weights = (self.size * probs) ** -beta
+        weights = (weights / weights.max()).astype(np.float32)
+        return (self.states[samples], self.actions[samples], self.rewards[samples],
+                self.next_states[samples], self.dones[samples], self.legal_actions[samples],
+                weights, samples)
+
+    def update_priorities(self, indexes, td_errors):
+        ''' Update the priorities of sampled transitions
+
+        Args:
+            indexes (numpy.array): the indexes returned by sample
+            td_errors (numpy.array): the TD errors of the transitions
         '''
-        samples = random.sample(self.memory, self.batch_size)
-        return map(np.array, zip(*samples))
+        priorities = np.abs(td_errors) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indexes, priorities ** self.alpha)
 
 def copy_model_parameters(sess, estimator1, estimator2):
     ''' Copys the model parameters of one estimator to another.
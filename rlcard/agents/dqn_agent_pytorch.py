@@ -31,7 +31,7 @@ import torch.nn as nn
 from collections import namedtuple
 from copy import deepcopy
 
-from rlcard.agents.dqn_agent import Memory, Normalizer
+from rlcard.agents.dqn_agent import Memory, PrioritizedMemory, Normalizer
 from rlcard.utils.utils import remove_illegal
 
 Transition = namedtuple('Transition', ['state', 'action', 'reward', 'next_state', 'done'])
@@ -57,7 +57,11 @@ class DQNAgent(object):
                  norm_step=100,
                  mlp_layers=None,
                  learning_rate=0.00005,
-                 device=None):
+                 device=None,
+                 prioritized_replay=False,
+                 priority_alpha=0.6,
+                 priority_beta=0.4,
+                 priority_beta_steps=100000):
 
         '''
         Q-Learning algorithm for off-policy TD control using Function Approximation.
@@ -83,6 +87,12 @@ class DQNAgent(object):
             mlp_layers (list): The layer number and the dimension of each layer in MLP
             learning_rate (float): The learning rate of the DQN agent.
             device (torch.device): whether to use the cpu or gpu
+            prioritized_replay (boolean): Whether to sample the replay memory by
+              priority, with the TD errors as priorities. See PrioritizedMemory
+            priority_alpha (float): How much the priorities are used
+            priority_beta (float): The initial exponent of the importance-sampling
+              weights, annealed to 1 over priority_beta_steps training steps
+            priority_beta_steps (int): The number of steps to anneal the exponent
         '''
         self.scope = scope
         self.replay_memory_init_size = replay_memory_init_size
@@ -92,6 +102,7 @@ class DQNAgent(object):
         self.batch_size = batch_size
         self.action_num = action_num
         self.norm_step = norm_step
+        self.prioritized_replay = prioritized_replay
 
         # Torch device
         if device is None:
@@ -119,7 +130,11 @@ class DQNAgent(object):
         self.normalizer = Normalizer()
 
         # Create replay memory
-        self.memory = Memory(replay_memory_size, batch_size)
+        if prioritized_replay:
+            self.memory = PrioritizedMemory(replay_memory_size, batch_size, action_num, alpha=priority_alpha,
+                                            beta_start=priority_beta, beta_steps=priority_beta_steps)
+        else:
+            self.memory = Memory(replay_memory_size, batch_size, action_num)
 
     def feed(self, ts):
         ''' Store data in to replay buffer and train the agent. There are two stages.
@@ -134,7 +149,7 @@ class DQNAgent(object):
         if self.total_t < self.norm_step:
             self.feed_norm(state['obs'])
         else:
-            self.feed_memory(state['obs'], action, reward, next_state['obs'], done)
+            self.feed_memory(state['obs'], action, reward, next_state['obs'], done, next_state['legal_actions'])
         self.total_t += 1
 
     def step(self, state):
@@ -189,10 +204,17 @@ class DQNAgent(object):
         Returns:
             loss (float): The loss of the current batch.
         '''
-        state_batch, action_batch, reward_batch, next_state_batch, done_batch = self.memory.sample()
+        if self.prioritized_replay:
+            state_batch, action_batch, reward_batch, next_state_batch, done_batch, legal_actions_batch, \
+                weight_batch, index_batch = self.memory.sample()
+        else:
+            state_batch, action_batch, reward_batch, next_state_batch, done_batch, legal_actions_batch = self.memory.sample()
+            weight_batch = None
 
         # Calculate best next actions using Q-network (Double DQN)
         q_values_next = self.q_estimator.predict_nograd(next_state_batch)
+        # Only the legal actions of the next states are considered
+        q_values_next[np.logical_not(legal_actions_batch)] = -np.inf
         best_actions = np.argmax(q_values_next, axis=1)
 
         # Evaluate best next actions using Target-network (Double DQN)
@@ -200,10 +222,13 @@ class DQNAgent(object):
         target_batch = reward_batch + np.invert(done_batch).astype(np.float32) * \
             self.discount_factor * q_values_next_target[np.arange(self.batch_size), best_actions]
 
-        # Perform gradient descent update
-        state_batch = np.array(state_batch)
+        # The TD errors before the update are the new priorities
+        if self.prioritized_replay:
+            q_values = self.q_estimator.predict_nograd(state_batch)
+            self.memory.update_priorities(index_batch, target_batch - q_values[np.arange(self.batch_size), action_batch])
 
-        loss = self.q_estimator.update(state_batch, action_batch, target_batch)
+        # Perform gradient descent update
+        loss = self.q_estimator.update(state_batch, action_batch, target_batch, weight_batch)
 
         # Update the target estimator
         if self.train_t % self.update_target_estimator_every == 0:
@@ -221,7 +246,7 @@ class DQNAgent(object):
         '''
         self.normalizer.append(state)
 
-    def feed_memory(self, state, action, reward, next_state, done):
+    def feed_memory(self, state, action, reward, next_state, done, legal_actions=None):
         ''' Feed transition to memory
 
         Args:
@@ -230,8 +255,13 @@ class DQNAgent(object):
             reward (float): the reward received
             next_state (numpy.array): the next state after performing the action
             done (boolean): whether the episode is finished
+            legal_actions (list): the legal actions of the next state
         '''
-        self.memory.save(self.normalizer.normalize(state), action, reward, self.normalizer.normalize(next_state), done)
+        i = self.memory.position
+        self.memory.save(state, action, reward, next_state, done, legal_actions)
+        # Normalize the stored states in place
+        self.normalizer.normalize(self.memory.states[i], out=self.memory.states[i])
+        self.normalizer.normalize(self.memory.next_states[i], out=self.memory.next_states[i])
 
 class Estimator(object):
     '''
@@ -291,7 +321,7 @@ class Estimator(object):
             q_as = self.qnet(s).numpy()
         return q_as
 
-    def update(self, s, a, y):
+    def update(self, s, a, y, weights=None):
         ''' Updates the estimator towards the given targets.
             In this case y is the target-network estimated
             value of the Q-network optimal actions, which
@@ -301,6 +331,8 @@ class Estimator(object):
           s (np.ndarray): (batch, state_shape) state representation
           a (np.ndarray): (batch,) integer sampled actions
           y (np.ndarray): (batch,) value of optimal actions according to Q-target
+          weights (np.ndarray): (batch,) importance-sampling weights of the
+            losses, None for equal weights
 
         Returns:
           The calculated loss on the batch.
@@ -320,7 +352,11 @@ class Estimator(object):
         Q = torch.gather(q_as, dim=-1, index=a.unsqueeze(-1)).squeeze(-1)
 
         # update model
-        batch_loss = self.mse_loss(Q, y)
+        if weights is None:
+            batch_loss = self.mse_loss(Q, y)
+        else:
+            weights = torch.from_numpy(weights).float().to(self.device)
+            batch_loss = (weights * (Q - y) ** 2).mean()
         batch_loss.backward()
         self.optimizer.step()
         batch_loss = batch_loss.item()
@@ -0,0 +1,202 @@
+''' A batched inference server for agents playing in many threads
+
+Instead of one forward pass per decision, the InferenceAgents of all the
+threads send their observations to one InferenceServer. The server thread
+waits for the first pending request, collects more requests until the batch
+is full or the maximum latency has passed, runs one batched forward pass,
+masks the illegal actions and sends the actions back.
+
+TensorFlow and PyTorch release the GIL during the forward pass, so the
+threads running the games keep stepping their environments meanwhile.
+'''
+
+import threading
+import time
+from collections import deque
+import numpy as np
+
+
+def agent_predict_fn(agent):
+    ''' Get a batched prediction function of an agent
+
+    Args:
+        agent (object): A DQNAgent (its Q values) or an NFSPAgent (its average
+          policy), of TensorFlow or PyTorch
+
+    Returns:
+        (function): A function that takes a batch of observations and returns
+          the scores of the actions of shape (batch_size, action_num)
+    '''
+    if hasattr(agent, '_avg_policy_probs'):
+        return lambda obs: agent._sess.run(agent._avg_policy_probs, feed_dict={agent._info_state_ph: obs})
+    if hasattr(agent, 'policy_network'):
+        import torch
+        def predict(obs):
+            with torch.no_grad():
+                log_probs = agent.policy_network(torch.from_numpy(obs).float().to(agent.device)).numpy()
+            return np.exp(log_probs)
+        return predict
+    if hasattr(agent, 'q_estimator'):
+        if hasattr(agent, 'sess'):
+            return lambda obs: agent.q_estimator.predict(agent.sess, agent.normalizer.normalize(obs))
+        return lambda obs: agent.q_estimator.predict_nograd(agent.normalizer.normalize(obs))
+    raise ValueError('Cannot get the batched prediction of {}'.format(agent))
+
+
+class _Request(object):
+    ''' A pending observation and, once served, its action
+    '''
+
+    __slots__ = ('obs', 'legal_actions', 'action', 'event')
+
+    def __init__(self, obs, legal_actions):
+        self.obs = obs
+        self.legal_actions = legal_actions
+        self.action = None
+        self.event = threading.Event()
+
+
+class InferenceServer(object):
+    ''' Serve the actions of many threads with batched forward passes
+    '''
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait=0.001, greedy=True):
+        ''' Initialize
+
+        Args:
+            predict_fn (function): Takes a batch of observations and returns
+              the scores of the actions of shape (batch_size, action_num).
+              See agent_predict_fn
+            max_batch_size (int): The maximum number of observations of a forward pass
+            max_wait (float): The maximum time in seconds to wait for more
+              requests after the first request of a batch
+            greedy (boolean): True to pick the legal action with the highest
+              score (Eg: Q values), False to sample the legal actions with
+              probabilities proportional to the scores (Eg: a policy)
+
+        Note: Call start() before sending requests, and close() to stop the server.
+        '''
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.greedy = greedy
+        self.requests = deque()
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+        # Statistics of the served batches
+        self.batch_num = 0
+        self.request_num = 0
+
+    def start(self):
+        ''' Start the server thread
+        '''
+        self.running = True
+        self.thread = threading.Thread(target=self._serve)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def close(self):
+        ''' Serve the pending requests and stop the server thread
+        '''
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def act(self, obs, legal_actions):
+        ''' Get the action of an observation. Blocks until it is served
+
+        Args:
+            obs (numpy.array): The observation
+            legal_actions (list): The legal actions
+
+        Returns:
+            (int): The action
+        '''
+        request = _Request(obs, legal_actions)
+        with self.condition:
+            if not self.running:
+                raise RuntimeError('The inference server is not running')
+            self.requests.append(request)
+            self.condition.notify()
+        request.event.wait()
+        if isinstance(request.action, Exception):
+            raise request.action
+        return request.action
+
+    def _serve(self):
+        ''' The loop of the server thread
+        '''
+        while True:
+            with self.condition:
+                while self.running and not self.requests:
+                    self.condition.wait()
+                if not self.requests:
+                    return
+                deadline = time.time() + self.max_wait
+                while self.running and len(self.requests) < self.max_batch_size:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                batch = [self.requests.popleft() for _ in range(min(len(self.requests), self.max_batch_size))]
+            self._serve_batch(batch)
+
+    def _serve_batch(self, batch):
+        ''' Run one forward pass for a batch of requests and send the actions back
+        '''
+        try:
+            scores = np.asarray(self.predict_fn(np.stack([request.obs for request in batch])), dtype=np.float64)
+            mask = np.zeros(scores.shape, dtype=bool)
+            for i, request in enumerate(batch):
+                mask[i, request.legal_actions] = True
+            if self.greedy:
+                actions = np.argmax(np.where(mask, scores, -np.inf), axis=1)
+            else:
+                probs = np.where(mask, scores, 0.0)
+                # Uniform over the legal actions if they all have zero probability
+                probs = np.where(probs.sum(axis=1, keepdims=True) > 0, probs, mask)
+                cdf = np.cumsum(probs, axis=1)
+                targets = (1.0 - np.random.random(len(batch))) * cdf[:, -1]
+                actions = np.argmax(cdf >= targets[:, np.newaxis], axis=1)
+            for request, action in zip(batch, actions):
+                request.action = int(action)
+        except Exception as error:
+            for request in batch:
+                request.action = error
+        self.batch_num += 1
+        self.request_num += len(batch)
+        for request in batch:
+            request.event.set()
+
+
+class InferenceAgent(object):
+    ''' An agent that gets its actions from an InferenceServer
+    '''
+
+    def __init__(self, server):
+        ''' Initialize
+
+        Args:
+            server (InferenceServer): The server, shared by the agents of all the threads
+        '''
+        self.server = server
+
+    def step(self, state):
+        ''' Get the action of a state from the server
+
+        Args:
+            state (dict): The state, with the observation and the legal actions
+
+        Returns:
+            (int): The action
+        '''
+        return self.server.act(state['obs'], state['legal_actions'])
+
+    def eval_step(self, state):
+        ''' Get the action of a state from the server, the same as step
+        '''
+        return self.step(state)
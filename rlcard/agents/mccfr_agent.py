@@ -0,0 +1,144 @@
+import numpy as np
+
+from rlcard.agents.cfr_agent import CFRAgent
+
+class MCCFRAgent(CFRAgent):
+    ''' Implement Monte Carlo CFR with external sampling or outcome sampling
+
+    Instead of traversing the whole game tree, each iteration samples part of
+    it through Env.step and Env.step_back. The chance events are sampled by the
+    environment.
+
+        external: at the nodes of the traversing player every action is
+          traversed, while one action of the other players is sampled
+        outcome: one action is sampled at every node, so the cost of an
+          iteration is linear in the depth of the game. The traversing player
+          explores with probability epsilon
+    '''
+
+    samplings = ('external', 'outcome')
+
+    def __init__(self, env, model_path='./mccfr_model', sampling='external', epsilon=0.6):
+        ''' Initilize Agent
+
+        Args:
+            env (Env): Env class
+            model_path (str): The directory to save the model
+            sampling (str): The sampling scheme, 'external' or 'outcome'
+            epsilon (float): The exploration of the traversing player in outcome sampling
+        '''
+        if sampling not in self.samplings:
+            raise ValueError('Unknown sampling {}. Supported samplings: {}'.format(sampling, self.samplings))
+        super(MCCFRAgent, self).__init__(env, model_path=model_path)
+        self.sampling = sampling
+        self.epsilon = epsilon
+
+    def train(self):
+        ''' Do one iteration of MCCFR, which samples one traversal for each player
+        '''
+        self.iteration += 1
+        for player_id in range(self.env.player_num):
+            self.env.init_game()
+            if self.sampling == 'external':
+                self.traverse_external(player_id)
+            else:
+                self.traverse_outcome(player_id, 1.0, 1.0, 1.0)
+
+    def traverse_external(self, player_id):
+        ''' Traverse the game tree with external sampling, update the regrets
+
+        Args:
+            player_id (int): The player to update the value
+
+        Returns:
+            (float): The sampled utility of the player
+        '''
+        if self.env.is_over():
+            return self.env.get_payoffs()[player_id]
+
+        current_player = self.env.get_player_id()
+        obs, legal_actions = self.get_state(current_player)
+        infoset_id = self.table.get_id(obs)
+        action_probs = self.table.current_policy(infoset_id, legal_actions)
+
+        if current_player != player_id:
+            # The policy of the other players is averaged at their own nodes
+            self.table.average_policy[infoset_id, legal_actions] += action_probs[legal_actions]
+            action = sample_action(action_probs)
+            self.env.step(action)
+            utility = self.traverse_external(player_id)
+            self.env.step_back()
+            return utility
+
+        action_utilities = np.zeros(len(legal_actions))
+        for i, action in enumerate(legal_actions):
+            self.env.step(action)
+            action_utilities[i] = self.traverse_external(player_id)
+            self.env.step_back()
+        state_utility = np.dot(action_probs[legal_actions], action_utilities)
+        self.table.regrets[infoset_id, legal_actions] += action_utilities - state_utility
+        return state_utility
+
+    def traverse_outcome(self, player_id, player_prob, opponent_prob, sample_prob):
+        ''' Sample one trajectory with outcome sampling, update the regrets
+
+        Args:
+            player_id (int): The player to update the value
+            player_prob (float): The reach probability of the player
+            opponent_prob (float): The reach probability of the other players
+            sample_prob (float): The probability of sampling the trajectory
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (float): The utility of the player divided by the sample probability
+                (float): The probability of reaching the end of the trajectory
+                  from the current node with the current policy
+        '''
+        if self.env.is_over():
+            return self.env.get_payoffs()[player_id] / sample_prob, 1.0
+
+        current_player = self.env.get_player_id()
+        obs, legal_actions = self.get_state(current_player)
+        infoset_id = self.table.get_id(obs)
+        action_probs = self.table.current_policy(infoset_id, legal_actions)
+
+        if current_player == player_id:
+            sample_probs = (1 - self.epsilon) * action_probs
+            sample_probs[legal_actions] += self.epsilon / len(legal_actions)
+        else:
+            sample_probs = action_probs
+        action = sample_action(sample_probs)
+        action_prob = action_probs[action]
+
+        self.env.step(action)
+        if current_player == player_id:
+            utility, tail_prob = self.traverse_outcome(player_id, player_prob * action_prob,
+                                                       opponent_prob, sample_prob * sample_probs[action])
+        else:
+            utility, tail_prob = self.traverse_outcome(player_id, player_prob, opponent_prob * action_prob,
+                                                       sample_prob * sample_probs[action])
+        self.env.step_back()
+
+        if current_player == player_id:
+            # The regret of the sampled action is weighted by the probability of
+            # reaching the end from it, that of the others is zero
+            weight = utility * opponent_prob
+            self.table.regrets[infoset_id, legal_actions] -= weight * tail_prob * action_prob
+            self.table.regrets[infoset_id, action] += weight * tail_prob
+        else:
+            self.table.average_policy[infoset_id, legal_actions] += opponent_prob * action_probs[legal_actions] / sample_prob
+        return utility, tail_prob * action_prob
+
+def sample_action(probs):
+    ''' Sample an action from the action probabilities
+
+    Args:
+        probs (numpy.array): The probabilities of all the actions
+
+    Returns:
+        (int): The sampled action
+    '''
+    cumulative = np.cumsum(probs)
+    action = int(np.searchsorted(cumulative, np.random.random() * cumulative[-1], side='right'))
+    return min(action, len(probs) - 1)
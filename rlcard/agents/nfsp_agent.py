@@ -19,7 +19,6 @@ See the paper https://arxiv.org/abs/1603.01121 for more details.
 '''
 
 import collections
-import random
 import enum
 import numpy as np
 import sonnet as snt
@@ -27,6 +26,7 @@ import tensorflow as tf
 
 from rlcard.agents.dqn_agent import DQNAgent
 from rlcard.utils.utils import remove_illegal
+from rlcard.utils.buffers import ArrayBuffer
 
 Transition = collections.namedtuple('Transition', 'info_state action_probs')
 
@@ -256,9 +256,7 @@ class NFSPAgent(object):
                 len(self._reservoir_buffer) < self._min_buffer_size_to_learn):
             return None
 
-        transitions = self._reservoir_buffer.sample(self._batch_size)
-        info_states = [t.info_state for t in transitions]
-        action_probs = [t.action_probs for t in transitions]
+        info_states, action_probs = self._reservoir_buffer.sample(self._batch_size)
 
         loss, _ = self._sess.run(
                 [self._loss, self._learn_step],
@@ -269,11 +267,12 @@ class NFSPAgent(object):
 
         return loss
 
-class ReservoirBuffer(object):
+class ReservoirBuffer(ArrayBuffer):
     ''' Allows uniform sampling over a stream of data.
 
-    This class supports the storage of arbitrary elements, such as observation
-    tensors, integer actions, etc.
+    This class supports the storage of elements such as observation tensors,
+    integer actions, or namedtuples of them, in preallocated arrays. See
+    rlcard.utils.buffers.
 
     See https://en.wikipedia.org/wiki/Reservoir_sampling for more details.
     '''
@@ -281,8 +280,8 @@ class ReservoirBuffer(object):
     def __init__(self, reservoir_buffer_capacity):
         ''' Initialize the buffer.
         '''
-        self._reservoir_buffer_capacity = reservoir_buffer_capacity
-        self._data = []
+        super(ReservoirBuffer, self).__init__(reservoir_buffer_capacity)
+        self._reservoir_buffer_capacity = self._capacity
         self._add_calls = 0
 
     def add(self, element):
@@ -291,39 +290,41 @@ class ReservoirBuffer(object):
         Args:
             element (object): data to be added to the reservoir buffer.
         '''
-        if len(self._data) < self._reservoir_buffer_capacity:
-            self._data.append(element)
+        values = self._split(element)
+        if self._size < self._capacity:
+            self._reserve(self._size + 1)
+            self._store(self._size, values)
+            self._size += 1
         else:
             idx = np.random.randint(0, self._add_calls + 1)
-            if idx < self._reservoir_buffer_capacity:
-                self._data[idx] = element
+            if idx < self._capacity:
+                self._store(idx, values)
         self._add_calls += 1
 
-    def sample(self, num_samples):
-        ''' Returns `num_samples` uniformly sampled from the buffer.
+    def add_batch(self, elements):
+        ''' Potentially adds a batch of elements, the same as adding them one by one
 
         Args:
-            num_samples (int): The number of samples to draw.
-
-        Returns:
-            An iterable over `num_samples` random elements of the buffer.
-
-        Raises:
-            ValueError: If there are less than `num_samples` elements in the buffer
+            elements (object): An element whose fields are the batches of the
+              fields of the elements
         '''
-        if len(self._data) < num_samples:
-            raise ValueError("{} elements could not be sampled from size {}".format(
-                    num_samples, len(self._data)))
-        return random.sample(self._data, num_samples)
+        values = self._split_batch(elements)
+        num = len(values[0])
+        calls = self._add_calls + np.arange(num)
+        # The buffer is filled first, then the n-th element replaces a random
+        # element with probability capacity / n
+        indices = np.where(calls < self._capacity, calls, np.random.randint(0, calls + 1))
+        kept = np.nonzero(indices < self._capacity)[0]
+        # Only the last of the elements added at the same index is kept
+        _, last = np.unique(indices[kept][::-1], return_index=True)
+        kept = kept[len(kept) - 1 - last]
+        self._size = min(self._capacity, self._add_calls + num)
+        self._reserve(self._size)
+        self._store(indices[kept], [value[kept] for value in values])
+        self._add_calls += num
 
     def clear(self):
         ''' Clear the buffer
         '''
-        self._data = []
+        super(ReservoirBuffer, self).clear()
         self._add_calls = 0
-
-    def __len__(self):
-        return len(self._data)
-
-    def __iter__(self):
-        return iter(self._data)
@@ -243,18 +243,16 @@ class NFSPAgent(object):
                 len(self._reservoir_buffer) < self._min_buffer_size_to_learn):
             return None
 
-        transitions = self._reservoir_buffer.sample(self._batch_size)
-        info_states = [t.info_state for t in transitions]
-        action_probs = [t.action_probs for t in transitions]
+        info_states, action_probs = self._reservoir_buffer.sample(self._batch_size)
 
         self.policy_network_optimizer.zero_grad()
         self.policy_network.train()
 
         # (batch, state_size)
-        info_states = torch.from_numpy(np.array(info_states)).float().to(self.device)
+        info_states = torch.from_numpy(info_states).float().to(self.device)
 
         # (batch, action_num)
-        eval_action_probs = torch.from_numpy(np.array(action_probs)).float().to(self.device)
+        eval_action_probs = torch.from_numpy(action_probs).float().to(self.device)
 
         # (batch, action_num)
         log_forecast_action_probs = self.policy_network(info_states)
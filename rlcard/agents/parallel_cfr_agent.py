@@ -0,0 +1,239 @@
+''' Parallel CFR with shared-memory tables
+
+The deals of each iteration are split across worker processes. Every worker
+traverses its deals with its own copy of the environment. The current policy
+is published to the workers in a shared-memory array, and every worker writes
+its regret and average policy deltas into its own shared-memory arrays. The
+deltas are merged into the table of the agent at the iteration boundaries.
+
+Information set ids are kept consistent by the agent: after each merge, the
+keys interned by the agent are sent to the workers, which intern them in the
+same order. A key first seen by a worker gets a temporary id after the
+synchronized ones, and only the key is sent back through the pipe. The delta
+itself stays in shared memory.
+'''
+
+import random
+import multiprocessing
+import numpy as np
+
+from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.agents.cfr_table import CFRTable
+from rlcard.utils.utils import assign_task
+
+
+class SharedCFRTable(CFRTable):
+    ''' The table of a worker, backed by shared-memory arrays of fixed capacity
+
+    The policy is written by the agent, while the regrets and the average
+    policy only hold the deltas of the current task.
+    '''
+
+    def __init__(self, policy, regrets, average_policy):
+        ''' Initialize
+
+        Args:
+            policy (numpy.array): the shared policy of shape (capacity, action_num)
+            regrets (numpy.array): the shared regret deltas of the worker
+            average_policy (numpy.array): the shared average policy deltas of the worker
+        '''
+        self.action_num = policy.shape[1]
+        self.index = {}
+        self.keys = []
+        self.policy = policy
+        self.regrets = regrets
+        self.average_policy = average_policy
+        # The number of keys synchronized with the agent
+        self.synced = 0
+
+    def _grow(self, capacity):
+        raise MemoryError('The shared CFR table is full. Increase the capacity of ParallelCFRAgent')
+
+    def sync(self, new_keys):
+        ''' Clear the deltas and intern the new keys of the agent
+
+        Args:
+            new_keys (list): the keys interned by the agent since the last sync
+        '''
+        self.regrets[:len(self)] = 0
+        self.average_policy[:len(self)] = 0
+        # Drop the temporary ids of the last task
+        for key in self.keys[self.synced:]:
+            del self.index[key]
+        del self.keys[self.synced:]
+        for key in new_keys:
+            self.get_id(key)
+        self.synced = len(self.keys)
+
+    def new_keys(self):
+        ''' Return the keys first seen in the current task, in the order of their ids
+        '''
+        return self.keys[self.synced:]
+
+
+def _shared_array(capacity, action_num, fill=0.0):
+    ''' Allocate a float64 array in shared memory
+
+    Returns:
+        (tuple): the raw shared array and a numpy view of it
+    '''
+    raw = multiprocessing.RawArray('d', capacity * action_num)
+    array = np.frombuffer(raw, dtype=np.float64).reshape(capacity, action_num)
+    array[:] = fill
+    return raw, array
+
+def _run_worker(env, conn, raw_arrays, capacity, seed, canonical):
+    ''' The loop of a worker process
+
+    Each task is a tuple (new_keys, player_ids, deal_num, iteration, average_weight).
+    For each of the deal_num deals, the tree is traversed for every player of
+    player_ids. The new keys of the task are sent back when it is done.
+    '''
+    random.seed(seed)
+    np.random.seed(seed)
+    policy, regrets, average_policy = [np.frombuffer(raw, dtype=np.float64).reshape(capacity, env.action_num)
+                                       for raw in raw_arrays]
+    agent = CFRAgent(env, canonical=canonical)
+    agent.table = SharedCFRTable(policy, regrets, average_policy)
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        new_keys, player_ids, deal_num, agent.iteration, agent.average_weight = task
+        try:
+            agent.table.sync(new_keys)
+            for _ in range(deal_num):
+                for player_id in player_ids:
+                    env.init_game()
+                    agent.traverse_tree(np.ones(env.player_num), player_id)
+            conn.send(agent.table.new_keys())
+        except Exception as error:
+            conn.send(error)
+    conn.close()
+
+
+class ParallelCFRAgent(CFRAgent):
+    ''' CFR with the traversals of each iteration run by a pool of processes
+    '''
+
+    def __init__(self, env, process_num=None, deal_num=None, capacity=65536, model_path='./cfr_model', **kwargs):
+        ''' Initilize Agent
+
+        Args:
+            env (Env): Env class
+            process_num (int): The number of worker processes, default to the number of CPUs
+            deal_num (int): The number of deals traversed for each player in an
+              iteration, default to process_num
+            capacity (int): The maximum number of information sets
+            model_path (str): The directory to save the model
+            kwargs: The variant and its parameters, see CFRAgent
+
+        Note: The workers are started by the first call of train(). Call
+          close() to stop them.
+        '''
+        super(ParallelCFRAgent, self).__init__(env, model_path=model_path, **kwargs)
+        self.process_num = process_num if process_num else multiprocessing.cpu_count()
+        self.deal_num = deal_num if deal_num else self.process_num
+        self.capacity = capacity
+        self.workers = []
+
+    def start_workers(self):
+        ''' Allocate the shared arrays and start the worker processes
+        '''
+        action_num = self.env.action_num
+        raw_policy, self.shared_policy = _shared_array(self.capacity, action_num, 1.0 / action_num)
+        self.worker_deltas = []
+        seeds = np.random.randint(0, 2**31 - 1, size=self.process_num)
+        for seed in seeds:
+            raw_regrets, regrets = _shared_array(self.capacity, action_num)
+            raw_average_policy, average_policy = _shared_array(self.capacity, action_num)
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_run_worker,
+                                              args=(self.env, child_conn,
+                                                    (raw_policy, raw_regrets, raw_average_policy),
+                                                    self.capacity, int(seed), self.canonical))
+            process.daemon = True
+            process.start()
+            child_conn.close()
+            self.workers.append((process, parent_conn))
+            self.worker_deltas.append((regrets, average_policy))
+        # The number of keys sent to the workers
+        self.synced = 0
+        self.share_policy()
+
+    def close(self):
+        ''' Stop the worker processes
+        '''
+        for process, conn in self.workers:
+            conn.send(None)
+            conn.close()
+            process.join()
+        self.workers = []
+
+    def train(self):
+        ''' Do one iteration of CFR in parallel
+        '''
+        if not self.workers:
+            self.start_workers()
+        self.start_iteration()
+
+        # With alternating updates, the players are traversed one after another
+        if self.alternating:
+            phases = [[player_id] for player_id in range(self.env.player_num)]
+        else:
+            phases = [list(range(self.env.player_num))]
+        for player_ids in phases:
+            self.traverse_parallel(player_ids)
+            if self.alternating:
+                self.update_policy()
+
+        self.discount()
+
+        if not self.alternating:
+            self.update_policy()
+
+    def traverse_parallel(self, player_ids):
+        ''' Traverse the deals of the iteration in the workers and merge the deltas
+
+        Args:
+            player_ids (list): The players to update the values
+        '''
+        new_keys = self.table.keys[self.synced:]
+        self.synced = len(self.table)
+        deal_nums = assign_task(self.deal_num, self.process_num)
+        for (_, conn), deal_num in zip(self.workers, deal_nums):
+            conn.send((new_keys, player_ids, deal_num, self.iteration, self.average_weight))
+        results = [conn.recv() for _, conn in self.workers]
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+        size = self.synced
+        for (regrets, average_policy), worker_new_keys in zip(self.worker_deltas, results):
+            self.table.regrets[:size] += regrets[:size]
+            self.table.average_policy[:size] += average_policy[:size]
+            if worker_new_keys:
+                ids = [self.table.get_id(key) for key in worker_new_keys]
+                self.table.regrets[ids] += regrets[size:size + len(ids)]
+                self.table.average_policy[ids] += average_policy[size:size + len(ids)]
+
+    def load(self):
+        ''' Load model. The workers are restarted by the next call of train()
+        '''
+        self.close()
+        super(ParallelCFRAgent, self).load()
+
+    def update_policy(self):
+        ''' Update policy based on the current regrets, and publish it to the workers
+        '''
+        super(ParallelCFRAgent, self).update_policy()
+        if self.workers:
+            self.share_policy()
+
+    def share_policy(self):
+        ''' Copy the policy into the shared array read by the workers
+        '''
+        size = len(self.table)
+        if size > self.capacity:
+            raise MemoryError('The shared CFR table is full. Increase the capacity of ParallelCFRAgent')
+        self.shared_policy[:size] = self.table.policy[:size]
@@ -0,0 +1,199 @@
+''' Parallel Deep CFR data generation
+
+The traversals of each player are split across worker processes, while the
+networks are trained in the main process. Before the traversals of a player,
+the weights of the advantage networks are copied into a shared-memory array.
+Each worker loads a read-only snapshot of them and evaluates the networks
+with NumPy, so no TensorFlow session is used in the workers.
+
+A worker deals its own game where the player acts first, and writes the
+samples of its traversals into local array buffers. When it is done, the
+fields of the samples are sent back as contiguous arrays, one per field,
+and added to the memories of the agent in one batch.
+'''
+
+import random
+import multiprocessing
+import numpy as np
+
+from rlcard.agents.deep_cfr_agent import DeepCFR, FixedSizeRingBuffer
+from rlcard.utils.utils import assign_task
+
+
+class TraversalWorker(DeepCFR):
+    ''' The traversals of a worker process, with the advantage networks
+    evaluated in NumPy from a snapshot of their weights
+    '''
+
+    def __init__(self, env, weights, weight_shapes, traversal_batch_size=1, memory_capacity=int(1e7)):
+        ''' Initialize
+
+        Args:
+            env (Env): The environment of the worker
+            weights (numpy.array): The flattened weights of all the advantage networks
+            weight_shapes (list): For each player, the shapes of the weight
+              and the bias of each layer of its advantage network
+            traversal_batch_size (int): Number of traversals run at once
+            memory_capacity (int): Number of samples of the memories of a task
+        '''
+        self._env = env
+        self._num_players = env.player_num
+        self._num_actions = env.action_num
+        self._traversal_batch_size = traversal_batch_size
+        self._iteration = 1
+        self._strategy_memories = FixedSizeRingBuffer(memory_capacity)
+        self._advantage_memories = [FixedSizeRingBuffer(memory_capacity) for _ in range(self._num_players)]
+        self._shared_weights = weights
+        self._weight_shapes = weight_shapes
+        self._weights = None
+
+    def load_weights(self):
+        ''' Copy the weights out of the shared array
+        '''
+        self._weights = []
+        offset = 0
+        for shapes in self._weight_shapes:
+            arrays = []
+            for shape in shapes:
+                size = int(np.prod(shape))
+                arrays.append(self._shared_weights[offset:offset + size].reshape(shape).copy())
+                offset += size
+            self._weights.append(arrays)
+
+    def _advantages(self, player, info_states):
+        ''' Evaluate the advantage network of a player, an MLP with ReLU
+        activations except on the output layer
+        '''
+        outputs = np.asarray(info_states, dtype=np.float32)
+        weights = self._weights[player]
+        for i in range(0, len(weights), 2):
+            outputs = np.dot(outputs, weights[i]) + weights[i + 1]
+            if i + 2 < len(weights):
+                outputs = np.maximum(outputs, 0)
+        return outputs
+
+    def run_task(self, player, num_traversals, iteration):
+        ''' Traverse a game dealt for a player, with new memories
+
+        Args:
+            player (int): Player index for the traversals
+            num_traversals (int): The number of traversals
+            iteration (int): The current iteration of the agent
+
+        Returns:
+            (tuple): The AdvantageMemory of the player and the StrategyMemory
+              whose fields are the arrays of the samples, None if there is no sample
+        '''
+        self._iteration = iteration
+        self._strategy_memories.clear()
+        self._advantage_memories[player].clear()
+        if num_traversals > 0:
+            self._traverse(player, num_traversals)
+        return self._advantage_memories[player].all(), self._strategy_memories.all()
+
+def _run_worker(env, conn, raw_weights, weight_shapes, traversal_batch_size, memory_capacity, seed):
+    ''' The loop of a worker process
+
+    Each task is a tuple (player, num_traversals, iteration). The samples of
+    the traversals are sent back when it is done.
+    '''
+    random.seed(seed)
+    np.random.seed(seed)
+    weights = np.frombuffer(raw_weights, dtype=np.float32)
+    worker = TraversalWorker(env, weights, weight_shapes, traversal_batch_size, memory_capacity)
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        try:
+            worker.load_weights()
+            conn.send(worker.run_task(*task))
+        except Exception as error:
+            conn.send(error)
+    conn.close()
+
+
+class ParallelDeepCFR(DeepCFR):
+    ''' Deep CFR with the traversals run by a pool of processes
+    '''
+
+    def __init__(self, session, env, process_num=None, **kwargs):
+        ''' Initialize
+
+        Args:
+            session (tf.Session): TensorFlow session
+            env (Env): The environment, copied into the workers
+            process_num (int): The number of worker processes, default to the number of CPUs
+            kwargs: The parameters of DeepCFR. num_traversals is split across the workers
+
+        Note: The workers are started by the first call of train(). Call
+          close() to stop them.
+        '''
+        super(ParallelDeepCFR, self).__init__(session, env, **kwargs)
+        self.process_num = process_num if process_num else multiprocessing.cpu_count()
+        self._weight_variables = [[variable for layer in network.layers for variable in (layer.w, layer.b)]
+                                  for network in self._advantage_networks]
+        self.workers = []
+
+    def start_workers(self):
+        ''' Allocate the shared weights and start the worker processes
+        '''
+        weight_shapes = [[tuple(variable.get_shape().as_list()) for variable in variables]
+                         for variables in self._weight_variables]
+        size = sum(int(np.prod(shape)) for shapes in weight_shapes for shape in shapes)
+        raw_weights = multiprocessing.RawArray('f', size)
+        self.shared_weights = np.frombuffer(raw_weights, dtype=np.float32)
+        memory_capacity = self._strategy_memories._capacity
+        seeds = np.random.randint(0, 2**31 - 1, size=self.process_num)
+        for seed in seeds:
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_run_worker,
+                                              args=(self._env, child_conn, raw_weights, weight_shapes,
+                                                    self._traversal_batch_size, memory_capacity, int(seed)))
+            process.daemon = True
+            process.start()
+            child_conn.close()
+            self.workers.append((process, parent_conn))
+
+    def close(self):
+        ''' Stop the worker processes
+        '''
+        for process, conn in self.workers:
+            conn.send(None)
+            conn.close()
+            process.join()
+        self.workers = []
+
+    def share_weights(self):
+        ''' Copy the weights of the advantage networks into the shared array read by the workers
+        '''
+        offset = 0
+        for values in self._session.run(self._weight_variables):
+            for value in values:
+                self.shared_weights[offset:offset + value.size] = value.ravel()
+                offset += value.size
+
+    def _traverse(self, player, num_traversals):
+        ''' Run the traversals of a player in the workers, and add their
+        samples to the memories
+
+        Args:
+            player (int): Player index for the traversals.
+            num_traversals (int): The number of traversals, split across the workers.
+        '''
+        if not self.workers:
+            self.start_workers()
+        self.share_weights()
+        nums = assign_task(num_traversals, self.process_num)
+        for (_, conn), num in zip(self.workers, nums):
+            conn.send((player, num, self._iteration))
+        results = [conn.recv() for _, conn in self.workers]
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+        for advantages, strategies in results:
+            if advantages is not None:
+                self._advantage_memories[player].add_batch(advantages)
+            if strategies is not None:
+                self._strategy_memories.add_batch(strategies)
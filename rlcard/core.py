@@ -8,10 +8,13 @@ class Card(object):
     Note:
         The suit variable in a standard card game should be one of [S, H, D, C, BJ, RJ] meaning [Spades, Hearts, Diamonds, Clubs, Black Joker, Red Joker]
         Similarly the rank variable should be one of [A, 2, 3, 4, 5, 6, 7, 8, 9, T, J, Q, K]
+        The id is an integer that identifies the card, the index of the suit
+        times 13 plus the index of the rank, 52 for BJ and 53 for RJ. It is -1
+        for other cards
     '''
 
-    suit = None
-    rank = None
+    __slots__ = ('suit', 'rank', 'id')
+
     valid_suit = ['S', 'H', 'D', 'C', 'BJ', 'RJ']
     valid_rank = ['A', '2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K']
 
@@ -24,6 +27,7 @@ class Card(object):
         '''
         self.suit = suit
         self.rank = rank
+        self.id = CARD_IDS.get(suit + rank, -1)
 
     def get_index(self):
         ''' Get index of a card.
@@ -33,6 +37,15 @@ class Card(object):
         '''
         return self.suit+self.rank
 
+# Index of a card (Eg: 'SA') -> id of the card
+CARD_IDS = {suit + rank: i * len(Card.valid_rank) + j
+            for i, suit in enumerate(Card.valid_suit[:4])
+            for j, rank in enumerate(Card.valid_rank)}
+CARD_IDS['BJ'] = 52
+CARD_IDS['RJ'] = 53
+# Id of a card -> index of the card
+CARD_INDEXES = {card_id: index for index, card_id in CARD_IDS.items()}
+
 
 class Dealer(object):
     ''' Dealer stores a deck of playing cards, remained cards holded by dealer, and can deal cards to players
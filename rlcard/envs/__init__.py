@@ -1,7 +1,7 @@
 ''' Register new environments
 '''
 
-from rlcard.envs.registration import register, make
+from rlcard.envs.registration import register, make, make_vec
 
 register(
     env_id='blackjack',
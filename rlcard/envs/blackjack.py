@@ -1,5 +1,3 @@
-import numpy as np
-
 from rlcard.envs.env import Env
 from rlcard.games.blackjack.game import BlackjackGame as Game
 
@@ -53,7 +51,9 @@ class BlackjackEnv(Env):
 
         my_score, _ = get_scores_and_A(my_cards)
         dealer_score, _ = get_scores_and_A(dealer_cards)
-        obs = np.array([my_score, dealer_score])
+        obs = self.new_obs(int)
+        obs[0] = my_score
+        obs[1] = dealer_score
 
         legal_actions = [i for i in range(len(self.actions))]
         extracted_state = {'obs': obs, 'legal_actions': legal_actions}
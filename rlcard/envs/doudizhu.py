@@ -1,10 +1,8 @@
-import numpy as np
-
 from rlcard.envs.env import Env
 from rlcard.games.doudizhu.game import DoudizhuGame as Game
 from rlcard.games.doudizhu.utils import SPECIFIC_MAP, CARD_RANK_STR
 from rlcard.games.doudizhu.utils import ACTION_LIST, ACTION_SPACE
-from rlcard.games.doudizhu.utils import encode_cards
+from rlcard.games.doudizhu.utils import encode_counts, str2counts
 
 
 class DoudizhuEnv(Env):
@@ -28,16 +26,15 @@ class DoudizhuEnv(Env):
                              the recent three actions
                              the union of all played cards
         '''
-        obs = np.zeros((6, 5, 15), dtype=int)
-        for index in range(6):
-            obs[index][0] = np.ones(15, dtype=int)
-        encode_cards(obs[0], state['current_hand'])
-        encode_cards(obs[1], state['others_hand'])
+        obs = self.new_obs(int)
+        obs[2:5, 0] = 1
+        encode_counts(obs[0], state['current_hand_counts'])
+        encode_counts(obs[1], state['others_hand_counts'])
         for i, action in enumerate(state['trace'][-3:]):
             if action[1] != 'pass':
-                encode_cards(obs[4-i], action[1])
-        if state['played_cards'] is not None:
-            encode_cards(obs[5], state['played_cards'])
+                obs[4-i, 0] = 0
+                encode_counts(obs[4-i], str2counts(action[1]))
+        encode_counts(obs[5], state['played_cards_counts'])
 
         extrated_state = {'obs': obs, 'legal_actions': self.get_legal_actions()}
         return extrated_state
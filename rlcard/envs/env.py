@@ -30,6 +30,46 @@ class Env(object):
         self.active_player = None
         self.human_mode = False
 
+        # The reusable buffer the observations are encoded into, None if a
+        # new array is allocated for every observation
+        self.obs_buffer = None
+
+    def set_obs_buffer(self, buffer=None, dtype=np.float32):
+        ''' Encode the observations in place into a reusable buffer
+
+        Args:
+            buffer (numpy.array): The buffer of shape state_shape. It can be a
+              view into a larger array, such as a row of a batch of
+              observations. If None, a buffer is allocated
+            dtype (numpy.dtype): The dtype of the allocated buffer
+
+        Returns:
+            (numpy.array): The buffer
+
+        Note: The obs of every extracted state is the buffer itself, so it is
+              overwritten by the next extracted state. Copy it to keep it.
+        '''
+        if buffer is None:
+            buffer = np.zeros(self.state_shape, dtype=dtype)
+        elif list(buffer.shape) != list(self.state_shape):
+            raise ValueError('Expected a buffer of shape {}, got {}'.format(self.state_shape, buffer.shape))
+        self.obs_buffer = buffer
+        return buffer
+
+    def new_obs(self, dtype=np.float64):
+        ''' Get a zeroed array of shape state_shape to encode an observation into
+
+        Args:
+            dtype (numpy.dtype): The dtype of the array when there is no buffer
+
+        Returns:
+            (numpy.array): The observation buffer, or a new array
+        '''
+        if self.obs_buffer is None:
+            return np.zeros(self.state_shape, dtype=dtype)
+        self.obs_buffer.fill(0)
+        return self.obs_buffer
+
     def init_game(self):
         ''' Start a new game
 
@@ -1,6 +1,5 @@
 import json
 import os
-import numpy as np
 
 import rlcard
 from rlcard.envs.env import Env
@@ -100,7 +99,7 @@ class HeartsEnv(Env):
             else:
                 processed_state[key] = value # Current hand (list of IDs), played cards (list of IDs), target suit (String)
 
-        obs = np.zeros(self.state_shape)
+        obs = self.new_obs()
 
         # add card in players own hand to the observed state
         idx = [self.card2index[card] for card in state['hand']]
@@ -1,9 +1,9 @@
 import json
 import os
-import numpy as np
 
 import rlcard
 from rlcard.envs.env import Env
+from rlcard.utils.isomorphism import SuitIsomorphism
 from rlcard.games.leducholdem.game import LeducholdemGame as Game
 from rlcard.utils.utils import *
 from rlcard import models
@@ -23,6 +23,18 @@ class LeducholdemEnv(Env):
         with open(os.path.join(rlcard.__path__[0], 'games/leducholdem/card2index.json'), 'r') as file:
             self.card2index = json.load(file)
 
+        # The suit isomorphism of the canonical_key, None if it is disabled
+        self.isomorphism = None
+
+    def enable_canonical_key(self, cache_size=100000):
+        ''' Add the canonical_key to the states, the bytes of the observation
+            with the suits renamed in a canonical order, see rlcard.utils.isomorphism
+
+        Args:
+            cache_size (int): the maximum number of cached groups of cards
+        '''
+        self.isomorphism = SuitIsomorphism('SH', cache_size)
+
     def print_state(self, player):
         ''' Print out the state of a given player
 
@@ -121,9 +133,11 @@ class LeducholdemEnv(Env):
         if public_card:
             cards.append(public_card)
         idx = [self.card2index[card] for card in cards]
-        obs = np.zeros(6)
+        obs = self.new_obs()
         obs[idx] = 1
         processed_state['obs'] = obs
+        if self.isomorphism is not None:
+            processed_state['canonical_key'] = self.isomorphism.canonical_obs(obs, [[hand], [public_card] if public_card else []], self.card2index).tostring()
 
         return processed_state
 
@@ -1,9 +1,10 @@
 import json
 import os
-import numpy as np
 
 import rlcard
 from rlcard.envs.env import Env
+from rlcard.utils.isomorphism import SuitIsomorphism
+from rlcard.games.limitholdem.equity import EquityCalculator
 from rlcard.games.limitholdem.game import LimitholdemGame as Game
 
 class LimitholdemEnv(Env):
@@ -20,6 +21,34 @@ class LimitholdemEnv(Env):
         with open(os.path.join(rlcard.__path__[0], 'games/limitholdem/card2index.json'), 'r') as file:
             self.card2index = json.load(file)
 
+        # The suit isomorphism of the canonical_key, None if it is disabled
+        self.isomorphism = None
+
+        # The calculator of the equity features, None if they are disabled
+        self.equity_calculator = None
+
+    def enable_canonical_key(self, cache_size=100000):
+        ''' Add the canonical_key to the states, the bytes of the observation
+            with the suits renamed in a canonical order, see rlcard.utils.isomorphism
+
+        Args:
+            cache_size (int): the maximum number of cached groups of cards
+        '''
+        self.isomorphism = SuitIsomorphism('SHDC', cache_size)
+        if self.equity_calculator is not None:
+            self.equity_calculator.isomorphism = self.isomorphism
+
+    def enable_equity_features(self, sample_num=1000, cache_size=100000):
+        ''' Append the hand strength and the equity of the hand of the player
+            to the observation, see rlcard.games.limitholdem.equity
+
+        Args:
+            sample_num (int): the number of samples of the equity before the river
+            cache_size (int): the maximum number of cached values
+        '''
+        self.equity_calculator = EquityCalculator(sample_num, cache_size, self.isomorphism)
+        self.state_shape = [74]
+
     def get_legal_actions(self):
         ''' Get all leagal actions
 
@@ -49,11 +78,15 @@ class LimitholdemEnv(Env):
         raise_nums = state['raise_nums']
         cards = public_cards + hand
         idx = [self.card2index[card] for card in cards]
-        obs = np.zeros(72)
+        obs = self.new_obs()
         obs[idx] = 1
         for i, num in enumerate(raise_nums):
             obs[52 + i * 5 + num] = 1
+        if self.equity_calculator is not None:
+            obs[72:] = self.equity_calculator.features(hand, public_cards, self.player_num - 1)
         processed_state['obs'] = obs
+        if self.isomorphism is not None:
+            processed_state['canonical_key'] = self.isomorphism.canonical_obs(obs, [hand, public_cards], self.card2index).tostring()
 
         return processed_state
 
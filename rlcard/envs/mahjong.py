@@ -1,5 +1,3 @@
-import numpy as np
-
 from rlcard.envs.env import Env
 from rlcard.games.mahjong.game import MahjongGame as Game
 from rlcard.games.mahjong.card import MahjongCard as Card
@@ -29,15 +27,11 @@ class MahjongEnv(Env):
                              the union of all played cards
         '''
         players_pile = state['players_pile']
-        hand_rep = encode_cards(state['current_hand'])
-        piles_rep = []
-        for p in players_pile.keys():
-            piles_rep.append(encode_cards(pile2list(players_pile[p])))
-        piles_rep = np.array(piles_rep)
-        table_rep = encode_cards(state['table'])
-        rep = [hand_rep, table_rep]
-        rep.extend(piles_rep)
-        obs = np.array(rep)
+        obs = self.new_obs(int)
+        encode_cards(state['current_hand'], obs[0])
+        encode_cards(state['table'], obs[1])
+        for i, p in enumerate(players_pile.keys()):
+            encode_cards(pile2list(players_pile[p]), obs[2 + i])
 
         extrated_state = {'obs': obs, 'legal_actions': self.get_legal_actions()}
         return extrated_state
@@ -69,7 +63,7 @@ class MahjongEnv(Env):
         if action_id < 34:
             candidates = self.game.get_legal_actions(self.game.get_state(self.game.round.current_player))
             for card in candidates:
-                if card.get_str() == action:
+                if card.id == action_id:
                     action = card
                     break
         return action
@@ -89,9 +83,9 @@ class MahjongEnv(Env):
         if legal_actions:
             for action in legal_actions:
                 if isinstance(action, Card):
-                    action = action.get_str()
-                action_id = self.action_id[action]
-                legal_action_id.append(action_id)
+                    legal_action_id.append(action.id)
+                else:
+                    legal_action_id.append(self.action_id[action])
         else:
             print("##########################")
             print("No Legal Actions")
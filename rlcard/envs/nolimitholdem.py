@@ -1,9 +1,10 @@
 import json
 import os
-import numpy as np
 
 import rlcard
 from rlcard.envs.env import Env
+from rlcard.utils.isomorphism import SuitIsomorphism
+from rlcard.games.limitholdem.equity import EquityCalculator
 from rlcard.games.nolimitholdem.game import NolimitholdemGame as Game
 
 class NolimitholdemEnv(Env):
@@ -22,6 +23,34 @@ class NolimitholdemEnv(Env):
         with open(os.path.join(rlcard.__path__[0], 'games/limitholdem/card2index.json'), 'r') as file:
             self.card2index = json.load(file)
 
+        # The suit isomorphism of the canonical_key, None if it is disabled
+        self.isomorphism = None
+
+        # The calculator of the equity features, None if they are disabled
+        self.equity_calculator = None
+
+    def enable_canonical_key(self, cache_size=100000):
+        ''' Add the canonical_key to the states, the bytes of the observation
+            with the suits renamed in a canonical order, see rlcard.utils.isomorphism
+
+        Args:
+            cache_size (int): the maximum number of cached groups of cards
+        '''
+        self.isomorphism = SuitIsomorphism('SHDC', cache_size)
+        if self.equity_calculator is not None:
+            self.equity_calculator.isomorphism = self.isomorphism
+
+    def enable_equity_features(self, sample_num=1000, cache_size=100000):
+        ''' Append the hand strength and the equity of the hand of the player
+            to the observation, see rlcard.games.limitholdem.equity
+
+        Args:
+            sample_num (int): the number of samples of the equity before the river
+            cache_size (int): the maximum number of cached values
+        '''
+        self.equity_calculator = EquityCalculator(sample_num, cache_size, self.isomorphism)
+        self.state_shape = [56]
+
     def get_legal_actions(self):
         ''' Get all leagal actions
 
@@ -52,11 +81,15 @@ class NolimitholdemEnv(Env):
         all_chips = state['all_chips']
         cards = public_cards + hand
         idx = [self.card2index[card] for card in cards]
-        obs = np.zeros(54)
+        obs = self.new_obs()
         obs[idx] = 1
         obs[52] = float(my_chips)
         obs[53] = float(max(all_chips))
+        if self.equity_calculator is not None:
+            obs[54:] = self.equity_calculator.features(hand, public_cards, self.player_num - 1)
         processed_state['obs'] = obs
+        if self.isomorphism is not None:
+            processed_state['canonical_key'] = self.isomorphism.canonical_obs(obs, [hand, public_cards], self.card2index).tostring()
 
         return processed_state
 
@@ -84,16 +117,3 @@ class NolimitholdemEnv(Env):
             else:
                 return 'fold'
         return self.actions[action_id]
-    
-    def decode_action(self, action_id):
-        legal_ids = self.get_legal_actions()
-        if action_id in legal_ids:
-            return ACTION_LIST[action_id]
-        #if (len(self.game.dealer.deck) + len(self.game.round.played_cards)) > 17:
-        #    return ACTION_LIST[60]
-        return ACTION_LIST[np.random.choice(legal_ids)]
-
-    def get_legal_actions(self):
-        legal_actions = self.game.get_legal_actions()
-        legal_ids = [ACTION_SPACE[action] for action in legal_actions]
-        return legal_ids
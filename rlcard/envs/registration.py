@@ -1,5 +1,7 @@
 import importlib
 
+from rlcard.envs.vec_env import VectorEnv
+
 class EnvSpec(object):
     ''' A specification for a particular instance of the environment.
     '''
@@ -57,6 +59,19 @@ class EnvRegistry(object):
             raise ValueError('Cannot find env_id: {}'.format(env_id))
         return self.env_specs[env_id].make(allow_step_back)
 
+    def make_vec(self, env_id, num_envs, allow_step_back=False, obs_dtype=None):
+        ''' Create a vectorized environment of independent instances
+
+        Args:
+            env_id (string): the name of the environment
+            num_envs (int): the number of game instances stepped in lockstep
+            allow_step_back (boolean): True if you wants to able to step_back
+            obs_dtype (numpy.dtype): the dtype of the shared batch of observations, see VectorEnv
+        '''
+        if env_id not in self.env_specs:
+            raise ValueError('Cannot find env_id: {}'.format(env_id))
+        return VectorEnv([self.env_specs[env_id].make(allow_step_back) for _ in range(num_envs)], obs_dtype)
+
 # Have a global registry
 registry = EnvRegistry()
 
@@ -78,3 +93,14 @@ def make(env_id, allow_step_back=False):
         allow_step_back (boolean): True if you wants to able to step_back
     '''
     return registry.make(env_id, allow_step_back)
+
+def make_vec(env_id, num_envs, allow_step_back=False, obs_dtype=None):
+    ''' Create a vectorized environment of independent instances
+
+    Args:
+        env_id (string): the name of the environment
+        num_envs (int): the number of game instances stepped in lockstep
+        allow_step_back (boolean): True if you wants to able to step_back
+        obs_dtype (numpy.dtype): the dtype of the shared batch of observations, see VectorEnv
+    '''
+    return registry.make_vec(env_id, num_envs, allow_step_back, obs_dtype)
@@ -71,7 +71,7 @@ class UnoEnv(Env):
         return models.load('uno-rule-v1')
 
     def extract_state(self, state):
-        obs = np.zeros((7, 4, 15), dtype=int)
+        obs = self.new_obs(int)
         encode_hand(obs[:3], state['hand'])
         encode_target(obs[3], state['target'])
         encode_hand(obs[4:], state['others_hand'])
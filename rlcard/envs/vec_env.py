@@ -0,0 +1,133 @@
+import numpy as np
+
+
+class VectorEnv(object):
+    ''' Step a number of independent game instances in lockstep
+
+    The observations of all the sub-games are stacked into a single array and
+    the legal actions are returned as a mask matrix, so that agents can run one
+    batched forward pass for all the games instead of one pass per state.
+    Sub-games that are over are automatically restarted.
+
+    With an obs_dtype, every sub-environment encodes its observations in
+    place into one row of a preallocated batch, which is returned without
+    stacking or copying.
+    '''
+
+    def __init__(self, envs, obs_dtype=None):
+        ''' Initialize
+
+        Args:
+            envs (list): A list of Env objects of the same game
+            obs_dtype (numpy.dtype): The dtype of the shared batch of
+              observations (Eg: np.int8 or np.float32). If None, the
+              observations are stacked into a new array at every step
+        '''
+        if not envs:
+            raise ValueError('VectorEnv needs at least one environment')
+        self.envs = envs
+        self.num_envs = len(envs)
+        self.player_num = envs[0].player_num
+        self.action_num = envs[0].action_num
+        self.state_shape = envs[0].state_shape
+
+        # The latest extracted state and current player of each sub-game
+        self.states = [None for _ in range(self.num_envs)]
+        self.player_ids = np.zeros(self.num_envs, dtype=int)
+
+        # The batch of observations shared with the sub-environments
+        self.obs = None
+        if obs_dtype is not None:
+            self.obs = np.zeros([self.num_envs] + list(self.state_shape), dtype=obs_dtype)
+            for i, env in enumerate(self.envs):
+                env.set_obs_buffer(self.obs[i])
+
+    def reset(self):
+        ''' Start a new game in every sub-environment
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The stacked observations, (num_envs, *state_shape)
+                (numpy.array): The legal action mask, (num_envs, action_num)
+                (numpy.array): The ID of the current player of each game
+        '''
+        for i in range(self.num_envs):
+            self._init_game(i)
+        return self.get_obs(), self.get_legal_actions_mask(), self.player_ids.copy()
+
+    def step(self, actions):
+        ''' Take one action in every sub-environment
+
+        Args:
+            actions (list or numpy.array): One action id for each sub-game
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The stacked observations, (num_envs, *state_shape)
+                (numpy.array): The legal action mask, (num_envs, action_num)
+                (numpy.array): The ID of the current player of each game
+                (numpy.array): The payoffs, (num_envs, player_num). Rows of games
+                               that are not over are zeros
+                (numpy.array): Boolean flags of the games that are over in this step
+
+        Note: Games that are over are restarted, so the observations, masks and
+              player ids of those games belong to the first state of the new game.
+        '''
+        if len(actions) != self.num_envs:
+            raise ValueError('Expected {} actions, got {}'.format(self.num_envs, len(actions)))
+
+        payoffs = np.zeros((self.num_envs, self.player_num))
+        dones = np.zeros(self.num_envs, dtype=bool)
+        for i, env in enumerate(self.envs):
+            state, player_id = env.step(int(actions[i]))
+            if env.is_over():
+                payoffs[i] = env.get_payoffs()
+                dones[i] = True
+                self._init_game(i)
+            else:
+                self.states[i] = state
+                self.player_ids[i] = player_id
+
+        return self.get_obs(), self.get_legal_actions_mask(), self.player_ids.copy(), payoffs, dones
+
+    def get_states(self):
+        ''' Get the latest extracted state of every sub-game
+
+        Returns:
+            (list): A list of state dictionaries, one for each sub-game
+        '''
+        return list(self.states)
+
+    def get_obs(self):
+        ''' Get the stacked observations
+
+        Returns:
+            (numpy.array): The observations, (num_envs, *state_shape). With an
+              obs_dtype, it is the shared batch, which the next step overwrites
+        '''
+        if self.obs is not None:
+            return self.obs
+        return np.stack([state['obs'] for state in self.states])
+
+    def get_legal_actions_mask(self):
+        ''' Get the legal actions of every sub-game as a mask matrix
+
+        Returns:
+            (numpy.array): Boolean array of shape (num_envs, action_num)
+        '''
+        mask = np.zeros((self.num_envs, self.action_num), dtype=bool)
+        for i, state in enumerate(self.states):
+            mask[i, state['legal_actions']] = True
+        return mask
+
+    def _init_game(self, index):
+        ''' Start a new game in one sub-environment
+
+        Args:
+            index (int): The index of the sub-environment
+        '''
+        state, player_id = self.envs[index].init_game()
+        self.states[index] = state
+        self.player_ids[index] = player_id
@@ -1,8 +1,7 @@
-from copy import deepcopy
-
 from rlcard.games.blackjack.dealer import BlackjackDealer as Dealer
 from rlcard.games.blackjack.player import BlackjackPlayer as Player
 from rlcard.games.blackjack.judger import BlackjackJudger as Judger
+from rlcard.utils.undo_log import UndoLog
 import random
 
 class BlackjackGame(object):
@@ -30,7 +29,7 @@ class BlackjackGame(object):
         self.player.status, self.player.score = self.judger.judge_round(self.player)
         self.dealer.status, self.dealer.score = self.judger.judge_round(self.dealer)
         self.winner = {'dealer':0, 'player':0}
-        self.history = []
+        self.history = UndoLog()
         return self.get_state(self.get_player_id()), self.get_player_id()
 
     def step(self, action):
@@ -44,10 +43,10 @@ class BlackjackGame(object):
             int: next plater's id
         '''
         if self.allow_step_back:
-            p = deepcopy(self.player)
-            d = deepcopy(self.dealer)
-            w = deepcopy(self.winner)
-            self.history.append((d,p,w))
+            self.history.begin_step()
+            self.history.record(self.player, 'hand', 'status', 'score')
+            self.history.record(self.dealer, 'deck', 'hand', 'status', 'score')
+            self.history.record(self, 'winner')
 
         next_state = {}
         # Play hit
@@ -85,11 +84,7 @@ class BlackjackGame(object):
         Returns:
             Status (bool): check if the step back is success or not
         '''
-        #while len(self.history) > 0:
-        if len(self.history) > 0:
-            self.dealer, self.player, self.winner = self.history.pop()
-            return True
-        return False
+        return self.history.undo_step()
 
     @staticmethod
     def get_player_num():
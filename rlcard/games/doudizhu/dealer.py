@@ -75,7 +75,8 @@ class DoudizhuDealer(object):
         #self.landlord.role = 'landlord'
 
         # give the 'landlord' the  three cards
-        self.landlord.current_hand.extend(self.deck[-3:])
-        self.landlord.current_hand.sort(key=functools.cmp_to_key(doudizhu_sort_card))
+        current_hand = self.landlord.current_hand + self.deck[-3:]
+        current_hand.sort(key=functools.cmp_to_key(doudizhu_sort_card))
+        self.landlord.set_current_hand(current_hand)
         self.landlord.initial_hand = cards2str(self.landlord.current_hand)
         return self.landlord.player_id
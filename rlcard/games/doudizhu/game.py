@@ -2,15 +2,12 @@
 ''' Implement Doudizhu Game class
 '''
 
-import functools
 import copy
-from heapq import merge 
 
-from rlcard.games.doudizhu.judger import cards2str
 from rlcard.games.doudizhu.player import DoudizhuPlayer as Player
 from rlcard.games.doudizhu.round import DoudizhuRound as Round
 from rlcard.games.doudizhu.judger import DoudizhuJudger as Judger
-from rlcard.games.doudizhu.utils import doudizhu_sort_card
+from rlcard.games.doudizhu.utils import counts2str
 from rlcard.utils.utils import get_downstream_player_id, get_upstream_player_id
 
 
@@ -30,8 +27,15 @@ class DoudizhuGame(object):
              'played_cards': ['6', '8', '8', 'Q', 'K', 'K', 'K', '2', '2', '2'],
              'others_hand': '333444555678899TTTJJJQQAA2R',
              'current_hand': '3456677799TJQKAAB',
-             'actions': ['pass', 'K', 'A', 'B']
+             'actions': ['pass', 'K', 'A', 'B'],
+             'current_hand_counts': (1, 1, 1, 2, 3, 0, 2, 1, 1, 1, 1, 2, 0, 1, 0),
+             'others_hand_counts': (3, 3, 3, 1, 1, 2, 2, 3, 3, 2, 0, 2, 1, 0, 1),
+             'played_cards_counts': (0, 0, 0, 1, 0, 2, 0, 0, 0, 1, 3, 0, 3, 0, 0)
             }
+
+    The counts are the number of cards of each rank, in the order of
+    CARD_RANK_STR in utils. They are kept up to date as cards are played and
+    taken back.
     '''
 
     def __init__(self, allow_step_back=False):
@@ -63,9 +67,9 @@ class DoudizhuGame(object):
         # get state of first player
         player_id = self.round.current_player
         player = self.players[player_id]
-        others_hands = self._get_others_current_hand(player)
+        others_hand_counts = self._get_others_hand_counts(player)
         actions = list(self.judger.playable_cards[player_id])
-        state = player.get_state(self.round.public, others_hands, actions)
+        state = player.get_state(self.round.public, counts2str(others_hand_counts), actions, others_hand_counts)
         self.state = state
 
         return state, player_id
@@ -137,12 +141,12 @@ class DoudizhuGame(object):
             (dict): The state of the player
         '''
         player = self.players[player_id]
-        others_hands = self._get_others_current_hand(player)
+        others_hand_counts = self._get_others_hand_counts(player)
         if self.is_over():
             actions = None
         else:
             actions = list(player.available_actions(self.round.greater_player, self.judger))
-        state = player.get_state(self.round.public, others_hands, actions)
+        state = player.get_state(self.round.public, counts2str(others_hand_counts), actions, others_hand_counts)
 
         return state
 
@@ -181,12 +185,12 @@ class DoudizhuGame(object):
             return False
         return True
 
-    def _get_others_current_hand(self, player):
+    def _get_others_hand_counts(self, player):
+        ''' Get the number of cards of each rank in the hands of the other players
+        '''
         player_up = self.players[get_upstream_player_id(player, self.players)]
-        player_down = self.players[get_downstream_player_id(
-            player, self.players)]
-        others_hand = merge(player_up.current_hand, player_down.current_hand, key=functools.cmp_to_key(doudizhu_sort_card))
-        return cards2str(others_hand)
+        player_down = self.players[get_downstream_player_id(player, self.players)]
+        return player_up.hand_counts + player_down.hand_counts
 
 #if __name__ == '__main__':
 
@@ -2,12 +2,12 @@
 ''' Implement Doudizhu Judger class
 '''
 import numpy as np
-import collections
 from itertools import combinations
 from bisect import bisect_left
 
-from rlcard.games.doudizhu.utils import CARD_TYPE, CARD_RANK_STR, CARD_RANK_STR_INDEX
-from rlcard.games.doudizhu.utils import cards2str, contains_cards
+from rlcard.games.doudizhu.utils import CARD_TYPE, CARD_RANK_STR_INDEX
+from rlcard.games.doudizhu.utils import cards2str
+from rlcard.games.doudizhu.move_generator import get_move_table, pack_cards
 
 
 
@@ -124,149 +124,30 @@ class DoudizhuJudger(object):
     def playable_cards_from_hand(current_hand):
         ''' Get playable cards from hand
 
+        Args:
+            current_hand (str): string of cards. Eg: '56888TTQKKKAA222R'
+
         Returns:
             set: set of string of playable cards
         '''
-        cards_dict = collections.defaultdict(int)
-        for card in current_hand:
-            cards_dict[card] += 1
-        cards_count = np.array([cards_dict[k] for k in CARD_RANK_STR])
-        playable_cards = set()
-        
-        non_zero_indexes = np.argwhere(cards_count > 0)
-        more_than_1_indexes = np.argwhere(cards_count > 1)
-        more_than_2_indexes = np.argwhere(cards_count > 2)
-        more_than_3_indexes = np.argwhere(cards_count > 3)
-        #solo
-        for i in non_zero_indexes:
-            playable_cards.add(CARD_RANK_STR[i[0]])
-        #pair
-        for i in more_than_1_indexes:
-            playable_cards.add(CARD_RANK_STR[i[0]] * 2)
-        #bomb, four_two_solo, four_two_pair
-        for i in more_than_3_indexes:
-            cards = CARD_RANK_STR[i[0]] * 4
-            playable_cards.add(cards)
-            for left, right in DoudizhuJudger.solo_attachments(current_hand, i[0], 1, 2):
-                pre_attached = ''
-                for j in left:
-                    pre_attached += CARD_RANK_STR[j]
-                post_attached = ''
-                for j in right:
-                    post_attached += CARD_RANK_STR[j]
-                playable_cards.add(pre_attached + cards + post_attached)
-            for left, right in DoudizhuJudger.pair_attachments(cards_count, i[0], 1, 2):
-                pre_attached = ''
-                for j in left:
-                    pre_attached += CARD_RANK_STR[j] * 2
-                post_attached = ''
-                for j in right:
-                    post_attached += CARD_RANK_STR[j] * 2
-                playable_cards.add(pre_attached + cards + post_attached)
-
-        #solo_chain_5 -- #solo_chain_12
-        solo_chain_indexes = DoudizhuJudger.chain_indexes(non_zero_indexes)            
-        for (start_index, length) in solo_chain_indexes:
-            s, l = start_index, length
-            while(l >= 5):
-                cards = ''
-                curr_index = s - 1
-                curr_length = 0
-                while (curr_length < l and curr_length < 12):
-                    curr_index += 1
-                    curr_length += 1
-                    cards += CARD_RANK_STR[curr_index]
-                    if (curr_length >= 5):
-                        playable_cards.add(cards)
-                l -= 1
-                s += 1
-        
-        #pair_chain_3 -- #pair_chain_10
-        pair_chain_indexes = DoudizhuJudger.chain_indexes(more_than_1_indexes)
-        for (start_index, length) in pair_chain_indexes:
-            s, l = start_index, length
-            while(l >= 3):
-                cards = ''
-                curr_index = s - 1
-                curr_length = 0
-                while (curr_length < l and curr_length < 10):
-                    curr_index += 1
-                    curr_length += 1
-                    cards += CARD_RANK_STR[curr_index] * 2
-                    if (curr_length >= 3):
-                        playable_cards.add(cards)
-                l -= 1
-                s += 1
-        
-        #trio, trio_solo and trio_pair
-        for i in more_than_2_indexes:
-            playable_cards.add(CARD_RANK_STR[i[0]] * 3)
-            for j in non_zero_indexes:
-                if (j < i):
-                    playable_cards.add(CARD_RANK_STR[j[0]] + CARD_RANK_STR[i[0]] * 3)
-                elif (j > i):
-                    playable_cards.add(CARD_RANK_STR[i[0]] * 3 + CARD_RANK_STR[j[0]])
-            for j in more_than_1_indexes:
-                if (j < i):
-                    playable_cards.add(CARD_RANK_STR[j[0]] * 2 + CARD_RANK_STR[i[0]] * 3)
-                elif (j > i):
-                    playable_cards.add(CARD_RANK_STR[i[0]] * 3 + CARD_RANK_STR[j[0]] * 2)
-
-        #trio_solo, trio_pair, #trio -- trio_chain_2 -- trio_chain_6; trio_solo_chain_2 -- trio_solo_chain_5; trio_pair_chain_2 -- trio_pair_chain_4
-        trio_chain_indexes = DoudizhuJudger.chain_indexes(more_than_2_indexes)
-        for (start_index, length) in trio_chain_indexes:
-            s, l = start_index, length
-            while(l >= 2):
-                cards = ''
-                curr_index = s - 1
-                curr_length = 0
-                while (curr_length < l and curr_length < 6):
-                    curr_index += 1
-                    curr_length += 1
-                    cards += CARD_RANK_STR[curr_index] * 3
-
-                    #trio_chain_2 to trio_chain_6
-                    if (curr_length >= 2 and curr_length <= 6):
-                        playable_cards.add(cards)
-                    
-                    #trio_solo_chain_2 to trio_solo_chain_5
-                    if (curr_length >= 2 and curr_length <= 5):
-                        for left, right in DoudizhuJudger.solo_attachments(current_hand, s, curr_length, curr_length):
-                            pre_attached = ''
-                            for j in left:
-                                pre_attached += CARD_RANK_STR[j]
-                            post_attached = ''
-                            for j in right:
-                                post_attached += CARD_RANK_STR[j]
-                            playable_cards.add(pre_attached + cards + post_attached)
-                    
-                    #trio_pair_chain2 -- trio_pair_chain_4
-                    if (curr_length >= 2 and curr_length <= 4):
-                        for left, right in DoudizhuJudger.pair_attachments(cards_count, s, curr_length, curr_length):
-                            pre_attached = ''
-                            for j in left:
-                                pre_attached += CARD_RANK_STR[j] * 2
-                            post_attached = ''
-                            for j in right:
-                                post_attached += CARD_RANK_STR[j] * 2
-                            playable_cards.add(pre_attached + cards + post_attached)
-                l -= 1
-                s += 1
-        #rocket
-        if (cards_count[13] and cards_count[14]):
-            playable_cards.add(CARD_RANK_STR[13] + CARD_RANK_STR[14])
-        return playable_cards
+        hand_packed = pack_cards(current_hand)
+        return set(get_move_table().playable_cards(hand_packed))
 
     def __init__(self, players):
         ''' Initilize the Judger class for Dou Dizhu
         '''
         all_cards_list = CARD_TYPE[1]
         self.playable_cards = [set() for _ in range(3)]
+        # Rows of the playable cards in the move table
+        self._playable_rows = [None for _ in range(3)]
         self._recorded_removed_playable_cards = [[] for _ in range(3)]
+        move_table = get_move_table()
         for player in players:
             player_id = player.player_id
             current_hand = cards2str(player.current_hand)
-            self.playable_cards[player_id] = self.playable_cards_from_hand(current_hand)
+            rows = move_table.playable_rows(pack_cards(current_hand))
+            self._playable_rows[player_id] = rows
+            self.playable_cards[player_id] = set(move_table.cards[rows].tolist())
 
     def calc_playable_cards(self, player):
         ''' Recalculate all legal cards the player can play according to his
@@ -280,32 +161,17 @@ class DoudizhuJudger(object):
         Returns:
             list: list of string of playable cards
         '''
-        removed_playable_cards = []
-
         player_id = player.player_id
+        move_table = get_move_table()
         current_hand = cards2str(player.current_hand)
-        missed = None
-        for single in player.singles:
-            if single not in current_hand:
-                missed = single
-                break
-
-        playable_cards = self.playable_cards[player_id].copy()
-
-        if missed is not None:
-            position = player.singles.find(missed)
-            player.singles = player.singles[position+1:]
-            for cards in playable_cards:
-                if missed in cards or (not contains_cards(current_hand, cards)):
-                    removed_playable_cards.append(cards)
-                    self.playable_cards[player_id].remove(cards)
-        else:
-            for cards in playable_cards:
-                if not contains_cards(current_hand, cards):
-                    #del self.playable_cards[player_id][cards]
-                    removed_playable_cards.append(cards)
-                    self.playable_cards[player_id].remove(cards)
-        self._recorded_removed_playable_cards[player_id].append(removed_playable_cards)
+        # The hand only shrinks, so only the rows playable before need to be checked
+        rows = self._playable_rows[player_id]
+        playable = move_table.affordable(pack_cards(current_hand), rows)
+        removed_rows = rows[~playable]
+        removed_playable_cards = move_table.cards[removed_rows].tolist()
+        self.playable_cards[player_id].difference_update(removed_playable_cards)
+        self._playable_rows[player_id] = rows[playable]
+        self._recorded_removed_playable_cards[player_id].append((removed_playable_cards, rows))
         return self.playable_cards[player_id]
 
     def restore_playable_cards(self, player_id):
@@ -314,8 +180,9 @@ class DoudizhuJudger(object):
         Args:
             player_id: The id of the player whose playable_cards need to be restored
         '''
-        removed_playable_cards = self._recorded_removed_playable_cards[player_id].pop()
+        removed_playable_cards, rows = self._recorded_removed_playable_cards[player_id].pop()
         self.playable_cards[player_id].update(removed_playable_cards)
+        self._playable_rows[player_id] = rows
             
 
     def get_playable_cards(self, player):
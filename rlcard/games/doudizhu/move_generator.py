@@ -0,0 +1,169 @@
+''' Doudizhu move generator working on count vectors
+
+Hands and moves are encoded as counts over the 15 ranks of CARD_RANK_STR.
+Every move of the binary tables is loaded once into a table, where the
+counts of each move are also packed into a 64-bit integer with 4 bits per rank. The
+top bit of each 4-bit field is a guard bit, so checking whether a hand can
+afford a move is a single subtraction: the guard bit of a field is cleared
+only if the hand holds fewer cards of that rank than the move needs. This
+makes "the moves that I can afford" and "the moves that beat X that I can
+afford" one vectorized comparison over the table.
+'''
+
+from bisect import bisect_right
+import numpy as np
+
+from rlcard.games.doudizhu.utils import CARD_RANK_STR, CARD_RANK_STR_INDEX
+from rlcard.games.doudizhu.tables import load_tables
+
+# Bits used by each rank in the packed representation
+_FIELD_BITS = 4
+# The guard bit of every rank
+_GUARD = sum(1 << (_FIELD_BITS * i + _FIELD_BITS - 1) for i in range(len(CARD_RANK_STR)))
+
+
+def cards2counts(cards):
+    ''' Encode cards as counts over the ranks
+
+    Args:
+        cards (str or list): cards in solo representation. Eg: '33345'
+
+    Returns:
+        numpy.array: counts of length 15, one for each rank of CARD_RANK_STR
+    '''
+    counts = np.zeros(len(CARD_RANK_STR), dtype=np.int8)
+    for card in cards:
+        counts[CARD_RANK_STR_INDEX[card]] += 1
+    return counts
+
+
+def pack_cards(cards):
+    ''' Pack cards into one integer with 4 bits per rank
+
+    Args:
+        cards (str or list): cards in solo representation. Eg: '33345'
+
+    Returns:
+        int: the packed counts of the cards
+    '''
+    packed = 0
+    for card in cards:
+        packed += 1 << (_FIELD_BITS * CARD_RANK_STR_INDEX[card])
+    return packed
+
+
+def pack_counts(counts):
+    ''' Pack counts over the ranks into one integer with 4 bits per rank
+
+    Args:
+        counts (numpy.array): counts of shape (15,) or (n, 15)
+
+    Returns:
+        numpy.uint64 or numpy.array: the packed integer(s)
+    '''
+    counts = np.asarray(counts, dtype=np.uint64)
+    shifts = np.arange(len(CARD_RANK_STR), dtype=np.uint64) * np.uint64(_FIELD_BITS)
+    return np.bitwise_or.reduce(counts << shifts, axis=-1)
+
+
+class MoveTable(object):
+    ''' All the moves of Doudizhu with their types, weights and counts.
+
+    Rows of the same card type are stored contiguously, so that a card type
+    is a slice of the table. Within a card type the rows are sorted by weight.
+    '''
+
+    # Slices shorter than this are checked in Python, which is cheaper than a
+    # numpy call for a handful of rows
+    small_slice = 64
+
+    def __init__(self, tables):
+        ''' Load the moves
+
+        Args:
+            tables (DoudizhuTables): the compiled tables of Doudizhu
+        '''
+        self.cards = np.array(tables.move_list, dtype=object)
+        self.weights = np.asarray(tables.move_weights)
+        self.counts = tables.move_counts
+        self.packed = pack_counts(self.counts)
+        self.type_slices = {card_type: tables.type_range(card_type) for card_type in tables.card_types}
+        self.index = tables.move_index
+        self._cards_list = tables.move_list
+        self._weights_list = self.weights.tolist()
+        self._packed_list = self.packed.tolist()
+
+    def affordable(self, hand_packed, rows=None):
+        ''' Find the moves that can be played from a hand
+
+        Args:
+            hand_packed (int): the packed counts of the hand
+            rows (numpy.array or slice): the rows of the table to check, default to all rows
+
+        Returns:
+            numpy.array: boolean mask over the selected rows
+        '''
+        packed = self.packed if rows is None else self.packed[rows]
+        guard = np.uint64(_GUARD)
+        return ((np.uint64(hand_packed) | guard) - packed) & guard == guard
+
+    def playable_rows(self, hand_packed, rows=None):
+        ''' Get the rows of the moves that can be played from a hand
+
+        Args:
+            hand_packed (int): the packed counts of the hand
+            rows (numpy.array): candidate rows, default to all rows. Since a
+              hand only shrinks during a game, the playable rows of the previous
+              hand are enough
+
+        Returns:
+            numpy.array: the playable rows
+        '''
+        if rows is None:
+            return np.flatnonzero(self.affordable(hand_packed))
+        return rows[self.affordable(hand_packed, rows)]
+
+    def playable_cards(self, hand_packed):
+        ''' Get all the moves that can be played from a hand
+
+        Args:
+            hand_packed (int): the packed counts of the hand
+
+        Returns:
+            list: list of string of playable cards
+        '''
+        return self.cards[self.affordable(hand_packed)].tolist()
+
+    def greater_cards(self, hand_packed, card_type, weight):
+        ''' Get the moves of a type that are greater than a weight and can be
+        played from a hand
+
+        Args:
+            hand_packed (int): the packed counts of the hand
+            card_type (str): the card type. Eg: 'trio_solo'
+            weight (int): the weight to beat
+
+        Returns:
+            list: list of string of greater cards, sorted by weight
+        '''
+        start, stop = self.type_slices[card_type]
+        start = bisect_right(self._weights_list, weight, start, stop)
+        if stop - start < self.small_slice:
+            hand_packed |= _GUARD
+            return [self._cards_list[i] for i in range(start, stop)
+                    if (hand_packed - self._packed_list[i]) & _GUARD == _GUARD]
+        return self.cards[start:stop][self.affordable(hand_packed, slice(start, stop))].tolist()
+
+
+_move_table = None
+
+def get_move_table():
+    ''' Get the move table, which is compiled on first use
+
+    Returns:
+        MoveTable: the move table of Doudizhu
+    '''
+    global _move_table
+    if _move_table is None:
+        _move_table = MoveTable(load_tables())
+    return _move_table
@@ -3,7 +3,7 @@
 '''
 
 from rlcard.games.doudizhu.utils import get_gt_cards
-from rlcard.games.doudizhu.utils import cards2str, doudizhu_sort_card
+from rlcard.games.doudizhu.utils import cards2str, cards2counts, doudizhu_sort_card, CARD_ID_RANK
 import functools
 
 
@@ -24,14 +24,15 @@ class DoudizhuPlayer(object):
             2. played_cards: The cards played in one round
             3. hand: Initial cards
             4. _current_hand: The rest of the cards after playing some of them
+            5. hand_counts: The number of cards of each rank in _current_hand
         '''
 
         self.player_id = player_id
         self.initial_hand = None
         self._current_hand = []
+        self.hand_counts = cards2counts([])
         self.role = ''
         self.played_cards = None
-        self.singles = '3456789TJQKA2BR'
 
         #record cards removed from self._current_hand for each play()
         # and restore cards back to self._current_hand when play_back()
@@ -43,8 +44,9 @@ class DoudizhuPlayer(object):
 
     def set_current_hand(self, value):
         self._current_hand = value
+        self.hand_counts = cards2counts(value)
 
-    def get_state(self, public, others_hands, actions):
+    def get_state(self, public, others_hands, actions, others_hand_counts=None):
         state = {}
         state['deck'] = public['deck']
         state['seen_cards'] = public['seen_cards']
@@ -56,6 +58,10 @@ class DoudizhuPlayer(object):
         state['current_hand'] = cards2str(self._current_hand)
         state['others_hand'] = others_hands
         state['actions'] = actions
+        state['current_hand_counts'] = tuple(self.hand_counts.tolist())
+        state['played_cards_counts'] = tuple(public['played_cards_counts'].tolist())
+        if others_hand_counts is not None:
+            state['others_hand_counts'] = tuple(others_hand_counts.tolist())
 
         return state
 
@@ -106,6 +112,7 @@ class DoudizhuPlayer(object):
                         remain_card = remain_card.suit
                     if play_card == remain_card:
                         removed_cards.append(self.current_hand[_])
+                        self.hand_counts[CARD_ID_RANK[self.current_hand[_].id]] -= 1
                         self._current_hand.remove(self._current_hand[_])
                         break
             self._recorded_played_cards.append(removed_cards)
@@ -116,4 +123,6 @@ class DoudizhuPlayer(object):
         '''
         removed_cards = self._recorded_played_cards.pop()
         self._current_hand.extend(removed_cards)
+        for card in removed_cards:
+            self.hand_counts[CARD_ID_RANK[card.id]] += 1
         self._current_hand.sort(key=functools.cmp_to_key(doudizhu_sort_card))
@@ -38,7 +38,7 @@ class DoudizhuRound(object):
         self.current_player = landlord_id
         self.public = {'deck': self.deck_str, 'seen_cards': self.seen_cards,
                        'landlord': self.landlord_id, 'trace': self.trace,
-                       'played_cards': []}
+                       'played_cards': [], 'played_cards_counts': self.played_cards}
 
     def cards_ndarray_to_list(self, ndarray_cards):
         result = []
@@ -0,0 +1,424 @@
+''' Compact binary lookup tables of Doudizhu
+
+The JSON files in jsondata/ describe every move (card_type.json,
+type_card.json) and its abstract actions (specific_map.json). Parsing them
+takes time and tens of MB of Python objects in every process, so they
+are compiled into a single binary file of integer-encoded arrays:
+
+    magic (8 bytes) | header length (uint64) | JSON header | arrays
+
+Every array starts at a 64-byte aligned offset, so the file is memory-mapped
+and the arrays are read-only views of the page cache, which are shared by
+all the processes forked after loading. Moves are stored sorted by card type
+and weight:
+
+    moves            (n,) S20     the cards of each move. Eg: b'33344456'
+    move_types       (n,) uint8   index into the card types of the header
+    move_weights     (n,) int16   the weight of the move in its type
+    move_counts      (n, 15) int8 the count of each rank of CARD_RANK_STR
+    type_offsets     (t+1,) int32 the moves of type i are type_offsets[i:i+2]
+    specific_offsets (n+1,) int32 the abstract actions of move i are
+    specific_ids     (m,) int16   specific_ids[specific_offsets[i:i+2]]
+
+The header keeps a hash of the JSON files it was compiled from. The tables
+are loaded on first use by load_tables(). If the binary file is missing or
+its hash does not match the JSON files, they are compiled again and written
+next to the JSON files, or into the user cache directory when the package
+is read-only. If neither can be written, the compiled tables are kept in
+memory. After editing the JSON files, regenerate it with
+write_tables(*compile_tables()).
+'''
+
+import os
+import json
+import hashlib
+import tempfile
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence, Set
+import numpy as np
+
+import rlcard
+
+ROOT_PATH = rlcard.__path__[0]
+JSON_DIR = os.path.join(ROOT_PATH, 'games/doudizhu/jsondata')
+TABLES_PATH = os.path.join(JSON_DIR, 'tables.bin')
+CACHE_TABLES_PATH = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+                                 'rlcard', 'doudizhu_tables.bin')
+
+# The JSON files the tables are compiled from
+_SOURCES = ('type_card.json', 'specific_map.json', 'action_space.json')
+
+_MAGIC = b'RLCDDZ01'
+_ALIGN = 64
+_NUM_RANKS = 15
+# The same order as CARD_RANK_STR in utils
+_CARD_RANK_STR_INDEX = {card: i for i, card in enumerate('3456789TJQKA2BR')}
+
+
+class DoudizhuTables(object):
+    ''' Read-only view of the compiled Doudizhu tables
+    '''
+
+    def __init__(self, arrays, meta):
+        ''' Initialize
+
+        Args:
+            arrays (dict): name -> numpy array, see the module docstring
+            meta (dict): the card types, the abstract actions, the
+              abstract actions of the keys of specific_map.json that are not
+              moves and the hash of the JSON files
+        '''
+        self.moves = arrays['moves']
+        self.move_types = arrays['move_types']
+        self.move_weights = arrays['move_weights']
+        self.move_counts = arrays['move_counts']
+        self.type_offsets = arrays['type_offsets']
+        self.specific_offsets = arrays['specific_offsets']
+        self.specific_ids = arrays['specific_ids']
+        self.card_types = meta['card_types']
+        self.abstract_actions = meta['abstract_actions']
+        self.extra_specific = meta['extra_specific']
+        self.source_hash = meta.get('source_hash')
+        self._move_list = None
+        self._move_index = None
+
+    @property
+    def move_list(self):
+        ''' (list): the cards of each move as strings
+        '''
+        if self._move_list is None:
+            self._move_list = self.moves.astype(str).tolist()
+        return self._move_list
+
+    @property
+    def move_index(self):
+        ''' (dict): the cards of a move -> its index
+        '''
+        if self._move_index is None:
+            self._move_index = {cards: i for i, cards in enumerate(self.move_list)}
+        return self._move_index
+
+    def type_range(self, card_type):
+        ''' Get the moves of a card type
+
+        Args:
+            card_type (str): the card type. Eg: 'trio_solo'
+
+        Returns:
+            (tuple): the start and the end index of the moves of the type
+        '''
+        type_id = self.card_types.index(card_type)
+        return int(self.type_offsets[type_id]), int(self.type_offsets[type_id + 1])
+
+    def specific(self, index):
+        ''' Get the abstract actions of a move
+
+        Args:
+            index (int): the index of the move
+
+        Returns:
+            list: list of string of abstract actions
+        '''
+        start, end = self.specific_offsets[index], self.specific_offsets[index + 1]
+        return [self.abstract_actions[i] for i in self.specific_ids[start:end]]
+
+
+def source_hash(json_dir=JSON_DIR):
+    ''' Hash the JSON files the tables are compiled from
+
+    Args:
+        json_dir (str): the directory of the JSON files
+
+    Returns:
+        (str): the SHA-1 of the files
+    '''
+    sha1 = hashlib.sha1()
+    for name in _SOURCES:
+        with open(os.path.join(json_dir, name), 'rb') as file:
+            sha1.update(file.read())
+    return sha1.hexdigest()
+
+def compile_tables(json_dir=JSON_DIR):
+    ''' Compile the JSON files into arrays
+
+    Args:
+        json_dir (str): the directory of the JSON files
+
+    Returns:
+        (tuple): Tuple containing:
+
+            (dict): name -> numpy array
+            (dict): the meta data stored in the header
+    '''
+    def load(name):
+        with open(os.path.join(json_dir, name), 'r') as file:
+            return json.load(file, object_pairs_hook=OrderedDict)
+    type_card = load('type_card.json')
+    specific_map = load('specific_map.json')
+    abstract_actions = list(load('action_space.json').keys())
+    abstract_index = {action: i for i, action in enumerate(abstract_actions)}
+
+    card_types = list(type_card.keys())
+    moves, move_types, move_weights = [], [], []
+    type_offsets = [0]
+    for type_id, card_type in enumerate(card_types):
+        for weight, cards_list in sorted(type_card[card_type].items(), key=lambda item: int(item[0])):
+            moves.extend(cards_list)
+            move_types.extend([type_id] * len(cards_list))
+            move_weights.extend([int(weight)] * len(cards_list))
+        type_offsets.append(len(moves))
+    move_set = set(moves)
+    if len(move_set) != len(moves):
+        raise ValueError('Every move should have exactly one card type')
+
+    move_counts = np.zeros((len(moves), _NUM_RANKS), dtype='<i1')
+    for i, cards in enumerate(moves):
+        for card in cards:
+            move_counts[i, _CARD_RANK_STR_INDEX[card]] += 1
+
+    specific_offsets = [0]
+    specific_ids = []
+    for cards in moves:
+        specific_ids.extend(abstract_index[action] for action in specific_map[cards])
+        specific_offsets.append(len(specific_ids))
+    extra_specific = OrderedDict((cards, actions) for cards, actions in specific_map.items()
+                                 if cards not in move_set)
+
+    arrays = OrderedDict([
+        ('moves', np.array(moves, dtype='S20')),
+        ('move_types', np.array(move_types, dtype='<u1')),
+        ('move_weights', np.array(move_weights, dtype='<i2')),
+        ('move_counts', move_counts),
+        ('type_offsets', np.array(type_offsets, dtype='<i4')),
+        ('specific_offsets', np.array(specific_offsets, dtype='<i4')),
+        ('specific_ids', np.array(specific_ids, dtype='<i2')),
+    ])
+    meta = {'card_types': card_types, 'abstract_actions': abstract_actions,
+            'extra_specific': extra_specific, 'source_hash': source_hash(json_dir)}
+    return arrays, meta
+
+def _align(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+def write_tables(arrays, meta, path=TABLES_PATH):
+    ''' Write the compiled tables into a binary file
+
+    Args:
+        arrays (dict): name -> numpy array
+        meta (dict): the meta data stored in the header
+        path (str): the path of the binary file
+    '''
+    entries = []
+    offset = 0
+    for name, array in arrays.items():
+        entries.append({'name': name, 'dtype': array.dtype.str,
+                        'shape': list(array.shape), 'offset': offset})
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({'arrays': entries, 'meta': meta}).encode('utf8')
+    data_start = _align(len(_MAGIC) + 8 + len(header))
+
+    # Each writer has its own temporary file, and the complete file replaces
+    # the old one atomically, so concurrent writers and readers are safe
+    fd, tmp_path = tempfile.mkstemp(prefix='.tables-', suffix='.tmp', dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(_MAGIC)
+            file.write(np.array([len(header)], dtype='<u8').tobytes())
+            file.write(header)
+            for entry, array in zip(entries, arrays.values()):
+                file.seek(data_start + entry['offset'])
+                file.write(np.ascontiguousarray(array).tobytes())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def read_tables(path=TABLES_PATH):
+    ''' Memory-map a binary file of tables
+
+    Args:
+        path (str): the path of the binary file
+
+    Returns:
+        DoudizhuTables: read-only tables backed by the file
+    '''
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    if bytes(buffer[:len(_MAGIC)]) != _MAGIC:
+        raise ValueError('{} is not a Doudizhu tables file'.format(path))
+    header_start = len(_MAGIC) + 8
+    header_length = int(buffer[len(_MAGIC):header_start].view('<u8')[0])
+    header = json.loads(bytes(buffer[header_start:header_start + header_length]).decode('utf8'),
+                        object_pairs_hook=OrderedDict)
+    data_start = _align(header_start + header_length)
+
+    arrays = {}
+    for entry in header['arrays']:
+        dtype = np.dtype(entry['dtype'])
+        count = int(np.prod(entry['shape'])) if entry['shape'] else 1
+        start = data_start + entry['offset']
+        array = buffer[start:start + count * dtype.itemsize].view(dtype)
+        arrays[entry['name']] = array.reshape(entry['shape'])
+    return DoudizhuTables(arrays, header['meta'])
+
+
+def _read_current_tables(path, current_hash):
+    ''' Read a binary file of tables if it was compiled from the current JSON files
+
+    Returns:
+        DoudizhuTables: the tables, None if the file is missing, invalid or stale
+    '''
+    if not os.path.exists(path):
+        return None
+    try:
+        tables = read_tables(path)
+    except (OSError, ValueError, KeyError):
+        return None
+    if tables.source_hash != current_hash:
+        return None
+    return tables
+
+def _open_tables(paths):
+    ''' Read the first up-to-date binary file of tables. If there is none,
+    compile the tables and write them into the first writable path, or keep
+    them in memory
+
+    Args:
+        paths (tuple): the paths of the binary files, in order
+
+    Returns:
+        DoudizhuTables: the tables of Doudizhu
+    '''
+    current_hash = source_hash()
+    for path in paths:
+        tables = _read_current_tables(path, current_hash)
+        if tables is not None:
+            return tables
+
+    arrays, meta = compile_tables()
+    for path in paths:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_tables(arrays, meta, path)
+        except OSError:
+            continue
+        return read_tables(path)
+    for array in arrays.values():
+        array.setflags(write=False)
+    return DoudizhuTables(arrays, meta)
+
+_tables = None
+
+def load_tables():
+    ''' Get the tables, which are loaded on first use
+
+    Returns:
+        DoudizhuTables: the tables of Doudizhu
+
+    Note: Load the tables before forking workers so that they share the pages
+    '''
+    global _tables
+    if _tables is None:
+        _tables = _open_tables((TABLES_PATH, CACHE_TABLES_PATH))
+    return _tables
+
+
+class LazyTableMap(Mapping):
+    ''' Read-only mapping decoded from the tables on demand.
+
+    The tables are loaded on first access and only the requested values are
+    decoded. Decoded values are cached.
+    '''
+
+    def __init__(self, keys, decode):
+        ''' Initialize
+
+        Args:
+            keys (function): tables -> list of the keys
+            decode (function): (tables, key) -> value. Raise KeyError for unknown keys
+        '''
+        self._keys = keys
+        self._decode = decode
+        self._cache = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._decode(load_tables(), key)
+            self._cache[key] = value
+            return value
+
+    def __iter__(self):
+        return iter(self._keys(load_tables()))
+
+    def __len__(self):
+        return len(self._keys(load_tables()))
+
+
+class LazyMoveList(Sequence):
+    ''' Read-only list of all the moves, loaded on first access
+    '''
+
+    def __getitem__(self, index):
+        return load_tables().move_list[index]
+
+    def __contains__(self, cards):
+        return cards in load_tables().move_index
+
+    def __iter__(self):
+        return iter(load_tables().move_list)
+
+    def __len__(self):
+        return len(load_tables().move_list)
+
+
+class LazyMoveSet(Set):
+    ''' Read-only set of all the moves, loaded on first access
+    '''
+
+    def __contains__(self, cards):
+        return cards in load_tables().move_index
+
+    def __iter__(self):
+        return iter(load_tables().move_list)
+
+    def __len__(self):
+        return len(load_tables().move_list)
+
+
+def _specific_keys(tables):
+    return tables.move_list + list(tables.extra_specific)
+
+def _decode_specific(tables, cards):
+    if cards in tables.extra_specific:
+        return list(tables.extra_specific[cards])
+    return tables.specific(tables.move_index[cards])
+
+def _decode_card_type(tables, cards):
+    index = tables.move_index[cards]
+    return [[tables.card_types[tables.move_types[index]], str(tables.move_weights[index])]]
+
+def _decode_type_card(tables, card_type):
+    if card_type not in tables.card_types:
+        raise KeyError(card_type)
+    start, end = tables.type_range(card_type)
+    weight_cards = OrderedDict()
+    for index in range(start, end):
+        weight_cards.setdefault(str(tables.move_weights[index]), []).append(tables.move_list[index])
+    return weight_cards
+
+def specific_map_view():
+    ''' Get a lazy view of specific_map.json, cards -> list of abstract actions
+    '''
+    return LazyTableMap(_specific_keys, _decode_specific)
+
+def card_type_view():
+    ''' Get a lazy view of card_type.json, cards -> [[card type, weight]]
+    '''
+    return LazyTableMap(lambda tables: tables.move_list, _decode_card_type)
+
+def type_card_view():
+    ''' Get a lazy view of type_card.json, card type -> weight -> list of cards
+    '''
+    return LazyTableMap(lambda tables: tables.card_types, _decode_type_card)
@@ -9,13 +9,16 @@ import threading
 import collections
 
 import rlcard
+from rlcard.core import CARD_INDEXES
+from rlcard.games.doudizhu.tables import specific_map_view, card_type_view, type_card_view
+from rlcard.games.doudizhu.tables import LazyMoveList, LazyMoveSet
 
 # Read required docs
 ROOT_PATH = rlcard.__path__[0]
 
-# a map of action to abstract action
-with open(os.path.join(ROOT_PATH, 'games/doudizhu/jsondata/specific_map.json'), 'r') as file:
-    SPECIFIC_MAP = json.load(file, object_pairs_hook=OrderedDict)
+# a map of action to abstract action. The large maps are lazy views of the
+# binary tables, which are loaded on first use
+SPECIFIC_MAP = specific_map_view()
 
 # a map of abstract action to its index and a list of abstract action
 with open(os.path.join(ROOT_PATH, 'games/doudizhu/jsondata/action_space.json'), 'r') as file:
@@ -23,13 +26,10 @@ with open(os.path.join(ROOT_PATH, 'games/doudizhu/jsondata/action_space.json'),
     ACTION_LIST = list(ACTION_SPACE.keys())
 
 # a map of card to its type. Also return both dict and list to accelerate
-with open(os.path.join(ROOT_PATH, 'games/doudizhu/jsondata/card_type.json'), 'r') as file:
-    data = json.load(file, object_pairs_hook=OrderedDict)
-    CARD_TYPE = (data, list(data), set(data))
+CARD_TYPE = (card_type_view(), LazyMoveList(), LazyMoveSet())
 
 # a map of type to its cards
-with open(os.path.join(ROOT_PATH, 'games/doudizhu/jsondata/type_card.json'), 'r') as file:
-    TYPE_CARD = json.load(file, object_pairs_hook=OrderedDict)
+TYPE_CARD = type_card_view()
 
 # rank list of solo character of cards
 CARD_RANK_STR = ['3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K',
@@ -41,6 +41,11 @@ CARD_RANK_STR_INDEX = {'3': 0, '4': 1, '5': 2, '6': 3, '7': 4,
 CARD_RANK = ['3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K',
              'A', '2', 'BJ', 'RJ']
 
+# the rank index and the character of each card id, see Card in rlcard.core
+CARD_ID_RANK = [CARD_RANK.index(CARD_INDEXES[card_id][1:]) for card_id in range(52)] + \
+               [CARD_RANK.index('BJ'), CARD_RANK.index('RJ')]
+CARD_ID_STR = [CARD_INDEXES[card_id][1:] for card_id in range(52)] + ['B', 'R']
+
 
 def doudizhu_sort_str(card_1, card_2):
     ''' Compare the rank of two cards of str representation
@@ -68,15 +73,11 @@ def doudizhu_sort_card(card_1, card_2):
         card_1 (object): object of Card
         card_2 (object): object of card
     '''
-    key = []
-    for card in [card_1, card_2]:
-        if card.rank == '':
-            key.append(CARD_RANK.index(card.suit))
-        else:
-            key.append(CARD_RANK.index(card.rank))
-    if key[0] > key[1]:
+    key_1 = CARD_ID_RANK[card_1.id]
+    key_2 = CARD_ID_RANK[card_2.id]
+    if key_1 > key_2:
         return 1
-    if key[0] < key[1]:
+    if key_1 < key_2:
         return -1
     return 0
 
@@ -140,6 +141,63 @@ def get_optimal_action(probs, legal_actions):
     return optimal_actions[0]
 
 
+def cards2counts(cards):
+    ''' Get the number of cards of each rank
+
+    Args:
+        cards (list): list of Card objects
+
+    Returns:
+        (numpy.array): the counts of the 15 ranks, in the order of CARD_RANK_STR
+    '''
+    counts = np.zeros(len(CARD_RANK_STR), dtype=int)
+    for card in cards:
+        counts[CARD_ID_RANK[card.id]] += 1
+    return counts
+
+def counts2str(counts):
+    ''' Get the string representation of the cards of some counts
+
+    Args:
+        counts (numpy.array): the counts of the 15 ranks
+
+    Returns:
+        string: string representation of cards, sorted by rank
+    '''
+    return ''.join([CARD_RANK_STR[rank] * count for rank, count in enumerate(counts.tolist()) if count])
+
+def str2counts(cards):
+    ''' Get the number of cards of each rank of a string of cards. The
+        results are cached since the same actions are seen many times
+
+    Args:
+        cards (str): string of cards. Eg: '33344'
+
+    Returns:
+        (numpy.array): the counts of the 15 ranks, which must not be modified
+    '''
+    counts = _str_counts.get(cards)
+    if counts is None:
+        counts = np.zeros(len(CARD_RANK_STR), dtype=int)
+        for card in cards:
+            counts[CARD_RANK_STR_INDEX[card]] += 1
+        _str_counts[cards] = counts
+    return counts
+
+_str_counts = {}
+
+def encode_counts(plane, counts):
+    ''' Encode the counts of the ranks into a zeroed plane, in the same way
+        as encode_cards: plane[n][rank] is 1 if there are n cards of the rank
+
+    Args:
+        plane (numpy.array): zeroed 5*15 plane
+        counts (tuple or numpy.array): the counts of the 15 ranks
+    '''
+    plane[counts, _RANKS] = 1
+
+_RANKS = np.arange(len(CARD_RANK_STR))
+
 def cards2str(cards):
     ''' Get the corresponding string representation of cards
 
@@ -149,13 +207,7 @@ def cards2str(cards):
     Returns:
         string: string representation of cards
     '''
-    response = ''
-    for card in cards:
-        if card.rank == '':
-            response += card.suit[0]
-        else:
-            response += card.rank
-    return response
+    return ''.join([CARD_ID_STR[card.id] for card in cards])
 
 _local_objs = threading.local()
 _local_objs.cached_candidate_cards = None
@@ -240,9 +292,10 @@ def get_gt_cards(player, greater_player):
     Note:
         1. return value contains 'pass'
     '''
+    from rlcard.games.doudizhu.move_generator import get_move_table, pack_cards
+
     # add 'pass' to legal actions
     gt_cards = ['pass']
-    current_hand = cards2str(player.current_hand)
     target_cards = greater_player.played_cards
     target_types = CARD_TYPE[0][target_cards]
     type_dict = {}
@@ -254,15 +307,11 @@ def get_gt_cards(player, greater_player):
     type_dict['rocket'] = -1
     if 'bomb' not in type_dict:
         type_dict['bomb'] = -1
+    move_table = get_move_table()
+    hand_packed = pack_cards(cards2str(player.current_hand))
     for card_type, weight in type_dict.items():
-        candidate = TYPE_CARD[card_type]
-        for can_weight, cards_list in candidate.items():
-            if int(can_weight) > int(weight):
-                for cards in cards_list:
-                    # TODO: improve efficiency
-                    if cards not in gt_cards and contains_cards(current_hand, cards):
-                        # if self.contains_cards(current_hand, cards):
-                        gt_cards.append(cards)
+        # Each cards string has exactly one type, so there are no duplicates
+        gt_cards.extend(move_table.greater_cards(hand_packed, card_type, int(weight)))
     return gt_cards
 
 
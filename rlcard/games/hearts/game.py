@@ -3,7 +3,7 @@ from rlcard.games.hearts.dealer import HeartsMiniDealer
 from rlcard.games.hearts.player import HeartsPlayer as Player
 from rlcard.games.hearts.round import HeartsRound as Round
 from rlcard.games.hearts.utils import get_first_player
-import copy
+from rlcard.utils.undo_log import UndoLog
 
 class HeartsGame(object):
 
@@ -12,7 +12,7 @@ class HeartsGame(object):
         self.shooting_the_moon_enabled = shooting_the_moon_enabled
         self.num_players = 4
         self.payoffs = [0 for _ in range(self.num_players)]
-        self.history = []
+        self.history = UndoLog()
 
         self.dealer_class = HeartsDealer
         self.dealer = self.dealer_class()
@@ -44,8 +44,8 @@ class HeartsGame(object):
 
         self.round = Round(self.dealer, self.num_players, first_player)
 
-        # Save the hisory for stepping back to the last state.
-        self.history = []
+        # Record the changes of each step for stepping back to the last state.
+        self.history = UndoLog()
 
         self.card_played_in_game = []
 
@@ -67,21 +67,20 @@ class HeartsGame(object):
         '''
 
         if self.allow_step_back:
-            # First snapshot the current state
-            his_dealer = copy.deepcopy(self.dealer)
-            his_round = copy.deepcopy(self.round)
-            his_players = copy.deepcopy(self.players)
-            self.history.append((his_dealer, his_players, his_round))
+            # First record the state that the action changes
+            self.history.begin_step()
+            self.history.record(self.round, 'current_player', 'target_suit', 'played_cards',
+                                'is_over', 'hearts_broken')
+            for player in self.players:
+                self.history.record(player, 'hand', 'collected')
 
         self.round.proceed_round(self.players, action)
 
         if self.is_over():
             if self.allow_step_back:
-                # First snapshot the current state
-                his_dealer = copy.deepcopy(self.dealer)
-                his_round = copy.deepcopy(self.round)
-                his_players = copy.deepcopy(self.players)
-                self.history.append((his_dealer, his_players, his_round))
+                # The final state is also kept, so the first step back
+                # after the game is over stays at the final state
+                self.history.begin_step()
 
         player_id = self.round.current_player
         state = self.get_state(player_id)
@@ -93,10 +92,7 @@ class HeartsGame(object):
         Returns:
             (bool): True if the game steps back successfully
         '''
-        if not self.history:
-            return False
-        self.dealer, self.players, self.round = self.history.pop()
-        return True
+        return self.history.undo_step()
 
     def get_state(self, player_id):
         ''' Return player's state
@@ -1,5 +1,4 @@
 import numpy as np
-from copy import copy
 
 from rlcard.games.leducholdem.dealer import LeducholdemDealer as Dealer
 from rlcard.games.leducholdem.player import LeducholdemPlayer as Player
@@ -7,6 +6,7 @@ from rlcard.games.leducholdem.judger import LeducholdemJudger as Judger
 from rlcard.games.leducholdem.round import LeducholdemRound as Round
 
 from rlcard.games.limitholdem.game import LimitholdemGame
+from rlcard.utils.undo_log import UndoLog
 
 class LeducholdemGame(LimitholdemGame):
 
@@ -61,8 +61,8 @@ class LeducholdemGame(LimitholdemGame):
         # Count the round. There are 2 rounds in each game.
         self.round_counter = 0
 
-        # Save the hisory for stepping back to the last state.
-        self.history = []
+        # Record the changes of each step for stepping back to the last state.
+        self.history = UndoLog()
 
         state = self.get_state(self.game_pointer)
 
@@ -81,22 +81,25 @@ class LeducholdemGame(LimitholdemGame):
                 (int): next plater's id
         '''
         if self.allow_step_back:
-            # First snapshot the current state
-            r = copy(self.round)
-            r_raised = copy(self.round.raised)
-            gp = self.game_pointer
-            r_c = self.round_counter
-            d_deck = copy(self.dealer.deck)
-            p = copy(self.public_card)
-            ps = [copy(self.players[i]) for i in range(self.num_players)]
-            ps_hand = [copy(self.players[i].hand) for i in range(self.num_players)]
-            self.history.append((r, r_raised, gp, r_c, d_deck, p, ps, ps_hand))
+            # First record the state that the action changes
+            self.history.begin_step()
+            self.history.record(self, 'game_pointer')
+            self.history.record(self.round, 'game_pointer', 'have_raised', 'not_raise_num',
+                                'raised', 'player_folded')
+            for player in self.players:
+                self.history.record(player, 'status', 'in_chips')
 
         # Then we proceed to the next round
         self.game_pointer = self.round.proceed_round(self.players, action)
 
         # If a round is over, we deal more public cards
         if self.round.is_over():
+            # The dealer and the public card only change when a round is over
+            if self.allow_step_back:
+                self.history.record(self, 'round_counter', 'public_card')
+                self.history.record(self.round, 'raise_amount')
+                self.history.record(self.dealer, 'deck')
+
             # For the first round, we deal 1 card as public card. Double the raise amount for the second round
             if self.round_counter == 0:
                 self.public_card = self.dealer.deal_card()
@@ -150,22 +153,6 @@ class LeducholdemGame(LimitholdemGame):
         payoffs = np.array(chips_payoffs)
         return payoffs
 
-    def step_back(self):
-        ''' Return to the previous state of the game
-
-        Returns:
-            (bool): True if the game steps back successfully
-        '''
-        if len(self.history) > 0:
-            self.round, r_raised, self.game_pointer, self.round_counter, d_deck, self.public_card, self.players, ps_hand = self.history.pop()
-            self.round.raised = r_raised
-            self.dealer.deck = d_deck
-            for i, hand in enumerate(ps_hand):
-                self.players[i].hand = hand
-            return True
-        return False
-
-
 # Test the game
 
 #if __name__ == "__main__":
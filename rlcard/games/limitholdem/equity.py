@@ -0,0 +1,166 @@
+''' Hand strength and equity of Texas Hold'em hands
+
+    hand strength: the probability of beating one random hand with the
+      current public cards, found by enumerating all the hands of the opponent
+    equity: the probability of winning at the showdown against random hands,
+      with ties split. When all the public cards are dealt, it is found by
+      enumeration against one opponent. Otherwise the missing public cards and
+      the hands of the opponents are sampled, all the samples being evaluated
+      as one batch
+
+The values only depend on the hand and the public cards up to a permutation
+of the suits, so they are cached by the suit-isomorphic key of the cards, see
+rlcard.utils.isomorphism.
+'''
+
+from collections import OrderedDict
+import numpy as np
+
+from rlcard.games.limitholdem.evaluator import CARD2INDEX, evaluate_batch
+from rlcard.utils.isomorphism import SuitIsomorphism
+
+_DECK_SIZE = 52
+_PUBLIC_CARD_NUM = 5
+
+# The card index of each card id
+_CARD_INDEXES = sorted(CARD2INDEX, key=CARD2INDEX.get)
+
+
+def to_ids(cards):
+    ''' Convert cards to a list of ids
+
+    Args:
+        cards (list): card ids, card indexes (Eg: 'SA') or Card objects
+
+    Returns:
+        (list): the card ids
+    '''
+    ids = []
+    for card in cards:
+        if isinstance(card, str):
+            card = CARD2INDEX[card]
+        elif not isinstance(card, (int, np.integer)):
+            card = card.id
+        ids.append(int(card))
+    return ids
+
+def _showdown_share(strengths, opponent_strengths):
+    ''' The share of the pot won in each sample
+
+    Args:
+        strengths (numpy.array): the strength of the player in each sample
+        opponent_strengths (numpy.array): the strengths of the opponents of shape (n, opponent_num)
+    '''
+    best = opponent_strengths.max(axis=1)
+    ties = (opponent_strengths == strengths[:, np.newaxis]).sum(axis=1)
+    return np.where(strengths > best, 1.0, np.where(strengths == best, 1.0 / (ties + 1), 0.0))
+
+
+class EquityCalculator(object):
+    ''' Compute the hand strength and the equity of hands, with a cache
+    '''
+
+    def __init__(self, sample_num=1000, cache_size=100000, isomorphism=None):
+        ''' Initialize
+
+        Args:
+            sample_num (int): the number of samples of the equity before the river
+            cache_size (int): the maximum number of cached values. The least
+              recently used values are dropped first
+            isomorphism (SuitIsomorphism): the canonicalization of the cards,
+              a new one if None. The environments share theirs
+        '''
+        self.sample_num = sample_num
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.isomorphism = isomorphism if isomorphism is not None else SuitIsomorphism('SHDC', cache_size)
+
+    def _key(self, hand, public_cards):
+        ''' Get the suit-isomorphic key of the card ids of a hand and the public cards
+        '''
+        return self.isomorphism.key([[_CARD_INDEXES[card] for card in hand],
+                                     [_CARD_INDEXES[card] for card in public_cards]])
+
+    def _cached(self, key, compute):
+        ''' Get a value from the cache, or compute and cache it
+        '''
+        value = self.cache.get(key)
+        if value is not None:
+            self.cache.move_to_end(key)
+            return value
+        value = compute()
+        self.cache[key] = value
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return value
+
+    def hand_strength(self, hand, public_cards):
+        ''' Compute the probability of beating one random hand with the current public cards
+
+        Args:
+            hand (list): the two cards of the player
+            public_cards (list): the public cards dealt so far
+
+        Returns:
+            (float): the hand strength, with ties counted as half
+        '''
+        hand, public_cards = to_ids(hand), to_ids(public_cards)
+        key = ('strength', self._key(hand, public_cards))
+        return self._cached(key, lambda: self._enumerate(hand, public_cards))
+
+    def equity(self, hand, public_cards, opponent_num=1):
+        ''' Compute the probability of winning at the showdown against random hands
+
+        Args:
+            hand (list): the two cards of the player
+            public_cards (list): the public cards dealt so far
+            opponent_num (int): the number of opponents
+
+        Returns:
+            (float): the equity, with ties split
+        '''
+        hand, public_cards = to_ids(hand), to_ids(public_cards)
+        key = ('equity', opponent_num, self._key(hand, public_cards))
+        if len(public_cards) == _PUBLIC_CARD_NUM and opponent_num == 1:
+            return self._cached(key, lambda: self._enumerate(hand, public_cards))
+        return self._cached(key, lambda: self._sample(hand, public_cards, opponent_num))
+
+    def features(self, hand, public_cards, opponent_num=1):
+        ''' Get the hand strength and the equity as features
+
+        Returns:
+            (numpy.array): the hand strength and the equity
+        '''
+        return np.array([self.hand_strength(hand, public_cards), self.equity(hand, public_cards, opponent_num)])
+
+    def _enumerate(self, hand, public_cards):
+        ''' Enumerate all the hands of one opponent with the current public cards
+        '''
+        known = hand + public_cards
+        rest = np.setdiff1d(np.arange(_DECK_SIZE), known)
+        first, second = np.triu_indices(len(rest), k=1)
+        opponent_hands = np.empty((len(first), len(known)), dtype=np.int64)
+        opponent_hands[:, 0] = rest[first]
+        opponent_hands[:, 1] = rest[second]
+        opponent_hands[:, 2:] = public_cards
+        strength = evaluate_batch([known])[0]
+        opponent_strengths = evaluate_batch(opponent_hands)
+        shares = _showdown_share(np.full(len(first), strength), opponent_strengths[:, np.newaxis])
+        return float(shares.mean())
+
+    def _sample(self, hand, public_cards, opponent_num):
+        ''' Sample the missing public cards and the hands of the opponents
+        '''
+        known = hand + public_cards
+        rest = np.setdiff1d(np.arange(_DECK_SIZE), known)
+        missing = _PUBLIC_CARD_NUM - len(public_cards)
+        # A random permutation of the rest of the deck in each sample
+        deals = rest[np.argsort(np.random.random((self.sample_num, len(rest))), axis=1)]
+        boards = np.concatenate([np.tile(public_cards, (self.sample_num, 1)).astype(np.int64),
+                                 deals[:, :missing]], axis=1)
+        strengths = evaluate_batch(np.concatenate([np.tile(hand, (self.sample_num, 1)), boards], axis=1))
+        opponent_hands = deals[:, missing:missing + 2 * opponent_num].reshape(self.sample_num, opponent_num, 2)
+        opponent_hands = np.concatenate([opponent_hands,
+                                         np.repeat(boards[:, np.newaxis], opponent_num, axis=1)], axis=2)
+        opponent_strengths = evaluate_batch(opponent_hands.reshape(-1, 7)).reshape(self.sample_num, opponent_num)
+        return float(_showdown_share(strengths, opponent_strengths).mean())
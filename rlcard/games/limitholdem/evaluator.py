@@ -0,0 +1,314 @@
+''' Lookup-table hand evaluator of Texas Hold'em
+
+A hand of 5 to 7 cards is mapped to one integer, its strength, so that a
+stronger hand has a larger strength and equal hands have equal strengths:
+
+    strength = category << 20 | r1 << 16 | r2 << 12 | r3 << 8 | r4 << 4 | r5
+
+The category is the same as Hand.category in utils (1 for high card up to 9
+for straight flush), and r1...r5 are the ranks (0 for 2 up to 12 for A) that
+break the ties within the category, in order of importance.
+
+Cards are integer ids, the index of the card in card2index.json (suit * 13 +
+rank, with the ranks ordered A, 2, ..., K), which is also Card.id. The
+strength is found with two tables built on first use:
+
+    flush_table (8192,)   the strength of the best flush or straight flush
+                          of each 13-bit mask of the ranks of one suit
+    rank_table  (n,)      the strength of each multiset of ranks, indexed
+                          by a perfect hash of the count of each rank
+
+The perfect hash ranks the count vectors (each count in 0..4) with the same
+number of cards in lexicographic order, so it is a sum of table lookups and
+the evaluation of a batch of hands is vectorized with NumPy.
+'''
+
+import os
+import json
+import numpy as np
+
+import rlcard
+
+ROOT_PATH = rlcard.__path__[0]
+
+_NUM_RANKS = 13
+_NUM_SUITS = 4
+_MAX_CARDS = 7
+
+with open(os.path.join(ROOT_PATH, 'games/limitholdem/card2index.json'), 'r') as file:
+    CARD2INDEX = json.load(file)
+
+# The rank of each card id, from 0 for 2 to 12 for A, and its suit
+CARD_RANKS = np.array([(card_id % _NUM_RANKS - 1) % _NUM_RANKS for card_id in range(52)], dtype=np.int64)
+CARD_SUITS = np.array([card_id // _NUM_RANKS for card_id in range(52)], dtype=np.int64)
+
+HIGH_CARD, ONE_PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH, FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH = range(1, 10)
+
+
+def card_id(card):
+    ''' Get the id of a card
+
+    Args:
+        card (Card or str): A card or its index. Eg: 'SA'
+
+    Returns:
+        (int): The id of the card
+    '''
+    if not isinstance(card, str):
+        return card.id
+    return CARD2INDEX[card]
+
+def card_ids(cards):
+    ''' Get the ids of a list of cards
+
+    Args:
+        cards (list): A list of Card objects or card indexes
+
+    Returns:
+        (list): The ids of the cards
+    '''
+    return [card_id(card) for card in cards]
+
+def _encode(category, ranks):
+    ''' Pack a category and at most 5 tie-breaking ranks into a strength
+    '''
+    strength = category
+    for i in range(5):
+        strength = strength << 4 | (ranks[i] if i < len(ranks) else 0)
+    return strength
+
+def _straight_high(rank_mask):
+    ''' Get the highest rank of the best straight in a mask of ranks, or -1
+    '''
+    for high in range(_NUM_RANKS - 1, 3, -1):
+        straight = 0b11111 << (high - 4)
+        if rank_mask & straight == straight:
+            return high
+    # A-2-3-4-5, whose highest rank is 5
+    wheel = 1 << 12 | 0b1111
+    if rank_mask & wheel == wheel:
+        return 3
+    return -1
+
+def _rank_strength(counts):
+    ''' Evaluate a multiset of ranks without flush
+
+    Args:
+        counts (list): the number of cards of each rank
+
+    Returns:
+        (int): the strength
+    '''
+    # Ranks ordered by count then rank, from the best
+    groups = sorted(((count, rank) for rank, count in enumerate(counts) if count > 0), reverse=True)
+    ranks = [rank for _, rank in groups]
+    rank_mask = sum(1 << rank for rank in ranks)
+    high_cards = sorted(ranks, reverse=True)
+
+    if groups and groups[0][0] == 4:
+        kickers = [rank for rank in high_cards if rank != ranks[0]]
+        return _encode(FOUR_OF_A_KIND, ranks[:1] + kickers[:1])
+    if len(groups) > 1 and groups[0][0] == 3 and groups[1][0] >= 2:
+        return _encode(FULL_HOUSE, ranks[:2])
+    straight_high = _straight_high(rank_mask)
+    if straight_high >= 0:
+        return _encode(STRAIGHT, [straight_high])
+    if groups and groups[0][0] == 3:
+        kickers = [rank for rank in high_cards if rank != ranks[0]]
+        return _encode(THREE_OF_A_KIND, ranks[:1] + kickers[:2])
+    if len(groups) > 1 and groups[1][0] == 2:
+        kickers = [rank for rank in high_cards if rank not in ranks[:2]]
+        return _encode(TWO_PAIR, ranks[:2] + kickers[:1])
+    if groups and groups[0][0] == 2:
+        kickers = [rank for rank in high_cards if rank != ranks[0]]
+        return _encode(ONE_PAIR, ranks[:1] + kickers[:3])
+    return _encode(HIGH_CARD, high_cards[:5])
+
+def _flush_strength(rank_mask):
+    ''' Evaluate the ranks of a flush, given as a 13-bit mask
+    '''
+    straight_high = _straight_high(rank_mask)
+    if straight_high >= 0:
+        return _encode(STRAIGHT_FLUSH, [straight_high])
+    ranks = [rank for rank in range(_NUM_RANKS - 1, -1, -1) if rank_mask >> rank & 1]
+    return _encode(FLUSH, ranks[:5])
+
+def _count_vectors(length, total):
+    ''' The number of count vectors of a length (each count in 0..4) summing to each total
+
+    Returns:
+        (numpy.array): array of shape (length + 1, total + 1)
+    '''
+    vector_nums = np.zeros((length + 1, total + 1), dtype=np.int64)
+    vector_nums[0, 0] = 1
+    for n in range(1, length + 1):
+        for k in range(total + 1):
+            vector_nums[n, k] = vector_nums[n - 1, max(0, k - 4):k + 1].sum()
+    return vector_nums
+
+def _hash_tables():
+    ''' Build the tables of the perfect hash of the count vectors
+
+    Returns:
+        (tuple): Tuple containing:
+
+            (numpy.array): offsets of shape (13, 8, 5). The hash of a count
+              vector is the sum of offsets[i, k, counts[i]], where k is the
+              number of cards of the ranks from i on
+            (numpy.array): the first hash of the vectors of each number of cards
+    '''
+    vector_nums = _count_vectors(_NUM_RANKS, _MAX_CARDS)
+    offsets = np.zeros((_NUM_RANKS, _MAX_CARDS + 1, 5), dtype=np.int64)
+    for i in range(_NUM_RANKS):
+        rest = _NUM_RANKS - i - 1
+        for k in range(_MAX_CARDS + 1):
+            for count in range(1, 5):
+                previous = k - count + 1
+                offsets[i, k, count] = offsets[i, k, count - 1] + (vector_nums[rest, previous] if previous >= 0 else 0)
+    bases = np.zeros(_MAX_CARDS + 2, dtype=np.int64)
+    bases[1:] = np.cumsum(vector_nums[_NUM_RANKS])
+    return offsets, bases
+
+def _all_count_vectors():
+    ''' Enumerate the count vectors with at most 7 cards
+    '''
+    vectors = []
+    counts = [0] * _NUM_RANKS
+    def fill(i, remaining):
+        if i == _NUM_RANKS:
+            vectors.append(list(counts))
+            return
+        for count in range(min(4, remaining) + 1):
+            counts[i] = count
+            fill(i + 1, remaining - count)
+        counts[i] = 0
+    fill(0, _MAX_CARDS)
+    return np.array(vectors, dtype=np.int64)
+
+class HandTables(object):
+    ''' The lookup tables of the evaluator, see the module docstring
+    '''
+
+    def __init__(self):
+        self.offsets, self.bases = _hash_tables()
+        vectors = _all_count_vectors()
+        self.rank_table = np.zeros(self.bases[-1], dtype=np.int64)
+        self.rank_table[self.hash(vectors)] = [_rank_strength(counts) for counts in vectors.tolist()]
+        self.flush_table = np.zeros(1 << _NUM_RANKS, dtype=np.int64)
+        for rank_mask in range(1 << _NUM_RANKS):
+            if bin(rank_mask).count('1') >= 5:
+                self.flush_table[rank_mask] = _flush_strength(rank_mask)
+        # Python copies for evaluating one hand without NumPy overhead
+        self.offset_list = self.offsets.tolist()
+        self.base_list = self.bases.tolist()
+        self.card_ranks = CARD_RANKS.tolist()
+        self.card_suits = CARD_SUITS.tolist()
+
+    def hash(self, counts):
+        ''' Compute the perfect hash of count vectors
+
+        Args:
+            counts (numpy.array): counts of shape (n, 13)
+
+        Returns:
+            (numpy.array): the hashes of shape (n,)
+        '''
+        totals = counts.sum(axis=1)
+        # The number of cards of the ranks from i on
+        remaining = totals[:, np.newaxis] - np.cumsum(counts, axis=1) + counts
+        return self.bases[totals] + self.offsets[np.arange(_NUM_RANKS), remaining, counts].sum(axis=1)
+
+_tables = None
+
+def load_tables():
+    ''' Build the tables on first use
+
+    Returns:
+        (HandTables): the tables
+    '''
+    global _tables
+    if _tables is None:
+        _tables = HandTables()
+    return _tables
+
+def evaluate_batch(hands):
+    ''' Evaluate a batch of hands
+
+    Args:
+        hands (numpy.array): card ids of shape (n, m) with m <= 7. The
+          cards of each hand must be different. Hands of less than 5 cards
+          are only ranked by their pairs, trips, quads and high cards
+
+    Returns:
+        (numpy.array): the strengths of shape (n,)
+    '''
+    tables = load_tables()
+    hands = np.asarray(hands, dtype=np.int64)
+    hand_num, card_num = hands.shape
+    ranks = CARD_RANKS[hands]
+    suits = CARD_SUITS[hands]
+    rows = np.repeat(np.arange(hand_num), card_num)
+
+    counts = np.bincount(rows * _NUM_RANKS + ranks.ravel(),
+                         minlength=hand_num * _NUM_RANKS).reshape(hand_num, _NUM_RANKS)
+    strengths = tables.rank_table[tables.hash(counts)]
+
+    # At most one suit has 5 cards or more
+    suit_keys = rows * _NUM_SUITS + suits.ravel()
+    suit_counts = np.bincount(suit_keys, minlength=hand_num * _NUM_SUITS).reshape(hand_num, _NUM_SUITS)
+    suit_masks = np.bincount(suit_keys, weights=(1 << ranks).ravel(),
+                             minlength=hand_num * _NUM_SUITS).reshape(hand_num, _NUM_SUITS).astype(np.int64)
+    flush_masks = np.where(suit_counts >= 5, suit_masks, 0).max(axis=1)
+    return np.maximum(strengths, tables.flush_table[flush_masks])
+
+def evaluate(cards):
+    ''' Evaluate one hand
+
+    Args:
+        cards (list): at most 7 card ids, Card objects or card indexes
+
+    Returns:
+        (int): the strength
+    '''
+    tables = load_tables()
+    if cards and not isinstance(cards[0], (int, np.integer)):
+        cards = card_ids(cards)
+    counts = [0] * _NUM_RANKS
+    suit_counts = [0] * _NUM_SUITS
+    suit_masks = [0] * _NUM_SUITS
+    for card in cards:
+        rank = tables.card_ranks[card]
+        suit = tables.card_suits[card]
+        counts[rank] += 1
+        suit_counts[suit] += 1
+        suit_masks[suit] |= 1 << rank
+
+    remaining = len(cards)
+    index = tables.base_list[remaining]
+    for rank, count in enumerate(counts):
+        if count:
+            index += tables.offset_list[rank][remaining][count]
+            remaining -= count
+    strength = int(tables.rank_table[index])
+
+    for suit, suit_count in enumerate(suit_counts):
+        if suit_count >= 5:
+            strength = max(strength, int(tables.flush_table[suit_masks[suit]]))
+    return strength
+
+def get_category(strength):
+    ''' Get the category of a strength, 1 for high card up to 9 for straight flush
+    '''
+    return strength >> 20
+
+def compare_strengths(strengths):
+    ''' Find the winners given the strength of each player
+
+    Args:
+        strengths (list): the strength of each player, None for the players who folded
+
+    Returns:
+        (list): 1 for the players with the best hand and 0 for the others
+    '''
+    best = max(strength for strength in strengths if strength is not None)
+    return [1 if strength == best else 0 for strength in strengths]
@@ -1,10 +1,10 @@
-from copy import deepcopy, copy
 import numpy as np
 
 from rlcard.games.limitholdem.dealer import LimitholdemDealer as Dealer
 from rlcard.games.limitholdem.player import LimitholdemPlayer as Player
 from rlcard.games.limitholdem.judger import LimitholdemJudger as Judger
 from rlcard.games.limitholdem.round import LimitholdemRound as Round
+from rlcard.utils.undo_log import UndoLog
 
 class LimitholdemGame(object):
 
@@ -76,14 +76,14 @@ class LimitholdemGame(object):
         # Count the round. There are 4 rounds in each game.
         self.round_counter = 0
 
-        # Save the hisory for stepping back to the last state.
-        self.history = []
-
-        state = self.get_state(self.game_pointer)
+        # Record the changes of each step for stepping back to the last state.
+        self.history = UndoLog()
 
         # Save betting history
         self.history_raise_nums = [0 for _ in range(4)]
 
+        state = self.get_state(self.game_pointer)
+
         return state, self.game_pointer
 
     def step(self, action):
@@ -99,15 +99,13 @@ class LimitholdemGame(object):
                 (int): next plater's id
         '''
         if self.allow_step_back:
-            # First snapshot the current state
-            r = deepcopy(self.round)
-            b = self.game_pointer
-            r_c = self.round_counter
-            d = deepcopy(self.dealer)
-            p = deepcopy(self.public_cards)
-            ps = deepcopy(self.players)
-            rn = copy(self.history_raise_nums)
-            self.history.append((r, b, r_c, d, p, ps, rn))
+            # First record the state that the action changes
+            self.history.begin_step()
+            self.history.record(self, 'game_pointer', 'history_raise_nums')
+            self.history.record(self.round, 'game_pointer', 'have_raised', 'not_raise_num',
+                                'raised', 'player_folded')
+            for player in self.players:
+                self.history.record(player, 'status', 'in_chips')
 
         # Then we proceed to the next round
         self.game_pointer = self.round.proceed_round(self.players, action)
@@ -117,6 +115,12 @@ class LimitholdemGame(object):
 
         # If a round is over, we deal more public cards
         if self.round.is_over():
+            # The dealer and the public cards only change when a round is over
+            if self.allow_step_back:
+                self.history.record(self, 'round_counter', 'public_cards')
+                self.history.record(self.round, 'raise_amount')
+                self.history.record(self.dealer, 'deck')
+
             # For the first round, we deal 3 cards
             if self.round_counter == 0:
                 self.public_cards.append(self.dealer.deal_card())
@@ -144,10 +148,7 @@ class LimitholdemGame(object):
         Returns:
             (bool): True if the game steps back successfully
         '''
-        if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, self.players, self.history_raises_nums = self.history.pop()
-            return True
-        return False
+        return self.history.undo_step()
 
     def get_player_num(self):
         ''' Return the number of players in Limit Texas Hold'em
@@ -1,4 +1,4 @@
-from rlcard.games.limitholdem.utils import compare_hands
+from rlcard.games.limitholdem.evaluator import evaluate, compare_strengths
 
 class LimitholdemJudger(object):
     ''' The Judger class for Texas Hold'em
@@ -20,15 +20,9 @@ class LimitholdemJudger(object):
         Returns:
             (list): Each entry of the list corresponds to one entry of the
         '''
-        # Convert the hands into card indexes
-        for i, hand in enumerate(hands):
-            if hands[i] is not None:
-                h = [card.get_index() for card in hand]
-                hands[i] = h
-
-        #winners = compare_hands(hands)
-        #winners = [1, 0, 0]
-        winners = compare_hands(hands)
+        # Evaluate the hands of the players who did not fold
+        strengths = [evaluate(hand) if hand is not None else None for hand in hands]
+        winners = compare_strengths(strengths)
 
         # Compute the total chips
         total = 0
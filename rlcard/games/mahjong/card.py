@@ -1,5 +1,10 @@
 
 class MahjongCard(object):
+    ''' A Mahjong card. The id of the card is its index in the 34 kinds of
+    cards, the same as in card_encoding_dict of the utils
+    '''
+
+    __slots__ = ('type', 'trait', 'id')
 
     info = {'type':  ['dots', 'bamboo', 'characters', 'dragons', 'winds'],
             'trait': ['1', '2', '3', '4', '5', '6', '7', '8', '9', 'green', 'red', 'white', 'east', 'west', 'north', 'south']
@@ -14,6 +19,7 @@ class MahjongCard(object):
         '''
         self.type = card_type
         self.trait = trait
+        self.id = CARD_IDS[card_type + '-' + trait]
 
     def get_str(self):
         ''' Get the string representation of card
@@ -23,6 +29,16 @@ class MahjongCard(object):
         '''
         return self.type+ '-'+ self.trait
 
+# String of a card (Eg: 'dots-5') -> id of the card
+CARD_IDS = {}
+for _type in ['bamboo', 'characters', 'dots']:
+    for _trait in MahjongCard.info['trait'][:9]:
+        CARD_IDS[_type + '-' + _trait] = len(CARD_IDS)
+for _trait in MahjongCard.info['trait'][9:12]:
+    CARD_IDS['dragons-' + _trait] = len(CARD_IDS)
+for _trait in MahjongCard.info['trait'][12:]:
+    CARD_IDS['winds-' + _trait] = len(CARD_IDS)
+
 
 # for test
 #if __name__ == '__main__':
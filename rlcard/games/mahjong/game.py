@@ -1,10 +1,10 @@
 import numpy as np
-from copy import deepcopy
 
 from rlcard.games.mahjong.dealer import MahjongDealer as Dealer
 from rlcard.games.mahjong.player import MahjongPlayer as Player
 from rlcard.games.mahjong.round import MahjongRound as Round
 from rlcard.games.mahjong.judger import MahjongJudger as Judger
+from rlcard.utils.undo_log import UndoLog
 
 class MahjongGame(object):
 
@@ -38,8 +38,8 @@ class MahjongGame(object):
         for player in self.players:
             self.dealer.deal_cards(player, 13)
 
-        # Save the hisory for stepping back to the last state.
-        self.history = []
+        # Record the changes of each step for stepping back to the last state.
+        self.history = UndoLog()
 
         self.dealer.deal_cards(self.players[self.round.current_player], 1)
         state = self.get_state(self.round.current_player)
@@ -58,12 +58,15 @@ class MahjongGame(object):
                 (dict): next player's state
                 (int): next plater's id
         '''
-        # First snapshot the current state
+        # First record the state that the action changes
         if self.allow_step_back:
-            hist_dealer = deepcopy(self.dealer)
-            hist_round = deepcopy(self.round)
-            hist_players = deepcopy(self.players)
-            self.history.append((hist_dealer, hist_players, hist_round))
+            self.history.begin_step()
+            self.history.record(self, 'cur_state')
+            self.history.record(self.round, 'current_player', 'last_player', 'player_before_act',
+                                'valid_act', 'last_cards')
+            self.history.record(self.dealer, 'deck', 'table')
+            for player in self.players:
+                self.history.record(player, 'hand', 'pile', 'counts')
         self.round.proceed_round(self.players, action)
         state = self.get_state(self.round.current_player)
         self.cur_state = state
@@ -75,10 +78,7 @@ class MahjongGame(object):
         Returns:
             (bool): True if the game steps back successfully
         '''
-        if not self.history:
-            return False
-        self.dealer, self.players, self.round = self.history.pop()
-        return True
+        return self.history.undo_step()
 
     def get_state(self, player_id):
         ''' Return player's state
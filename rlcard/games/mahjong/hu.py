@@ -0,0 +1,140 @@
+''' Win (hu) detection of Mahjong on count vectors
+
+A hand is given as a count vector of length 34, the number of cards of each
+kind in the order of card_encoding_dict (bamboo, characters and dots 1-9,
+then the dragons and the winds). A set is a pong (three of a kind, a gong
+being counted as one pong) or a chow (three consecutive numbers of one
+suit). A player wins when the sets in the pile and the sets in the hand that
+remain after taking out one pair are at least four.
+
+The sets of different suits are independent, so the hand is split into the
+patterns of the three suits (9 counts each) and the seven honors. Each suit
+pattern is mapped to the maximum number of sets without a pair and with one
+pair taken out, with a table keyed by the base-5 code of the pattern. The
+table is filled on first use of each pattern, since only a small part of the
+5^9 patterns ever appears in a hand.
+'''
+
+_SUIT_SIZE = 9
+_SUIT_NUM = 3
+_HONOR_START = _SUIT_SIZE * _SUIT_NUM
+_CARD_NUM = 34
+
+# base-5 code of a suit pattern -> (sets without pair, sets with one pair or -1)
+_suit_table = {}
+
+
+def cards2counts(cards):
+    ''' Get the count vector of a list of cards
+
+    Args:
+        cards (list): List of MahjongCard objects
+
+    Returns:
+        (list): The number of cards of each of the 34 kinds
+    '''
+    counts = [0] * _CARD_NUM
+    for card in cards:
+        counts[card.id] += 1
+    return counts
+
+def _max_sets(pattern, start, cache):
+    ''' The maximum number of sets of a suit pattern, from the first card on
+    '''
+    while start < _SUIT_SIZE and pattern[start] == 0:
+        start += 1
+    if start == _SUIT_SIZE:
+        return 0
+    key = tuple(pattern)
+    if key in cache:
+        return cache[key]
+
+    # The first card is either left alone, or in a pong, or starts a chow
+    pattern[start] -= 1
+    best = _max_sets(pattern, start, cache)
+    pattern[start] += 1
+    if pattern[start] >= 3:
+        pattern[start] -= 3
+        best = max(best, 1 + _max_sets(pattern, start, cache))
+        pattern[start] += 3
+    if start + 2 < _SUIT_SIZE and pattern[start + 1] and pattern[start + 2]:
+        for i in range(start, start + 3):
+            pattern[i] -= 1
+        best = max(best, 1 + _max_sets(pattern, start, cache))
+        for i in range(start, start + 3):
+            pattern[i] += 1
+    cache[key] = best
+    return best
+
+def suit_sets(pattern):
+    ''' Get the maximum number of sets of the cards of one suit
+
+    Args:
+        pattern (list): The counts of the 9 cards of the suit
+
+    Returns:
+        (tuple): The maximum number of sets without a pair, and with one pair
+          of the suit taken out (-1 if the suit has no pair)
+    '''
+    code = 0
+    for count in pattern:
+        code = code * 5 + count
+    value = _suit_table.get(code)
+    if value is None:
+        pattern = list(pattern)
+        cache = {}
+        without_pair = _max_sets(pattern, 0, cache)
+        with_pair = -1
+        for i in range(_SUIT_SIZE):
+            if pattern[i] >= 2:
+                pattern[i] -= 2
+                with_pair = max(with_pair, _max_sets(pattern, 0, cache))
+                pattern[i] += 2
+        value = (without_pair, with_pair)
+        _suit_table[code] = value
+    return value
+
+def count_sets(counts):
+    ''' Get the maximum number of sets of a hand
+
+    Args:
+        counts (list): The count vector of the hand
+
+    Returns:
+        (tuple): The maximum number of sets without a pair, and with one pair
+          taken out (-1 if the hand has no pair)
+    '''
+    total = 0
+    # The largest gain of the sets with a pair over the sets without a pair
+    pair_gain = None
+    for start in range(0, _HONOR_START, _SUIT_SIZE):
+        without_pair, with_pair = suit_sets(counts[start:start + _SUIT_SIZE])
+        total += without_pair
+        if with_pair >= 0 and (pair_gain is None or with_pair - without_pair > pair_gain):
+            pair_gain = with_pair - without_pair
+    for count in counts[_HONOR_START:]:
+        without_pair = 1 if count >= 3 else 0
+        total += without_pair
+        if count >= 2 and (pair_gain is None or -without_pair > pair_gain):
+            pair_gain = -without_pair
+    if pair_gain is None:
+        return total, -1
+    return total, total + pair_gain
+
+def judge_hu(counts, pile_num):
+    ''' Judge whether a hand wins
+
+    Args:
+        counts (list): The count vector of the hand
+        pile_num (int): The number of sets in the pile
+
+    Returns:
+        (tuple): Tuple containing:
+
+            (bool): True if the player wins
+            (int): The number of sets of the pile and the hand with one pair
+              taken out, 0 if the hand has no pair
+    '''
+    _, with_pair = count_sets(counts)
+    set_count = pile_num + with_pair if with_pair >= 0 else 0
+    return with_pair >= 0 and set_count >= 4, set_count
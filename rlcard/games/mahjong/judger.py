@@ -4,6 +4,7 @@
 from collections import defaultdict
 from rlcard.games.mahjong.player import MahjongPlayer as Player
 from rlcard.games.mahjong.card import MahjongCard as Card
+from rlcard.games.mahjong import hu
 
 class MahjongJudger(object):
     ''' Determine what cards a player can play
@@ -24,20 +25,15 @@ class MahjongJudger(object):
 
         '''
         last_card = dealer.table[-1]
-        last_card_str = last_card.get_str()
-        #last_card_value = last_card_str.split("-")[-1]
-        #last_card_type = last_card_str.split("-")[0]
         for player in players:
-            hand = [card.get_str() for card in player.hand]
-            hand_dict = defaultdict(list)
-            for card in hand:
-                hand_dict[card.split("-")[0]].append(card.split("-")[1])
-            #pile = player.pile
+            if player.player_id == last_player:
+                continue
+            count = player.counts[last_card.id]
             # check gong
-            if hand.count(last_card_str) == 3 and last_player != player.player_id:
+            if count == 3:
                 return 'gong', player, [last_card]*4
             # check pong
-            if hand.count(last_card_str) == 2 and last_player != player.player_id:
+            if count == 2:
                 return 'pong', player, [last_card]*3
         return False, None, None
 
@@ -49,45 +45,24 @@ class MahjongJudger(object):
             last_player (int): The player id of last player
         '''
         last_card = dealer.table[-1]
-        last_card_str = last_card.get_str()
-        last_card_value = last_card_str.split("-")[-1]
-        last_card_type = last_card_str.split("-")[0]
-        for player in players:
-            hand = [card.get_str() for card in player.hand]
-            hand_dict = defaultdict(list)
-            for card in hand:
-                hand_dict[card.split("-")[0]].append(card.split("-")[1])
-            #pile = player.pile
-            # check chow
-            if last_card_type != "dragons" and last_card_type != "winds" and last_player == player.get_player_id() - 1:
-                #flag = False
-                type_values = hand_dict[last_card_type]
-                type_values.append(last_card_value)
-                test_value_list = sorted(type_values)
-                if len(test_value_list) < 3:
-                    continue
-                test_card_index = test_value_list.index(last_card_value)
-                test_cases = []
-                if test_card_index == 0:
-                    test_cases.append([test_value_list[test_card_index], test_value_list[test_card_index+1], test_value_list[test_card_index+2]])
-                elif test_card_index < len(test_value_list):
-                    test_cases.append([test_value_list[test_card_index-2], test_value_list[test_card_index-1], test_value_list[test_card_index]])
-                else:
-                    test_cases.append([test_value_list[test_card_index-1], test_value_list[test_card_index], test_value_list[test_card_index+1]])
-
-                for l in test_cases:
-                    if self.check_consecutive(l):
-                        suit = last_card_type
-                        cards_str= [suit+"-"+i for i in l]
-                        cards = []
-                        for card in player.hand:
-                            if card.get_str() in cards_str and card.get_str() != last_card_str:
-                                cards.append(card)
-                                cards_str.pop(cards_str.index(card.get_str()))
-                            if len(cards_str) == 1:
-                                cards.append(last_card)
-                                break
-                        return 'chow', player, cards
+        if last_card.type == 'dragons' or last_card.type == 'winds':
+            return False, None, None
+        # Only the next player can chow
+        player = players[(last_player + 1) % len(players)]
+        suit_start = last_card.id - last_card.id % 9
+        # The chows with the last card as the highest, the middle or the lowest card
+        for low in range(last_card.id - 2, last_card.id + 1):
+            if low < suit_start or low + 2 >= suit_start + 9:
+                continue
+            others = [card_id for card_id in range(low, low + 3) if card_id != last_card.id]
+            if player.counts[others[0]] and player.counts[others[1]]:
+                cards = []
+                for card_id in range(low, low + 3):
+                    if card_id == last_card.id:
+                        cards.append(last_card)
+                    else:
+                        cards.append(next(card for card in player.hand if card.id == card_id))
+                return 'chow', player, cards
         return False, None, None
 
     def judge_game(self, game):
@@ -119,33 +94,10 @@ class MahjongJudger(object):
             Result (bool): Win or not
             Maximum_score (int): Set count score of the player
         '''
-        set_count = 0
-        hand = [card.get_str() for card in player.hand]
-        count_dict = {card: hand.count(card) for card in hand}
         set_count = len(player.pile)
         if set_count >= 4:
             return True, set_count
-        used = []
-        maximum = 0
-        for each in count_dict:
-            if each in used:
-                continue
-            tmp_set_count = 0
-            tmp_hand = hand.copy()
-            if count_dict[each] == 2:
-                for _ in range(count_dict[each]):
-                    tmp_hand.pop(tmp_hand.index(each))
-                tmp_set_count, _set = self.cal_set(tmp_hand)
-                used.extend(_set)
-                if tmp_set_count + set_count > maximum:
-                    maximum = tmp_set_count + set_count
-                if tmp_set_count + set_count >= 4:
-                    #print(player.get_player_id(), sorted([card.get_str() for card in player.hand]))
-                    #print([[c.get_str() for c in s] for s in player.pile])
-                    #print(len(player.hand), sum([len(s) for s in player.pile]))
-                    #exit()
-                    return True, maximum
-        return False, maximum
+        return hu.judge_hu(player.counts, set_count)
 
     @staticmethod
     def check_consecutive(_list):
@@ -217,10 +169,13 @@ if __name__ == "__main__":
     #print(card_info)
     player.pile.append([Card(card_info['type'][0], card_info['trait'][0])]*3)
     #player.hand.extend([Card(card_info['type'][0], card_info['trait'][0])]*2)
-    player.hand.extend([Card(card_info['type'][1], card_info['trait'][1])]*4)
-    player.hand.extend([Card(card_info['type'][2], card_info['trait'][1])]*3)
-    player.hand.extend([Card(card_info['type'][0], card_info['trait'][2])]*3)
-    player.hand.extend([Card(card_info['type'][3], card_info['trait'][9])]*2)
+    for _ in range(4):
+        player.add_card(Card(card_info['type'][1], card_info['trait'][1]))
+    for _ in range(3):
+        player.add_card(Card(card_info['type'][2], card_info['trait'][1]))
+        player.add_card(Card(card_info['type'][0], card_info['trait'][2]))
+    for _ in range(2):
+        player.add_card(Card(card_info['type'][3], card_info['trait'][9]))
     #player.hand.extend([Card(card_info['type'][2], card_info['trait'][4])]*1)
     print([card.get_str() for card in player.hand])
     print(judger.judge_hu(player))
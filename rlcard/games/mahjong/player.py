@@ -10,6 +10,9 @@ class MahjongPlayer(object):
         self.player_id = player_id
         self.hand = []
         self.pile = []
+        # The number of cards of each kind in the hand, kept up to date as
+        # cards enter and leave the hand
+        self.counts = [0] * 34
 
     def get_player_id(self):
         ''' Return the id of the player
@@ -27,13 +30,33 @@ class MahjongPlayer(object):
         '''
         print([[c.get_str() for c in s]for s in self.pile])
 
+    def add_card(self, card):
+        ''' Put a card into the hand
+        Args:
+            card (object): The card
+        '''
+        self.hand.append(card)
+        self.counts[card.id] += 1
+
+    def remove_card(self, card):
+        ''' Take a card out of the hand
+        Args:
+            card (object): The card, which must be in the hand
+
+        Return:
+            (object): The card
+        '''
+        card = self.hand.pop(self.hand.index(card))
+        self.counts[card.id] -= 1
+        return card
+
     def play_card(self, dealer, card):
         ''' Play one card
         Args:
             dealer (object): Dealer
             Card (object): The card to be play.
         '''
-        card = self.hand.pop(self.hand.index(card))
+        card = self.remove_card(card)
         dealer.table.append(card)
 
     def chow(self, dealer, cards):
@@ -45,7 +68,7 @@ class MahjongPlayer(object):
         last_card = dealer.table.pop(-1)
         for card in cards:
             if card in self.hand and card != last_card:
-                self.hand.pop(self.hand.index(card))
+                self.remove_card(card)
         self.pile.append(cards)
 
     def gong(self, dealer, cards):
@@ -56,7 +79,7 @@ class MahjongPlayer(object):
         '''
         for card in cards:
             if card in self.hand:
-                self.hand.pop(self.hand.index(card))
+                self.remove_card(card)
         self.pile.append(cards)
 
     def pong(self, dealer, cards):
@@ -67,5 +90,5 @@ class MahjongPlayer(object):
         '''
         for card in cards:
             if card in self.hand:
-                self.hand.pop(self.hand.index(card))
+                self.remove_card(card)
         self.pile.append(cards)
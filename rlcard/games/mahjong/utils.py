@@ -58,11 +58,21 @@ def cards2list(cards):
     return cards_list
 
 
-def encode_cards(cards):
-    plane = np.zeros((34,4), dtype=int)
-    cards = cards2list(cards)
-    for card in list(set(cards)):
-        index = card_encoding_dict[card]
-        num = cards.count(card)
+def encode_cards(cards, plane=None):
+    ''' Encode cards into a 34*4 plane, where row i has as many ones as the cards of kind i
+
+    Args:
+        cards (list): List of MahjongCard objects
+        plane (numpy.array): The zeroed plane to encode the cards into. If None, a plane is allocated
+
+    Returns:
+        (numpy.array): The plane
+    '''
+    if plane is None:
+        plane = np.zeros((34,4), dtype=int)
+    counts = {}
+    for card in cards:
+        counts[card.id] = counts.get(card.id, 0) + 1
+    for index, num in counts.items():
         plane[index][:num] = 1
     return plane
@@ -1,11 +1,11 @@
 import numpy as np
-from copy import deepcopy
 from rlcard.games.limitholdem.game import LimitholdemGame
 
 from rlcard.games.nolimitholdem.dealer import NolimitholdemDealer as Dealer
 from rlcard.games.nolimitholdem.player import NolimitholdemPlayer as Player
 from rlcard.games.nolimitholdem.judger import NolimitholdemJudger as Judger
 from rlcard.games.nolimitholdem.round import NolimitholdemRound as Round
+from rlcard.utils.undo_log import UndoLog
 
 class NolimitholdemGame(LimitholdemGame):
 
@@ -67,8 +67,8 @@ class NolimitholdemGame(LimitholdemGame):
         # Count the round. There are 4 rounds in each game.
         self.round_counter = 0
 
-        # Save the hisory for stepping back to the last state.
-        self.history = []
+        # Record the changes of each step for stepping back to the last state.
+        self.history = UndoLog()
 
         state = self.get_state(self.game_pointer)
 
@@ -95,20 +95,24 @@ class NolimitholdemGame(LimitholdemGame):
                 (int): next plater's id
         '''
         if self.allow_step_back:
-            # First snapshot the current state
-            r = deepcopy(self.round)
-            b = self.game_pointer
-            r_c = self.round_counter
-            d = deepcopy(self.dealer)
-            p = deepcopy(self.public_cards)
-            ps = deepcopy(self.players)
-            self.history.append((r, b, r_c, d, p, ps))
+            # First record the state that the action changes
+            self.history.begin_step()
+            self.history.record(self, 'game_pointer')
+            self.history.record(self.round, 'game_pointer', 'current_raise_amount', 'not_raise_num',
+                                'raised', 'player_folded')
+            for player in self.players:
+                self.history.record(player, 'status', 'in_chips')
 
         # Then we proceed to the next round
         self.game_pointer = self.round.proceed_round(self.players, action)
 
         # If a round is over, we deal more public cards
         if self.round.is_over():
+            # The dealer and the public cards only change when a round is over
+            if self.allow_step_back:
+                self.history.record(self, 'round_counter', 'public_cards')
+                self.history.record(self.dealer, 'deck')
+
             # For the first round, we deal 3 cards
             if self.round_counter == 0:
                 self.public_cards.append(self.dealer.deal_card())
@@ -140,17 +144,6 @@ class NolimitholdemGame(LimitholdemGame):
 
         return state
 
-    def step_back(self):
-        ''' Return to the previous state of the game
-
-        Returns:
-            (bool): True if the game steps back successfully
-        '''
-        if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, self.players = self.history.pop()
-            return True
-        return False
-
     def get_action_num(self):
         ''' Return the number of applicable actions
 
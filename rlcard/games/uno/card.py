@@ -2,6 +2,8 @@ from termcolor import colored
 
 class UnoCard(object):
 
+    __slots__ = ('type', 'color', 'trait', 'str')
+
     info = {'type':  ['number', 'action', 'wild'],
             'color': ['r', 'g', 'b', 'y'],
             'trait': ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9',
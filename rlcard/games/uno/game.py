@@ -1,8 +1,7 @@
-from copy import deepcopy
-
 from rlcard.games.uno.dealer import UnoDealer as Dealer
 from rlcard.games.uno.player import UnoPlayer as Player
 from rlcard.games.uno.round import UnoRound as Round
+from rlcard.utils.undo_log import UndoLog
 
 
 class UnoGame(object):
@@ -41,8 +40,8 @@ class UnoGame(object):
         top_card = self.round.flip_top_card()
         self.round.perform_top_card(self.players, top_card)
 
-        # Save the hisory for stepping back to the last state.
-        self.history = []
+        # Record the changes of each step for stepping back to the last state.
+        self.history = UndoLog()
 
         player_id = self.round.current_player
         state = self.get_state(player_id)
@@ -62,11 +61,20 @@ class UnoGame(object):
         '''
 
         if self.allow_step_back:
-            # First snapshot the current state
-            his_dealer = deepcopy(self.dealer)
-            his_round = deepcopy(self.round)
-            his_players = deepcopy(self.players)
-            self.history.append((his_dealer, his_players, his_round))
+            # First record the state that the action changes
+            self.history.begin_step()
+            self.history.record(self.round, 'target', 'current_player', 'direction',
+                                'played_cards', 'is_over', 'winner')
+            self.history.record(self.dealer, 'deck')
+            for player in self.players:
+                self.history.record(player, 'hand')
+            if action == 'draw':
+                # A drawn wild card is given a color. The played cards are
+                # drawn after being shuffled back into an empty deck
+                drawable = self.dealer.deck[-1:] or self.round.played_cards
+                for card in drawable:
+                    if card.type == 'wild':
+                        self.history.record(card, 'color')
 
         self.round.proceed_round(self.players, action)
         player_id = self.round.current_player
@@ -79,10 +87,7 @@ class UnoGame(object):
         Returns:
             (bool): True if the game steps back successfully
         '''
-        if not self.history:
-            return False
-        self.dealer, self.players, self.round = self.history.pop()
-        return True
+        return self.history.undo_step()
 
     def get_state(self, player_id):
         ''' Return player's state
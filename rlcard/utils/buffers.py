@@ -0,0 +1,218 @@
+''' Array-backed storage of the sample buffers of the agents
+
+An element is a namedtuple (or a tuple) of scalars and arrays, or a single
+scalar or array. Each field is stored in one typed NumPy array whose first
+axis is the position in the buffer, so sampling returns an element of the
+same type whose fields are contiguous batches, ready to be fed to a network.
+The float fields are stored as float32.
+
+The arrays grow geometrically up to the capacity, so a buffer with a large
+capacity only takes the memory of the elements stored so far.
+
+SumTree holds the priorities of the elements of a prioritized replay memory.
+'''
+
+import random
+import numpy as np
+
+# The initial number of elements of the arrays
+_MIN_ALLOCATION = 64
+
+
+class ArrayBuffer(object):
+    ''' The storage shared by the buffers. The subclasses decide where an
+    element is added
+    '''
+
+    def __init__(self, capacity):
+        ''' Initialize the buffer
+
+        Args:
+            capacity (int): The maximum number of elements
+        '''
+        self._capacity = int(capacity)
+        self._size = 0
+        # The arrays of the fields, allocated on the first add
+        self._arrays = None
+        self._make = None
+
+    def _split(self, element):
+        ''' Get the values of the fields of an element, and allocate the
+        arrays if it is the first one
+        '''
+        if isinstance(element, tuple):
+            values = list(element)
+        else:
+            values = [element]
+        if self._arrays is None:
+            self._allocate(element, values)
+        return values
+
+    def _allocate(self, element, values):
+        ''' Allocate the arrays for elements of the type and shapes of an element
+        '''
+        if hasattr(element, '_fields'):
+            element_type = type(element)
+            self._make = lambda fields: element_type(*fields)
+        elif isinstance(element, tuple):
+            self._make = tuple
+        else:
+            self._make = lambda fields: fields[0]
+        size = min(self._capacity, _MIN_ALLOCATION)
+        self._arrays = []
+        for value in values:
+            value = np.asarray(value)
+            dtype = np.float32 if np.issubdtype(value.dtype, np.floating) else value.dtype
+            self._arrays.append(np.zeros((size,) + value.shape, dtype=dtype))
+
+    def _split_batch(self, elements):
+        ''' Get the batched values of the fields of a batch of elements
+        '''
+        if self._arrays is None:
+            if isinstance(elements, tuple):
+                first = type(elements)(*[value[0] for value in elements]) if hasattr(elements, '_fields') \
+                    else tuple(value[0] for value in elements)
+            else:
+                first = elements[0]
+            self._split(first)
+        if isinstance(elements, tuple):
+            return [np.asarray(value) for value in elements]
+        return [np.asarray(elements)]
+
+    def _reserve(self, size):
+        ''' Grow the arrays to hold at least size elements
+        '''
+        allocated = len(self._arrays[0])
+        if size <= allocated:
+            return
+        allocated = min(self._capacity, max(size, 2 * allocated))
+        for i, array in enumerate(self._arrays):
+            grown = np.zeros((allocated,) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            self._arrays[i] = grown
+
+    def _store(self, index, values):
+        ''' Write the values of the fields at an index or an array of indexes
+        '''
+        for array, value in zip(self._arrays, values):
+            array[index] = value
+
+    def _get(self, index):
+        ''' Get the elements at an index or an array of indexes
+        '''
+        return self._make([array[index] for array in self._arrays])
+
+    def sample(self, num_samples):
+        ''' Returns `num_samples` uniformly sampled from the buffer.
+
+        Args:
+            num_samples (int): The number of samples to draw.
+
+        Returns:
+            An element whose fields are the batches of the fields of
+            `num_samples` different random elements of the buffer.
+
+        Raises:
+            ValueError: If there are less than `num_samples` elements in the buffer
+        '''
+        if self._size < num_samples:
+            raise ValueError("{} elements could not be sampled from size {}".format(
+                    num_samples, self._size))
+        return self._get(np.array(random.sample(range(self._size), num_samples), dtype=np.int64))
+
+    def all(self):
+        ''' Get all the elements of the buffer
+
+        Returns:
+            An element whose fields are the batches of the fields of all the
+            elements, as views of the buffer. None if the buffer is empty
+        '''
+        if self._size == 0:
+            return None
+        return self._get(slice(0, self._size))
+
+    def clear(self):
+        ''' Clear the buffer. The arrays are kept for the next elements
+        '''
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for i in range(self._size):
+            element = [array[i] if array.ndim > 1 else array[i].item() for array in self._arrays]
+            yield self._make(element)
+
+
+class SumTree(object):
+    ''' A binary tree over an array of priorities, where each node holds the
+    sum of its children
+
+    The tree is stored in one array: the root is at index 1, the children of
+    node i are at 2i and 2i + 1, and the priority of element j is at
+    leaf_start + j. Setting priorities and finding the elements of prefix
+    sums take O(log n) per element, and are vectorized over batches.
+    '''
+
+    def __init__(self, capacity):
+        ''' Initialize
+
+        Args:
+            capacity (int): The number of elements
+        '''
+        self.capacity = capacity
+        self.depth = max(int(np.ceil(np.log2(capacity))), 0)
+        self.leaf_start = 1 << self.depth
+        self.tree = np.zeros(2 * self.leaf_start, dtype=np.float64)
+
+    @property
+    def total(self):
+        ''' The sum of all the priorities
+        '''
+        return self.tree[1]
+
+    def get(self, indices):
+        ''' Get the priorities of elements
+
+        Args:
+            indices (numpy.array): The indexes of the elements
+
+        Returns:
+            (numpy.array): The priorities
+        '''
+        return self.tree[self.leaf_start + np.asarray(indices)]
+
+    def update(self, indices, priorities):
+        ''' Set the priorities of elements
+
+        Args:
+            indices (numpy.array): The indexes of the elements
+            priorities (numpy.array): The new priorities. If an index is
+              repeated, its last priority is kept
+        '''
+        nodes = self.leaf_start + np.asarray(indices, dtype=np.int64).ravel()
+        self.tree[nodes] = np.asarray(priorities, dtype=np.float64).ravel()
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        ''' Find the elements where prefix sums of the priorities are reached
+
+        Args:
+            values (numpy.array): Values in [0, total)
+
+        Returns:
+            (numpy.array): For each value, the index of the first element
+              whose priority makes the prefix sum exceed the value
+        '''
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sums = self.tree[left]
+            go_right = values >= left_sums
+            values = np.where(go_right, values - left_sums, values)
+            nodes = np.where(go_right, left + 1, left)
+        return np.minimum(nodes - self.leaf_start, self.capacity - 1)
@@ -0,0 +1,220 @@
+''' Best response and exploitability of a policy profile in Leduc Hold'em
+
+The betting of Leduc Hold'em does not depend on the cards, so the public tree
+(the first player and the betting actions) is walked only once. The private
+deals, i.e. the hand of each player and the public card, are enumerated up
+front, and the reach probabilities and the values of all the deals are carried
+as vectors along the walk. At every node the policy is queried once per
+distinct observation instead of once per deal.
+
+The best responder sees its own card, the public card and the whole betting
+history, while the evaluated policies only see what the environment encodes
+in the observation.
+'''
+
+import itertools
+import numpy as np
+
+from rlcard.games.leducholdem.dealer import LeducholdemDealer
+from rlcard.games.leducholdem.game import LeducholdemGame
+from rlcard.utils.utils import remove_illegal
+
+
+def agent_policy(agent):
+    ''' Get the policy of an agent as a function of the state
+
+    Args:
+        agent (object): A CFRAgent (its average policy), an NFSPAgent (its
+          average policy), a RandomAgent or a function that maps a state to
+          action probabilities
+
+    Returns:
+        (function): A function that takes a state as returned by Env.get_state
+          and returns the probabilities of all the actions
+    '''
+    if hasattr(agent, 'table'):
+        return lambda state: agent.action_probs(agent.state_key(state), state['legal_actions'],
+                                                agent.table.average_policy)
+    if hasattr(agent, '_act'):
+        return lambda state: remove_illegal(agent._act(state['obs']), state['legal_actions'])
+    if hasattr(agent, 'action_num'):
+        return lambda state: remove_illegal(np.ones(agent.action_num), state['legal_actions'])
+    if callable(agent):
+        return agent
+    raise ValueError('Cannot get the policy of {}'.format(agent))
+
+
+class PublicTreeWalker(object):
+    ''' Compute best responses in Leduc Hold'em by walking the public tree once
+    '''
+
+    def __init__(self, env, policies):
+        ''' Initialize
+
+        Args:
+            env (Env): A Leduc Hold'em environment, used to encode the states
+            policies (list): The agent or the policy function of each player, see agent_policy
+        '''
+        if not isinstance(env.game, LeducholdemGame):
+            raise ValueError('Best responses are only supported in Leduc Hold\'em')
+        self.env = env
+        self.policies = [agent_policy(policy) for policy in policies]
+        self.game = LeducholdemGame(allow_step_back=True)
+
+        # All the deals (hand of player 0, hand of player 1, public card)
+        self.cards = LeducholdemDealer().deck
+        deals = np.array(list(itertools.permutations(range(len(self.cards)), 3)))
+        self.deal_num = len(deals)
+        self.hands = [deals[:, 0], deals[:, 1]]
+        self.public = deals[:, 2]
+
+        # The information of a player in each round, as an index into a
+        # small set of keys. Each key has a representative deal
+        card_num = len(self.cards)
+        self.keys = []
+        for player_id in range(2):
+            round_keys = []
+            for key in (self.hands[player_id], self.hands[player_id] * card_num + self.public):
+                unique, representatives, inverse = np.unique(key, return_index=True, return_inverse=True)
+                round_keys.append((representatives, inverse, len(unique)))
+            self.keys.append(round_keys)
+
+        # The showdown only depends on the ranks of the cards
+        ranks = np.array([['J', 'Q', 'K'].index(card.rank) for card in self.cards])
+        showdown = ranks[deals[:, 0]] * 9 + ranks[deals[:, 1]] * 3 + ranks[deals[:, 2]]
+        _, self.showdown_representatives, self.showdown_inverse = np.unique(
+            showdown, return_index=True, return_inverse=True)
+
+        # Action probabilities of each (player, obs, legal actions), since
+        # the policies are fixed during the walk
+        self.cache = {}
+
+    def best_response_value(self, player_id):
+        ''' Compute the expected payoff of the best response of a player
+
+        Args:
+            player_id (int): The player who best responds to the other player
+
+        Returns:
+            (float): The expected payoff of the best response
+        '''
+        value = 0.0
+        for first_player in range(2):
+            self.start_game(first_player)
+            # The chance of the first player and of the deal
+            reach = np.full(self.deal_num, 0.5 / self.deal_num)
+            value += self.walk(reach, player_id).sum()
+        return value
+
+    def start_game(self, first_player):
+        ''' Start a game with a given first player
+        '''
+        self.game.init_game()
+        self.game.game_pointer = first_player
+        self.game.round.start_new_round(game_pointer=first_player,
+                                        raised=[p.in_chips for p in self.game.players])
+
+    def set_deal(self, deal, with_public_card):
+        ''' Put the cards of a deal into the game
+        '''
+        for player_id in range(2):
+            self.game.players[player_id].hand = self.cards[self.hands[player_id][deal]]
+        self.game.public_card = self.cards[self.public[deal]] if with_public_card else None
+
+    def walk(self, reach, player_id):
+        ''' Compute the values of all the deals below the current node
+
+        Args:
+            reach (numpy.array): The probability of reaching the node for each
+              deal, by the chance and the other player
+            player_id (int): The best responding player
+
+        Returns:
+            (numpy.array): The value of each deal, weighted by its reach probability
+        '''
+        if self.game.is_over():
+            return reach * self.payoffs(player_id)
+
+        current_player = self.game.get_player_id()
+        round_counter = self.game.round_counter
+        legal_actions = [self.env.actions.index(a) for a in self.game.get_legal_actions()]
+        representatives, inverse, key_num = self.keys[current_player][round_counter]
+
+        if current_player != player_id:
+            probs = np.zeros((key_num, self.env.action_num))
+            for key, deal in enumerate(representatives):
+                probs[key] = self.action_probs(current_player, deal, round_counter)
+            probs = probs[inverse]
+            values = np.zeros(self.deal_num)
+            for action in legal_actions:
+                child_reach = reach * probs[:, action]
+                if not child_reach.any():
+                    continue
+                self.game.step(self.env.actions[action])
+                values += self.walk(child_reach, player_id)
+                self.game.step_back()
+            return values
+
+        # The best responder picks the best action of each information set
+        action_values = np.zeros((len(legal_actions), self.deal_num))
+        for i, action in enumerate(legal_actions):
+            self.game.step(self.env.actions[action])
+            action_values[i] = self.walk(reach, player_id)
+            self.game.step_back()
+        infoset_values = np.zeros((len(legal_actions), key_num))
+        for i in range(len(legal_actions)):
+            infoset_values[i] = np.bincount(inverse, weights=action_values[i], minlength=key_num)
+        best_actions = np.argmax(infoset_values, axis=0)
+        return action_values[best_actions[inverse], np.arange(self.deal_num)]
+
+    def action_probs(self, player_id, deal, round_counter):
+        ''' Query the policy of a player with the cards of a deal
+        '''
+        self.set_deal(deal, round_counter > 0)
+        state = self.env.extract_state(self.game.get_state(player_id))
+        cache_key = (player_id, state['obs'].tostring(), tuple(state['legal_actions']))
+        probs = self.cache.get(cache_key)
+        if probs is None:
+            probs = np.asarray(self.policies[player_id](state), dtype=np.float64)
+            self.cache[cache_key] = probs
+        return probs
+
+    def payoffs(self, player_id):
+        ''' The payoff of a player for each deal at a terminal node
+        '''
+        if any(player.status == 'folded' for player in self.game.players):
+            self.set_deal(0, False)
+            return np.full(self.deal_num, self.game.get_payoffs()[player_id])
+        showdown_payoffs = np.zeros(len(self.showdown_representatives))
+        for i, deal in enumerate(self.showdown_representatives):
+            self.set_deal(deal, True)
+            showdown_payoffs[i] = self.game.get_payoffs()[player_id]
+        return showdown_payoffs[self.showdown_inverse]
+
+
+def nash_conv(env, policies):
+    ''' Compute the sum of the gains of each player from best responding
+
+    Args:
+        env (Env): A Leduc Hold'em environment
+        policies (list): The agent or the policy function of each player, see agent_policy
+
+    Returns:
+        (float): The NashConv of the policy profile, in chips
+    '''
+    walker = PublicTreeWalker(env, policies)
+    # The game is zero-sum, so the value of the profile cancels out
+    return sum(walker.best_response_value(player_id) for player_id in range(2))
+
+def exploitability(env, policies):
+    ''' Compute the exploitability of a policy profile, the average gain of
+    the players from best responding
+
+    Args:
+        env (Env): A Leduc Hold'em environment
+        policies (list): The agent or the policy function of each player, see agent_policy
+
+    Returns:
+        (float): The exploitability, in chips. It is zero for a Nash equilibrium
+    '''
+    return nash_conv(env, policies) / 2
@@ -0,0 +1,91 @@
+''' Suit isomorphism of poker states
+
+In poker the suits have no order, so two states that only differ by a
+permutation of the suits are strategically identical. The cards of a state
+are given as groups (Eg: the hand and the public cards), and every suit is
+described by the ranks it has in each group. The suits are sorted by their
+descriptions and renamed in that order, so all the isomorphic states have the
+same canonical cards.
+
+The canonical suits are cached with a bounded LRU cache, since the same
+groups of cards are seen many times in training. The canonical_key of the
+poker environments and the cache of rlcard.games.limitholdem.equity both use
+this canonicalization.
+'''
+
+from functools import lru_cache
+
+
+class SuitIsomorphism(object):
+    ''' Map cards to their suit-isomorphic canonical cards
+    '''
+
+    def __init__(self, suits, cache_size=100000):
+        ''' Initialize
+
+        Args:
+            suits (str): The suits of the game. Eg: 'SHDC'
+            cache_size (int): The maximum number of cached groups of cards
+        '''
+        self.suits = suits
+        self.canonical_suits = lru_cache(maxsize=cache_size)(self._canonical_suits)
+
+    def _canonical_suits(self, groups):
+        ''' Compute the canonical suit of each suit
+
+        Args:
+            groups (tuple): Tuples of cards, each sorted
+
+        Returns:
+            (dict): suit -> canonical suit
+        '''
+        descriptions = {suit: tuple([] for _ in groups) for suit in self.suits}
+        for i, group in enumerate(groups):
+            for card in group:
+                descriptions[card[0]][i].append(card[1:])
+        order = sorted(self.suits, key=lambda suit: descriptions[suit], reverse=True)
+        return {suit: self.suits[i] for i, suit in enumerate(order)}
+
+    def canonicalize(self, groups):
+        ''' Rename the suits of groups of cards
+
+        Args:
+            groups (list): Lists of card indexes, the suit being the first
+              character. Eg: [['SA', 'HK'], ['D2', 'C7', 'S9']]
+
+        Returns:
+            (list): The lists of canonical card indexes
+        '''
+        canonical_suits = self.canonical_suits(tuple(tuple(sorted(group)) for group in groups))
+        return [[canonical_suits[card[0]] + card[1:] for card in group] for group in groups]
+
+    def key(self, groups):
+        ''' Get a key that is the same for the groups of cards that only
+        differ by a permutation of the suits
+
+        Args:
+            groups (list): Lists of card indexes. Eg: [['SA', 'HK'], ['D2', 'C7', 'S9']]
+
+        Returns:
+            (tuple): The sorted canonical cards of each group
+        '''
+        return tuple(tuple(sorted(group)) for group in self.canonicalize(groups))
+
+    def canonical_obs(self, obs, groups, card2index):
+        ''' Replace the cards encoded in an observation by the canonical cards
+
+        Args:
+            obs (numpy.array): The observation, whose first len(card2index)
+              elements are the one-hot encoding of the cards
+            groups (list): Lists of the cards of the observation
+            card2index (dict): card index -> position in the observation
+
+        Returns:
+            (numpy.array): A copy of the observation with the canonical cards
+        '''
+        canonical = obs.copy()
+        canonical[:len(card2index)] = 0
+        for group in self.canonicalize(groups):
+            for card in group:
+                canonical[card2index[card]] = 1
+        return canonical
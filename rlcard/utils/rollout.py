@@ -0,0 +1,282 @@
+''' Multi-process rollouts with shared-memory transition buffers
+
+A RolloutEngine starts persistent worker processes. Each worker owns its
+environment and agents, and is seeded with the seed of the engine plus its
+index, so the rollouts are reproducible. For every task, a worker plays a
+number of episodes and writes the transitions into its own ring buffer in
+shared memory. Only the position of the transitions and the payoffs go
+through the pipe, so nothing large is pickled.
+
+The weights of the policies are broadcast the same way: the main process
+flattens them into a shared array, and the workers load them before their
+next task when the version sent with the task has changed.
+'''
+
+import random
+import multiprocessing
+import numpy as np
+
+import rlcard
+from rlcard.utils.utils import assign_task
+
+# The fields of a transition: (RawArray typecode, numpy dtype, width). The
+# width is 'obs' for the size of the observation, 'action' for the number of
+# actions, or 1
+_FIELDS = {'obs': ('f', np.float32, 'obs'),
+           'action': ('i', np.int32, 1),
+           'reward': ('f', np.float32, 1),
+           'next_obs': ('f', np.float32, 'obs'),
+           'done': ('b', np.bool_, 1),
+           'legal_actions': ('b', np.bool_, 'action'),
+           'player_id': ('i', np.int32, 1)}
+
+
+class SharedTransitionBuffer(object):
+    ''' A ring buffer of transitions in shared memory, written by one worker
+    and read by the main process
+    '''
+
+    def __init__(self, capacity, obs_size, action_num):
+        ''' Initialize
+
+        Args:
+            capacity (int): The number of transitions of the buffer
+            obs_size (int): The size of a flattened observation
+            action_num (int): The number of actions
+        '''
+        self.capacity = capacity
+        self.widths = {}
+        self.raw = {}
+        for name, (typecode, _, width) in _FIELDS.items():
+            width = {'obs': obs_size, 'action': action_num}.get(width, width)
+            self.widths[name] = width
+            self.raw[name] = multiprocessing.RawArray(typecode, capacity * width)
+        # The number of transitions written so far, only kept by the writer
+        self.position = 0
+        self._arrays = None
+
+    def __getstate__(self):
+        # The numpy views are created again in each process
+        state = self.__dict__.copy()
+        state['_arrays'] = None
+        return state
+
+    @property
+    def arrays(self):
+        ''' The numpy views of the shared arrays, of shape (capacity, width)
+        '''
+        if self._arrays is None:
+            self._arrays = {name: np.frombuffer(self.raw[name], dtype=_FIELDS[name][1]).reshape(self.capacity, self.widths[name])
+                            for name in _FIELDS}
+        return self._arrays
+
+    def write(self, transition, player_id):
+        ''' Write a transition
+
+        Args:
+            transition (list): [state, action, reward, next_state, done] as in Env.run
+            player_id (int): The player of the transition
+        '''
+        state, action, reward, next_state, done = transition
+        i = self.position % self.capacity
+        arrays = self.arrays
+        arrays['obs'][i] = np.ravel(state['obs'])
+        arrays['action'][i] = action
+        arrays['reward'][i] = reward
+        arrays['next_obs'][i] = np.ravel(next_state['obs'])
+        arrays['done'][i] = done
+        arrays['legal_actions'][i] = False
+        arrays['legal_actions'][i, next_state['legal_actions']] = True
+        arrays['player_id'][i] = player_id
+        self.position += 1
+
+    def read(self, start, count):
+        ''' Copy transitions out of the buffer
+
+        Args:
+            start (int): The position of the first transition
+            count (int): The number of transitions
+
+        Returns:
+            (dict): The arrays of the transitions. The fields of width 1 are
+              of shape (count,), the others of shape (count, width)
+        '''
+        index = (start + np.arange(count)) % self.capacity
+        batch = {}
+        for name, array in self.arrays.items():
+            batch[name] = array[index]
+            if self.widths[name] == 1:
+                batch[name] = batch[name].reshape(count)
+        return batch
+
+
+def _run_worker(env_id, make_agents, set_weights, buffer, raw_weights, weight_shapes, conn, seed):
+    ''' The loop of a worker process
+
+    Each task is a tuple (episode_num, is_training, weight_version). The
+    position and the number of the transitions written, and the payoffs of
+    the episodes are sent back when it is done.
+    '''
+    random.seed(seed)
+    np.random.seed(seed)
+    env = rlcard.make(env_id)
+    agents = make_agents(env)
+    env.set_agents(agents)
+    version = 0
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        episode_num, is_training, weight_version = task
+        try:
+            if weight_version != version:
+                set_weights(agents, _unflatten(raw_weights, weight_shapes))
+                version = weight_version
+            start = buffer.position
+            payoffs = []
+            for _ in range(episode_num):
+                trajectories, episode_payoffs = env.run(is_training=is_training)
+                for player_id, trajectory in enumerate(trajectories):
+                    for transition in trajectory:
+                        buffer.write(transition, player_id)
+                payoffs.append(episode_payoffs)
+            count = buffer.position - start
+            if count > buffer.capacity:
+                raise MemoryError('A task wrote {} transitions into a buffer of {}. Increase the capacity of RolloutEngine'.format(count, buffer.capacity))
+            conn.send((start, count, payoffs))
+        except Exception as error:
+            conn.send(error)
+    conn.close()
+
+def _unflatten(raw_weights, weight_shapes):
+    ''' Copy the weights out of the shared array
+    '''
+    flat = np.frombuffer(raw_weights, dtype=np.float32)
+    weights = []
+    offset = 0
+    for shape in weight_shapes:
+        size = int(np.prod(shape))
+        weights.append(flat[offset:offset + size].reshape(shape).copy())
+        offset += size
+    return weights
+
+
+class RolloutEngine(object):
+    ''' Play episodes in persistent worker processes
+    '''
+
+    def __init__(self, env_id, make_agents, process_num=None, capacity=100000, seed=None,
+                 weight_shapes=None, set_weights=None):
+        ''' Initialize
+
+        Args:
+            env_id (str): The id of the environment of the workers
+            make_agents (function): Takes the environment of a worker and
+              returns its agents. It is called in the worker, and must be
+              picklable (a function defined at the top level of a module)
+            process_num (int): The number of worker processes, default to the number of CPUs
+            capacity (int): The number of transitions of the buffer of each
+              worker. It must hold all the transitions of one task
+            seed (int): Worker i is seeded with seed + i. If None, random seeds are drawn
+            weight_shapes (list): The shapes of the broadcast weights, None if
+              the weights are not broadcast
+            set_weights (function): Takes the agents of a worker and the list
+              of the weights, and loads the weights into the agents
+
+        Note: The workers are started by the first call of collect(). Call
+          close() to stop them.
+        '''
+        self.env_id = env_id
+        self.make_agents = make_agents
+        self.process_num = process_num if process_num else multiprocessing.cpu_count()
+        self.capacity = capacity
+        self.seed = seed
+        self.weight_shapes = [tuple(shape) for shape in weight_shapes] if weight_shapes else []
+        self.set_weights = set_weights
+        if self.weight_shapes and set_weights is None:
+            raise ValueError('set_weights is needed to broadcast weights')
+        env = rlcard.make(env_id)
+        self.player_num = env.player_num
+        self.obs_size = int(np.prod(env.state_shape))
+        self.action_num = env.action_num
+        self.workers = []
+
+    def start_workers(self):
+        ''' Allocate the shared memory and start the worker processes
+        '''
+        weight_size = sum(int(np.prod(shape)) for shape in self.weight_shapes)
+        self.raw_weights = multiprocessing.RawArray('f', max(weight_size, 1))
+        self.weights = np.frombuffer(self.raw_weights, dtype=np.float32)[:weight_size]
+        # The workers load the weights when the version changes
+        self.weight_version = 0
+        if self.seed is None:
+            seeds = np.random.randint(0, 2**31 - 1, size=self.process_num)
+        else:
+            seeds = [self.seed + i for i in range(self.process_num)]
+        for seed in seeds:
+            buffer = SharedTransitionBuffer(self.capacity, self.obs_size, self.action_num)
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_run_worker,
+                                              args=(self.env_id, self.make_agents, self.set_weights, buffer,
+                                                    self.raw_weights, self.weight_shapes, child_conn, int(seed)))
+            process.daemon = True
+            process.start()
+            child_conn.close()
+            self.workers.append((process, parent_conn, buffer))
+
+    def close(self):
+        ''' Stop the worker processes
+        '''
+        for process, conn, _ in self.workers:
+            conn.send(None)
+            conn.close()
+            process.join()
+        self.workers = []
+
+    def broadcast(self, weights):
+        ''' Publish new weights, loaded by the workers before their next task
+
+        Args:
+            weights (list): Arrays of the shapes given by weight_shapes
+        '''
+        if not self.workers:
+            self.start_workers()
+        shapes = [tuple(np.shape(weight)) for weight in weights]
+        if shapes != self.weight_shapes:
+            raise ValueError('Expected weights of shapes {}, got {}'.format(self.weight_shapes, shapes))
+        offset = 0
+        for weight in weights:
+            size = int(np.size(weight))
+            self.weights[offset:offset + size] = np.ravel(weight)
+            offset += size
+        self.weight_version += 1
+
+    def collect(self, episode_num, is_training=True):
+        ''' Play episodes in the workers
+
+        Args:
+            episode_num (int): The number of episodes, split across the workers
+            is_training (boolean): True if the agents act with step, False with eval_step
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (dict): The transitions of all the players, see SharedTransitionBuffer.read.
+                  legal_actions is the mask of the legal actions of the next state
+                (numpy.array): The payoffs of the episodes, (episode_num, player_num)
+        '''
+        if not self.workers:
+            self.start_workers()
+        episode_nums = assign_task(episode_num, self.process_num)
+        for (_, conn, _), num in zip(self.workers, episode_nums):
+            conn.send((num, is_training, self.weight_version))
+        results = [conn.recv() for _, conn, _ in self.workers]
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+        batches = [buffer.read(start, count) for (_, _, buffer), (start, count, _) in zip(self.workers, results)]
+        transitions = {name: np.concatenate([batch[name] for batch in batches]) for name in _FIELDS}
+        payoffs = np.array([payoff for _, _, worker_payoffs in results for payoff in worker_payoffs],
+                           dtype=np.float32).reshape(-1, self.player_num)
+        return transitions, payoffs
@@ -0,0 +1,104 @@
+''' Undo log for stepping back games
+
+Instead of deep copying the dealer, the round and the players before every
+action, a game records the attributes that the action may change. Stepping
+back replays the records of the last step in reverse. Lists, dicts and sets
+are restored in place, so the objects keep their identity and any object
+sharing them sees the restored contents.
+
+Example:
+
+    log = UndoLog()
+    log.begin_step()
+    log.record(round, 'game_pointer', 'raised')
+    log.record(player, 'in_chips')
+    ... # proceed the round
+    log.undo_step()
+
+Note: only the containers themselves are copied, the items are shared. An
+item that is mutated in a step, like the color of an Uno wild card, should
+be recorded separately.
+'''
+
+# Marks an attribute that does not exist before the step
+_MISSING = object()
+
+
+def _copy_contents(value):
+    ''' Shallow copy the contents of a container
+
+    Args:
+        value (object): any value
+
+    Returns:
+        (object): a copy of the contents of a list, dict or set. None otherwise
+    '''
+    if isinstance(value, list):
+        return value[:]
+    if isinstance(value, (dict, set)):
+        return value.copy()
+    return None
+
+def _restore_contents(value, contents):
+    ''' Restore the contents of a container in place
+    '''
+    if isinstance(value, list):
+        value[:] = contents
+    else:
+        value.clear()
+        value.update(contents)
+
+
+class UndoLog(object):
+    ''' Journal of the attributes changed by each step of a game
+    '''
+
+    def __init__(self):
+        ''' Initialize an empty log
+        '''
+        self.steps = []
+
+    def __len__(self):
+        ''' Return the number of steps that can be undone
+        '''
+        return len(self.steps)
+
+    def begin_step(self):
+        ''' Start recording a new step
+        '''
+        self.steps.append([])
+
+    def record(self, obj, *attrs):
+        ''' Record the current values of some attributes of an object
+
+        Args:
+            obj (object): the object to be changed in the current step
+            attrs (str): the names of the attributes
+        '''
+        entries = self.steps[-1]
+        for attr in attrs:
+            value = getattr(obj, attr, _MISSING)
+            entries.append((obj, attr, value, _copy_contents(value)))
+
+    def undo_step(self):
+        ''' Restore the attributes recorded in the last step
+
+        Returns:
+            (bool): True if a step is undone, False if the log is empty
+        '''
+        if not self.steps:
+            return False
+        for obj, attr, value, contents in reversed(self.steps.pop()):
+            if value is _MISSING:
+                if hasattr(obj, attr):
+                    delattr(obj, attr)
+                continue
+            if contents is not None:
+                _restore_contents(value, contents)
+            setattr(obj, attr, value)
+        return True
+
+    def clear(self):
+        ''' Drop all the recorded steps
+        '''
+        self.steps = []
@@ -1,7 +1,7 @@
 import random
 import numpy as np
 
-from rlcard.core import Card, Player
+from rlcard.core import Card, Player, CARD_IDS, CARD_INDEXES
 
 
 def init_standard_deck():
@@ -29,6 +29,57 @@ def init_54_deck():
     return res
 
 
+def get_card_id(index):
+    ''' Get the id of a card from its index
+
+    Args:
+        index (str): The index of the card. Eg: 'SA'
+
+    Returns:
+        (int): The id of the card, see Card
+    '''
+    return CARD_IDS[index]
+
+def get_card_from_id(card_id):
+    ''' Get a Card object from the id of a card
+
+    Args:
+        card_id (int): The id of the card
+
+    Returns:
+        (Card): The card
+    '''
+    index = CARD_INDEXES[card_id]
+    if card_id >= 52:
+        return Card(index, '')
+    return Card(index[0], index[1:])
+
+def cards2ids(cards):
+    ''' Get the ids of a list of cards
+
+    Args:
+        cards (list): List of Card objects
+
+    Returns:
+        (numpy.array): The ids of the cards, as int8
+    '''
+    return np.array([card.id for card in cards], dtype=np.int8)
+
+def cards2mask(cards):
+    ''' Get the bitmask of a list of cards, where the bit of each id is set
+
+    Args:
+        cards (list): List of Card objects
+
+    Returns:
+        (int): The bitmask of the cards
+    '''
+    mask = 0
+    for card in cards:
+        mask |= 1 << card.id
+    return mask
+
+
 def get_random_cards(cards, num, seed=None):
     ''' Randomly get a number of chosen cards out of a list of cards
 
@@ -156,7 +207,7 @@ def take_out_cards(cards, remove_cards):
     remove_cards_cp = remove_cards
     for card in cards:
         for remove_card in remove_cards_cp:
-            if card.rank == remove_card.rank and card.suit == remove_card.suit:
+            if card.id == remove_card.id:
                 cards.pop(cards.index(card))
                 remove_cards_cp.pop(remove_cards_cp.index(remove_card))
     return remove_cards_cp
@@ -177,7 +228,7 @@ def is_in_cards(origin_cards, check_cards):
         for i in range(len(origin_cards)):
             if i in check_cards_pos:
                 continue
-            if check_card.rank == origin_cards[i].rank and check_card.suit == origin_cards[i].suit:
+            if check_card.id == origin_cards[i].id:
                 found = True
                 check_cards_pos.add(i)
                 break
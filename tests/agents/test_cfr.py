@@ -1,8 +1,12 @@
 import unittest
+import os
+import shutil
+import tempfile
 import numpy as np
 
 import rlcard
 from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.agents.cfr_table import CFRTable
 
 class TestNFSP(unittest.TestCase):
 
@@ -19,6 +23,20 @@ class TestNFSP(unittest.TestCase):
 
         self.assertIn(action, [0, 2])
 
+    def test_variants(self):
+        env = rlcard.make('leduc-holdem', allow_step_back=True)
+        for variant in ['cfr+', 'linear', 'dcfr']:
+            agent = CFRAgent(env, variant=variant)
+            self.assertTrue(agent.alternating)
+            for _ in range(20):
+                agent.train()
+            policy = agent.table.policy[:len(agent.table)]
+            self.assertTrue(np.allclose(policy.sum(axis=1), 1))
+            if variant == 'cfr+':
+                self.assertGreaterEqual(agent.table.regrets.min(), 0)
+        with self.assertRaises(ValueError):
+            CFRAgent(env, variant='unknown')
+
     def test_save_and_load(self):
         env = rlcard.make('leduc-holdem', allow_step_back=True)
         agent = CFRAgent(env)
@@ -34,4 +52,46 @@ class TestNFSP(unittest.TestCase):
         self.assertEqual(len(agent.average_policy), len(new_agent.average_policy))
         self.assertEqual(len(agent.regrets), len(new_agent.regrets))
         self.assertEqual(agent.iteration, new_agent.iteration)
+        self.assertTrue(np.array_equal(agent.table.regrets[:len(agent.table)], new_agent.table.regrets[:len(new_agent.table)]))
+        for obs in agent.regrets:
+            self.assertTrue(np.array_equal(agent.average_policy[obs], new_agent.average_policy[obs]))
+
+class TestCFRTable(unittest.TestCase):
+
+    def test_get_id(self):
+        table = CFRTable(3, capacity=2)
+        ids = [table.get_id(key) for key in [b'a', b'b', b'c', b'a']]
+        self.assertEqual(ids, [0, 1, 2, 0])
+        self.assertEqual(len(table), 3)
+        self.assertIn(b'c', table)
+        self.assertGreaterEqual(table.regrets.shape[0], 3)
+        self.assertTrue(np.allclose(table.policy[2], 1 / 3))
+
+    def test_regret_matching(self):
+        table = CFRTable(3)
+        table.get_id(b'a')
+        table.get_id(b'b')
+        table.regrets[0] = [1.0, -1.0, 3.0]
+        table.update_policy()
+        self.assertTrue(np.allclose(table.policy[0], [0.25, 0.0, 0.75]))
+        self.assertTrue(np.allclose(table.policy[1], 1 / 3))
+
+    def test_save_and_load(self):
+        table = CFRTable(2)
+        table.get_id(b'key')
+        table.get_id(b'longer key')
+        table.average_policy[1] = [0.5, 2.0]
+        model_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(model_dir, 'table.npz')
+            table.save(path, iteration=7)
+            new_table, extra = CFRTable.load(path)
+        finally:
+            shutil.rmtree(model_dir)
+        self.assertEqual(new_table.keys, [b'key', b'longer key'])
+        self.assertEqual(new_table.get_id(b'longer key'), 1)
+        self.assertTrue(np.array_equal(new_table.average_policy[1], [0.5, 2.0]))
+        self.assertEqual(int(extra['iteration']), 7)
 
+if __name__ == '__main__':
+    unittest.main()
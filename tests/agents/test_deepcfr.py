@@ -3,7 +3,7 @@ import tensorflow as tf
 import numpy as np
 import rlcard
 
-from rlcard.agents.deep_cfr_agent import DeepCFR, FixedSizeRingBuffer
+from rlcard.agents.deep_cfr_agent import DeepCFR, FixedSizeRingBuffer, AdvantageMemory
 
 class TestUtilsMethos(unittest.TestCase):
 
@@ -67,14 +67,43 @@ class TestUtilsMethos(unittest.TestCase):
         sess.close()
         tf.reset_default_graph()
 
+    def test_train_batched_traversals(self):
+        sess = tf.InteractiveSession()
+        env = rlcard.make('leduc-holdem', allow_step_back=True)
+        agent = DeepCFR(session=sess,
+                        env=env,
+                        policy_network_layers=(16,16),
+                        advantage_network_layers=(16,16),
+                        num_traversals=10,
+                        num_step=1,
+                        batch_size_advantage=32,
+                        batch_size_strategy=32,
+                        memory_capacity=int(1e5),
+                        traversal_batch_size=4)
+        agent.train()
+        self.assertGreater(len(agent._advantage_memories[0]), 0)
+        self.assertGreater(len(agent._strategy_memories), 0)
+        strategies = agent._strategy_memories.all().strategy_action_probs
+        self.assertTrue(((strategies >= 0) & (strategies <= 1)).all())
+
+        advantages = np.array([[1., -1., 3., 2.], [-1., -2., 0., 5.]])
+        legal_masks = np.array([[True, True, True, False], [True, True, False, False]])
+        # 1 / action_num for each legal action when no advantage is positive, as
+        # before batching. The traversal renormalizes them before sampling
+        matched_regrets = agent._regret_matching(advantages, legal_masks)
+        self.assertTrue(np.allclose(matched_regrets, [[0.25, 0, 0.75, 0], [0.25, 0.25, 0, 0]]))
+
+        sess.close()
+        tf.reset_default_graph()
+
     def test_fixed_size_ring_buffer(self):
         buf = FixedSizeRingBuffer(10)
 
         # Test add data
         for i in range(50):
             buf.add(i)
-        self.assertIn(49, buf._data)
-        self.assertNotIn(1, buf._data)
+        self.assertIn(49, list(buf))
+        self.assertNotIn(1, list(buf))
 
         # Test sample
         self.assertEqual(len(buf.sample(3)), 3)
@@ -92,6 +121,24 @@ class TestUtilsMethos(unittest.TestCase):
         buf.clear()
         self.assertEqual(len(buf), 0)
 
+    def test_ring_buffer_arrays(self):
+        buf = FixedSizeRingBuffer(5)
+        buf.add(AdvantageMemory(np.zeros(3), 1, 0.5, 0))
+        buf.add_batch(AdvantageMemory(np.ones((6, 3)), np.arange(2, 8), np.arange(6) / 2, np.arange(6)))
+        # The same as adding the elements one by one
+        self.assertEqual(len(buf), 5)
+        self.assertEqual(sorted(element.iteration for element in buf), [3, 4, 5, 6, 7])
+        buf.add(AdvantageMemory(np.zeros(3), 8, 0.5, 0))
+        self.assertEqual(sorted(element.iteration for element in buf), [4, 5, 6, 7, 8])
+
+        samples = buf.sample(3)
+        self.assertIsInstance(samples, AdvantageMemory)
+        self.assertEqual(samples.info_state.shape, (3, 3))
+        self.assertEqual(samples.info_state.dtype, np.float32)
+        self.assertEqual(samples.advantage.dtype, np.float32)
+        self.assertEqual(len(set(samples.iteration.tolist())), 3)
+        self.assertEqual(buf.all().action.shape, (5,))
+
 
 if __name__ == '__main__':
     unittest.main()
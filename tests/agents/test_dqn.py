@@ -1,8 +1,11 @@
+import os
+import tempfile
 import unittest
 import tensorflow as tf
 import numpy as np
 
-from rlcard.agents.dqn_agent import DQNAgent
+from rlcard.agents.dqn_agent import DQNAgent, Memory, PrioritizedMemory, Normalizer
+from rlcard.utils.buffers import SumTree
 
 class TestDQN(unittest.TestCase):
 
@@ -71,3 +74,117 @@ class TestDQN(unittest.TestCase):
 
         sess.close()
         tf.reset_default_graph()
+
+    def test_memory(self):
+        memory = Memory(memory_size=4, batch_size=3, action_num=3)
+        for i in range(6):
+            memory.save(np.full(2, i), i, float(i), np.full(2, i + 1), i % 2 == 0, [i % 3])
+        self.assertEqual(len(memory), 4)
+        # The two oldest transitions are overwritten
+        self.assertEqual(sorted(memory.actions.tolist()), [2, 3, 4, 5])
+        state_batch, action_batch, reward_batch, next_state_batch, done_batch, legal_actions_batch = memory.sample()
+        self.assertEqual(state_batch.shape, (3, 2))
+        self.assertEqual(state_batch.dtype, np.float32)
+        for i in range(3):
+            action = action_batch[i]
+            self.assertIn(action, [2, 3, 4, 5])
+            self.assertEqual(reward_batch[i], action)
+            self.assertTrue((state_batch[i] == action).all())
+            self.assertTrue((next_state_batch[i] == action + 1).all())
+            self.assertEqual(done_batch[i], action % 2 == 0)
+            self.assertEqual(legal_actions_batch[i].tolist(), [j == action % 3 for j in range(3)])
+
+        memory.save(np.zeros(2), 0, 0.0, np.zeros(2), False)
+        self.assertTrue(memory.legal_actions[memory.position - 1].all())
+
+        memory = Memory(memory_size=4, batch_size=3)
+        memory.save(np.zeros(2), 0, 0.0, np.zeros(2), False)
+        with self.assertRaises(ValueError):
+            memory.save(np.zeros(2), 0, 0.0, np.zeros(2), False, [0])
+
+    def test_normalizer(self):
+        states = np.random.random_sample((50, 3, 4))
+        normalizer = Normalizer()
+        state = states[0]
+        self.assertIs(normalizer.normalize(state), state)
+        for state in states:
+            normalizer.append(state)
+        self.assertEqual(normalizer.length, 50)
+        self.assertTrue(np.allclose(normalizer.mean, states.mean(axis=0), atol=1e-6))
+        self.assertTrue(np.allclose(normalizer.std, states.std(axis=0), atol=1e-6))
+        expected = (states[0] - states.mean(axis=0)) / states.std(axis=0)
+        self.assertTrue(np.allclose(normalizer.normalize(states[0]), expected, atol=1e-4))
+        out = states[0].copy()
+        normalizer.normalize(out, out=out)
+        self.assertTrue(np.allclose(out, expected, atol=1e-4))
+
+        path = os.path.join(tempfile.mkdtemp(), 'normalizer.npz')
+        normalizer.save(path)
+        loaded = Normalizer(momentum=0.9)
+        loaded.load(path)
+        self.assertEqual(loaded.length, 50)
+        self.assertIsNone(loaded.momentum)
+        self.assertTrue((loaded.normalize(states[1]) == normalizer.normalize(states[1])).all())
+
+        # The exponentially weighted statistics follow the recent states
+        normalizer = Normalizer(momentum=0.9)
+        for _ in range(200):
+            normalizer.append(np.zeros(2))
+        for _ in range(200):
+            normalizer.append(np.ones(2))
+        self.assertTrue(np.allclose(normalizer.mean, 1, atol=1e-6))
+
+    def test_sum_tree(self):
+        tree = SumTree(5)
+        tree.update(np.arange(5), [1.0, 0.0, 2.0, 3.0, 4.0])
+        self.assertEqual(tree.total, 10.0)
+        self.assertEqual(tree.find([0.0, 0.5, 1.0, 2.9, 3.0, 5.9, 6.0, 9.9]).tolist(), [0, 0, 2, 2, 3, 3, 4, 4])
+        # The last priority of a repeated index is kept
+        tree.update([0, 4, 0], [5.0, 1.0, 0.5])
+        self.assertEqual(tree.total, 6.5)
+        self.assertEqual(tree.get([0, 4]).tolist(), [0.5, 1.0])
+
+    def test_prioritized_memory(self):
+        memory = PrioritizedMemory(memory_size=8, batch_size=4, action_num=2, alpha=1.0, beta_start=0.5, beta_steps=2)
+        for i in range(6):
+            memory.save(np.full(2, i), i % 2, float(i), np.full(2, i + 1), False, [0])
+        # The new transitions have the highest priority
+        self.assertTrue(np.allclose(memory.tree.get(np.arange(6)), 1.0))
+        batches = memory.sample()
+        self.assertEqual(len(batches), 8)
+        weight_batch, index_batch = batches[6:]
+        self.assertTrue(np.allclose(weight_batch, 1.0))
+        self.assertTrue((batches[2] == index_batch).all())
+
+        memory.update_priorities(np.arange(6), [0, 0, 0, 0, 0, 10.0])
+        self.assertEqual(memory.max_priority, 10.0 + memory.epsilon)
+        samples = np.concatenate([memory.sample()[7] for _ in range(20)])
+        self.assertGreater((samples == 5).mean(), 0.9)
+        # The rare transitions get the largest importance-sampling weights
+        memory.update_priorities(np.arange(6), [1.0, 1.0, 1.0, 1.0, 1.0, 3.0])
+        weight_batch, index_batch = memory.sample()[6:]
+        self.assertEqual(weight_batch.max(), 1.0)
+        self.assertTrue((weight_batch[index_batch == 5] < 1.0).all())
+
+    def test_train_prioritized(self):
+        sess = tf.InteractiveSession()
+        tf.Variable(0, name='global_step', trainable=False)
+        agent = DQNAgent(sess=sess,
+                         scope='dqn',
+                         replay_memory_size=500,
+                         replay_memory_init_size=10,
+                         update_target_estimator_every=100,
+                         norm_step=10,
+                         state_shape=[2],
+                         mlp_layers=[10,10],
+                         prioritized_replay=True)
+        sess.run(tf.global_variables_initializer())
+        for step in range(100):
+            ts = [{'obs': np.random.random_sample((2,)), 'legal_actions': [0, 1]}, np.random.randint(2), np.random.random(), {'obs': np.random.random_sample((2,)), 'legal_actions': [0, 1]}, True]
+            agent.feed(ts)
+            if step > 20:
+                agent.train()
+        # The priorities are the TD errors of the sampled transitions
+        self.assertGreater(len(set(agent.memory.tree.get(np.arange(len(agent.memory))).tolist())), 1)
+        sess.close()
+        tf.reset_default_graph()
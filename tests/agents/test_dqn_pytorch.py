@@ -60,3 +60,31 @@ class TestDQN(unittest.TestCase):
         predicted_action = agent.step({'obs': np.random.random_sample((2,)), 'legal_actions': [0, 1]})
         self.assertGreaterEqual(predicted_action, 0)
         self.assertLessEqual(predicted_action, 1)
+
+    def test_train_prioritized(self):
+        agent = DQNAgent(scope='dqn',
+                         replay_memory_size=500,
+                         replay_memory_init_size=10,
+                         update_target_estimator_every=100,
+                         norm_step=10,
+                         state_shape=[2],
+                         mlp_layers=[10,10],
+                         device=torch.device('cpu'),
+                         prioritized_replay=True)
+        for step in range(100):
+            ts = [{'obs': np.random.random_sample((2,)), 'legal_actions': [0, 1]}, \
+                np.random.randint(2), np.random.random(), {'obs': np.random.random_sample((2,)), 'legal_actions': [0, 1]}, True]
+            agent.feed(ts)
+            if step > 20:
+                agent.train()
+        # The priorities are the TD errors of the sampled transitions
+        self.assertGreater(len(set(agent.memory.tree.get(np.arange(len(agent.memory))).tolist())), 1)
+
+        # Weighted and unweighted updates give the same loss with equal weights
+        s = np.random.random_sample((4, 2)).astype(np.float32)
+        a = np.array([0, 1, 0, 1])
+        y = np.random.random_sample(4).astype(np.float32)
+        estimator = agent.q_estimator
+        q_values = estimator.predict_nograd(s)[np.arange(4), a]
+        loss = estimator.update(s, a, y, np.ones(4, dtype=np.float32))
+        self.assertAlmostEqual(loss, float(((q_values - y) ** 2).mean()), places=5)
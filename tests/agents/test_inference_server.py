@@ -0,0 +1,93 @@
+import unittest
+import threading
+import torch
+import numpy as np
+
+import rlcard
+from rlcard.agents.inference_server import InferenceServer, InferenceAgent, agent_predict_fn
+from rlcard.agents.dqn_agent_pytorch import DQNAgent
+
+class TestInferenceServer(unittest.TestCase):
+
+    def test_greedy_masking(self):
+        server = InferenceServer(lambda obs: np.tile([3.0, 2.0, 1.0], (len(obs), 1)))
+        server.start()
+        self.assertEqual(server.act(np.zeros(2), [0, 1, 2]), 0)
+        self.assertEqual(server.act(np.zeros(2), [1, 2]), 1)
+        self.assertEqual(server.act(np.zeros(2), [2]), 2)
+        server.close()
+        self.assertEqual(server.request_num, 3)
+
+    def test_sampling(self):
+        server = InferenceServer(lambda obs: np.tile([0.5, 0.5, 0.0], (len(obs), 1)), greedy=False)
+        server.start()
+        actions = set(server.act(np.zeros(2), [1, 2]) for _ in range(20))
+        # The only legal action with a positive probability
+        self.assertEqual(actions, {1})
+        actions = set(server.act(np.zeros(2), [2]) for _ in range(5))
+        self.assertEqual(actions, {2})
+        server.close()
+
+    def test_batching(self):
+        batch_sizes = []
+        def predict(obs):
+            batch_sizes.append(len(obs))
+            return np.random.random((len(obs), 4))
+        server = InferenceServer(predict, max_batch_size=4, max_wait=0.05)
+        server.start()
+        actions = [None] * 8
+        def run(i):
+            actions[i] = server.act(np.zeros(2), [i % 4])
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        server.close()
+        self.assertEqual(actions, [i % 4 for i in range(8)])
+        self.assertEqual(sum(batch_sizes), 8)
+        self.assertLessEqual(max(batch_sizes), 4)
+        self.assertLess(len(batch_sizes), 8)
+
+    def test_error(self):
+        def predict(obs):
+            raise ValueError('bad model')
+        server = InferenceServer(predict)
+        server.start()
+        with self.assertRaises(ValueError):
+            server.act(np.zeros(2), [0])
+        server.close()
+        with self.assertRaises(RuntimeError):
+            server.act(np.zeros(2), [0])
+
+    def test_agents(self):
+        env = rlcard.make('leduc-holdem')
+        agent = DQNAgent(scope='dqn',
+                         action_num=env.action_num,
+                         state_shape=env.state_shape,
+                         mlp_layers=[16],
+                         device=torch.device('cpu'))
+        server = InferenceServer(agent_predict_fn(agent), max_wait=0.01)
+        server.start()
+        state, _ = env.init_game()
+        self.assertEqual(InferenceAgent(server).eval_step(state), agent.eval_step(state))
+
+        payoffs = []
+        def run():
+            thread_env = rlcard.make('leduc-holdem')
+            thread_env.set_agents([InferenceAgent(server) for _ in range(thread_env.player_num)])
+            for _ in range(5):
+                payoffs.append(thread_env.run(is_training=False)[1])
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        server.close()
+        self.assertEqual(len(payoffs), 20)
+
+        with self.assertRaises(ValueError):
+            agent_predict_fn(object())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import shutil
+import tempfile
+import numpy as np
+
+import rlcard
+from rlcard.agents.mccfr_agent import MCCFRAgent, sample_action
+
+class TestMCCFR(unittest.TestCase):
+
+    def test_train(self):
+        env = rlcard.make('leduc-holdem', allow_step_back=True)
+        for sampling in ['external', 'outcome']:
+            agent = MCCFRAgent(env, sampling=sampling)
+            for _ in range(100):
+                agent.train()
+            self.assertGreater(len(agent.table), 0)
+            self.assertGreater(agent.table.average_policy[:len(agent.table)].sum(), 0)
+
+            state = {'obs': np.array([1., 1., 0., 0., 0., 0.]), 'legal_actions': [0, 2]}
+            action = agent.eval_step(state)
+            self.assertIn(action, [0, 2])
+
+    def test_train_large_game(self):
+        env = rlcard.make('limit-holdem', allow_step_back=True)
+        agent = MCCFRAgent(env, sampling='outcome')
+        for _ in range(10):
+            agent.train()
+        self.assertGreater(len(agent.table), 0)
+
+    def test_save_and_load(self):
+        env = rlcard.make('leduc-holdem', allow_step_back=True)
+        model_path = tempfile.mkdtemp()
+        try:
+            agent = MCCFRAgent(env, model_path=model_path)
+            for _ in range(10):
+                agent.train()
+            agent.save()
+            new_agent = MCCFRAgent(env, model_path=model_path)
+            new_agent.load()
+        finally:
+            shutil.rmtree(model_path)
+        self.assertEqual(len(agent.average_policy), len(new_agent.average_policy))
+        self.assertEqual(agent.iteration, new_agent.iteration)
+
+    def test_sample_action(self):
+        self.assertEqual(sample_action(np.array([0., 1., 0.])), 1)
+        with self.assertRaises(ValueError):
+            MCCFRAgent(rlcard.make('leduc-holdem', allow_step_back=True), sampling='unknown')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@ import unittest
 import tensorflow as tf
 import numpy as np
 
-from rlcard.agents.nfsp_agent import NFSPAgent, ReservoirBuffer
+from rlcard.agents.nfsp_agent import NFSPAgent, ReservoirBuffer, Transition
 
 class TestNFSP(unittest.TestCase):
 
@@ -84,6 +84,26 @@ class TestNFSP(unittest.TestCase):
         buff.clear()
         self.assertEqual(len(buff), 0)
 
+    def test_reservoir_buffer_arrays(self):
+        buff = ReservoirBuffer(100)
+        for i in range(50):
+            buff.add(Transition(np.full((2, 3), float(i)), np.array([i, 0.5])))
+        buff.add_batch(Transition(np.zeros((1000, 2, 3)), np.zeros((1000, 2))))
+        self.assertEqual(len(buff), 100)
+        self.assertEqual(buff._add_calls, 1050)
+        info_states, action_probs = buff.sample(10)
+        self.assertEqual(info_states.shape, (10, 2, 3))
+        self.assertEqual(info_states.dtype, np.float32)
+        self.assertEqual(action_probs.shape, (10, 2))
+        # About 5 of the 50 first elements are kept
+        kept = sum(1 for transition in buff if transition.action_probs[1] == 0.5)
+        self.assertLess(kept, 20)
+
+        # The buffer is filled by a batch first
+        buff = ReservoirBuffer(10)
+        buff.add_batch(np.arange(5))
+        self.assertEqual(list(buff), [0, 1, 2, 3, 4])
+
     def test_evaluate_with(self):
         # Test average policy and value error here
         sess = tf.InteractiveSession()
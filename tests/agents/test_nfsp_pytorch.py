@@ -2,6 +2,7 @@ import unittest
 import torch
 import numpy as np
 
+import rlcard
 from rlcard.agents.nfsp_agent_pytorch import NFSPAgent
 
 class TestNFSP(unittest.TestCase):
@@ -54,3 +55,25 @@ class TestNFSP(unittest.TestCase):
                 agent.train_rl()
 
             agent.train_sl()
+
+    def test_train_sl_integer_obs(self):
+
+        env = rlcard.make('uno')
+        agent = NFSPAgent(scope='nfsp',
+                         action_num=env.action_num,
+                         state_shape=env.state_shape,
+                         hidden_layers_sizes=[10],
+                         reservoir_buffer_capacity=50,
+                         anticipatory_param=1,
+                         batch_size=4,
+                         min_buffer_size_to_learn=4,
+                         q_mlp_layers=[10],
+                         device=torch.device('cpu'))
+
+        state, _ = env.init_game()
+        self.assertTrue(np.issubdtype(state['obs'].dtype, np.integer))
+        for _ in range(8):
+            agent.sample_episode_policy()
+            agent.step(state)
+        loss = agent.train_sl()
+        self.assertGreaterEqual(loss, 0)
@@ -0,0 +1,57 @@
+import unittest
+import shutil
+import tempfile
+import numpy as np
+
+import rlcard
+from rlcard.agents.parallel_cfr_agent import ParallelCFRAgent, SharedCFRTable
+
+class TestParallelCFR(unittest.TestCase):
+
+    def test_train(self):
+        env = rlcard.make('leduc-holdem', allow_step_back=True)
+        for variant in ['vanilla', 'cfr+']:
+            agent = ParallelCFRAgent(env, process_num=2, deal_num=4, variant=variant)
+            try:
+                for _ in range(5):
+                    agent.train()
+                size = len(agent.table)
+                self.assertGreater(size, 0)
+                self.assertTrue(np.allclose(agent.table.policy[:size].sum(axis=1), 1))
+                self.assertTrue(np.array_equal(agent.shared_policy[:size], agent.table.policy[:size]))
+            finally:
+                agent.close()
+            self.assertEqual(agent.workers, [])
+
+    def test_save_and_load(self):
+        env = rlcard.make('leduc-holdem', allow_step_back=True)
+        model_path = tempfile.mkdtemp()
+        agent = ParallelCFRAgent(env, process_num=2, model_path=model_path)
+        try:
+            agent.train()
+            agent.save()
+            agent.load()
+            self.assertEqual(agent.workers, [])
+            agent.train()
+            self.assertEqual(agent.iteration, 2)
+        finally:
+            agent.close()
+            shutil.rmtree(model_path)
+
+    def test_shared_table(self):
+        arrays = [np.zeros((4, 2)) for _ in range(3)]
+        table = SharedCFRTable(*arrays)
+        table.sync([b'a'])
+        table.get_id(b'b')
+        table.regrets[1] = 1
+        self.assertEqual(table.new_keys(), [b'b'])
+        table.sync([b'c'])
+        self.assertEqual(table.keys, [b'a', b'c'])
+        self.assertEqual(table.regrets.sum(), 0)
+        for key in [b'd', b'e']:
+            table.get_id(key)
+        with self.assertRaises(MemoryError):
+            table.get_id(b'f')
+
+if __name__ == '__main__':
+    unittest.main()
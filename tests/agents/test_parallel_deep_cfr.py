@@ -0,0 +1,49 @@
+import unittest
+import tensorflow as tf
+import numpy as np
+
+import rlcard
+from rlcard.agents.parallel_deep_cfr_agent import ParallelDeepCFR, TraversalWorker
+
+class TestParallelDeepCFR(unittest.TestCase):
+
+    def test_train(self):
+        sess = tf.InteractiveSession()
+        env = rlcard.make('leduc-holdem', allow_step_back=True)
+        agent = ParallelDeepCFR(session=sess,
+                                env=env,
+                                process_num=2,
+                                policy_network_layers=(16,16),
+                                advantage_network_layers=(16,16),
+                                num_traversals=6,
+                                num_step=2,
+                                batch_size_advantage=32,
+                                batch_size_strategy=32,
+                                memory_capacity=int(1e5),
+                                traversal_batch_size=2)
+        try:
+            for _ in range(2):
+                agent.train()
+            self.assertEqual(len(agent.workers), 2)
+            for player in range(env.player_num):
+                self.assertGreater(len(agent._advantage_memories[player]), 0)
+            iterations = agent._strategy_memories.all().iteration
+            self.assertEqual(sorted(set(iterations.tolist())), [1, 2, 3, 4])
+
+            # The workers evaluate the same advantages as the networks
+            agent.share_weights()
+            worker = TraversalWorker(env, agent.shared_weights, [[tuple(variable.get_shape().as_list()) for variable in variables]
+                                                                 for variables in agent._weight_variables])
+            worker.load_weights()
+            info_states = np.random.random_sample((5, int(np.prod(env.state_shape))))
+            for player in range(env.player_num):
+                self.assertTrue(np.allclose(worker._advantages(player, info_states),
+                                            agent._advantages(player, info_states), atol=1e-5))
+        finally:
+            agent.close()
+        self.assertEqual(agent.workers, [])
+        sess.close()
+        tf.reset_default_graph()
+
+if __name__ == '__main__':
+    unittest.main()
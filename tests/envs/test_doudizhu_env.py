@@ -1,7 +1,9 @@
 import unittest
+import numpy as np
 from rlcard.envs.doudizhu import DoudizhuEnv as Env
 from rlcard.utils.utils import get_downstream_player_id
 from rlcard.agents.random_agent import RandomAgent
+from rlcard.games.doudizhu.utils import encode_cards
 
 
 class TestDoudizhuEnv(unittest.TestCase):
@@ -39,6 +41,33 @@ class TestDoudizhuEnv(unittest.TestCase):
         with self.assertRaises(Exception):
             env.step_back()
 
+    def test_incremental_obs(self):
+        def encode(state):
+            # Encode the strings of the state from scratch
+            obs = np.zeros((6, 5, 15), dtype=int)
+            obs[:, 0] = 1
+            encode_cards(obs[0], state['current_hand'])
+            encode_cards(obs[1], state['others_hand'])
+            for i, action in enumerate(state['trace'][-3:]):
+                if action[1] != 'pass':
+                    encode_cards(obs[4-i], action[1])
+            encode_cards(obs[5], state['played_cards'])
+            return obs
+
+        env = Env(allow_step_back=True)
+        state, player_id = env.init_game()
+        steps = 0
+        while not env.is_over():
+            self.assertTrue(np.array_equal(state['obs'], encode(env.game.get_state(player_id))))
+            state, player_id = env.step(np.random.choice(state['legal_actions']))
+            steps += 1
+        while steps > 0:
+            state, player_id = env.step_back()
+            steps -= 1
+            self.assertTrue(np.array_equal(state['obs'], encode(env.game.get_state(player_id))))
+        for player in env.game.players:
+            self.assertEqual(player.hand_counts.sum(), len(player.current_hand))
+
     def test_run(self):
         env = Env()
         env.set_agents([RandomAgent(309), RandomAgent(309), RandomAgent(309)])
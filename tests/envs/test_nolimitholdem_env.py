@@ -66,5 +66,17 @@ class TestNolimitholdemEnv(unittest.TestCase):
         self.assertEqual(total, 0)
 
 
+    def test_equity_features(self):
+        env = Env()
+        env.enable_equity_features(sample_num=100)
+        self.assertEqual(env.state_shape, [56])
+        state, _ = env.init_game()
+        self.assertEqual(state['obs'].size, 56)
+        while not env.is_over():
+            state, _ = env.step(state['legal_actions'][0])
+        for player_id in range(env.player_num):
+            features = env.get_state(player_id)['obs'][-2:]
+            self.assertTrue(((features >= 0) & (features <= 1)).all())
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.envs.vec_env import VectorEnv
+
+ENV_IDS = ['blackjack', 'doudizhu', 'limit-holdem', 'no-limit-holdem', 'leduc-holdem',
+           'uno', 'mahjong', 'hearts', 'heartsmini']
+
+class TestVectorEnv(unittest.TestCase):
+
+    def test_make_vec(self):
+        vec_env = rlcard.make_vec('leduc-holdem', 4)
+        self.assertIsInstance(vec_env, VectorEnv)
+        self.assertEqual(vec_env.num_envs, 4)
+        with self.assertRaises(ValueError):
+            rlcard.make_vec('test_random_make_vec', 4)
+
+    def test_reset(self):
+        vec_env = rlcard.make_vec('leduc-holdem', 3)
+        obs, mask, player_ids = vec_env.reset()
+        self.assertEqual(obs.shape, (3, 6))
+        self.assertEqual(mask.shape, (3, vec_env.action_num))
+        self.assertEqual(player_ids.shape, (3,))
+        for i, state in enumerate(vec_env.get_states()):
+            self.assertTrue(np.array_equal(obs[i], state['obs']))
+            self.assertEqual(list(np.flatnonzero(mask[i])), sorted(state['legal_actions']))
+
+    def test_step_all_envs(self):
+        for env_id in ENV_IDS:
+            vec_env = rlcard.make_vec(env_id, 2)
+            obs, mask, _ = vec_env.reset()
+            self.assertEqual(obs.shape[0], 2)
+            finished = 0
+            while finished < 2:
+                actions = [np.random.choice(np.flatnonzero(row)) for row in mask]
+                obs, mask, _, payoffs, dones = vec_env.step(actions)
+                self.assertEqual(payoffs.shape, (2, vec_env.player_num))
+                self.assertFalse(np.any(payoffs[~dones]))
+                finished += np.sum(dones)
+                self.assertTrue(np.all(mask.any(axis=1)))
+
+    def test_shared_obs(self):
+        for env_id in ENV_IDS:
+            dtype = np.int8 if env_id in ['doudizhu', 'uno', 'mahjong'] else np.float32
+            vec_env = rlcard.make_vec(env_id, 2, obs_dtype=dtype)
+            obs, mask, player_ids = vec_env.reset()
+            self.assertEqual(obs.dtype, dtype)
+            for _ in range(5):
+                for i, env in enumerate(vec_env.envs):
+                    # The same observation as without the buffer
+                    buffer, env.obs_buffer = env.obs_buffer, None
+                    self.assertTrue(np.array_equal(obs[i], env.get_state(player_ids[i])['obs']))
+                    env.obs_buffer = buffer
+                actions = [np.random.choice(np.flatnonzero(row)) for row in mask]
+                next_obs, mask, player_ids, _, _ = vec_env.step(actions)
+                self.assertIs(next_obs, obs)
+
+    def test_set_obs_buffer(self):
+        env = rlcard.make('leduc-holdem')
+        buffer = env.set_obs_buffer(dtype=np.int8)
+        state, _ = env.init_game()
+        self.assertIs(state['obs'], buffer)
+        self.assertEqual(buffer.dtype, np.int8)
+        with self.assertRaises(ValueError):
+            env.set_obs_buffer(np.zeros(7))
+
+    def test_step_wrong_number_of_actions(self):
+        vec_env = rlcard.make_vec('blackjack', 2)
+        vec_env.reset()
+        with self.assertRaises(ValueError):
+            vec_env.step([0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+
+from rlcard.games.doudizhu.utils import CARD_TYPE, CARD_RANK_STR, contains_cards
+from rlcard.games.doudizhu.move_generator import cards2counts, pack_cards, pack_counts, get_move_table
+
+class TestDoudizhuMoveGenerator(unittest.TestCase):
+
+    def test_cards2counts(self):
+        counts = cards2counts('33345BR')
+        self.assertEqual(counts[0], 3)
+        self.assertEqual(counts[1], 1)
+        self.assertEqual(counts[2], 1)
+        self.assertEqual(counts[13], 1)
+        self.assertEqual(counts[14], 1)
+        self.assertEqual(np.sum(counts), 7)
+
+    def test_pack_cards(self):
+        self.assertEqual(pack_cards('33345BR'), int(pack_counts(cards2counts('33345BR'))))
+
+    def test_table(self):
+        move_table = get_move_table()
+        self.assertEqual(len(move_table.cards), len(CARD_TYPE[1]))
+        for card_type, (start, stop) in move_table.type_slices.items():
+            for cards in move_table.cards[start:stop]:
+                self.assertEqual(CARD_TYPE[0][cards][0][0], card_type)
+
+    def test_playable_cards(self):
+        move_table = get_move_table()
+        hand = '3344556677899TJQKAA22R'
+        playable_cards = set(move_table.playable_cards(pack_cards(hand)))
+        for cards in CARD_TYPE[1]:
+            self.assertEqual(cards in playable_cards, contains_cards(hand, cards))
+
+    def test_playable_rows(self):
+        move_table = get_move_table()
+        rows = move_table.playable_rows(pack_cards('3344556677899TJQKAA22R'))
+        sub_rows = move_table.playable_rows(pack_cards('33445567'), rows)
+        self.assertTrue(np.array_equal(sub_rows, move_table.playable_rows(pack_cards('33445567'))))
+
+    def test_greater_cards(self):
+        move_table = get_move_table()
+        hand = '3344556677899TJQKAA22R'
+        greater_cards = move_table.greater_cards(pack_cards(hand), 'solo', CARD_RANK_STR.index('K'))
+        self.assertEqual(greater_cards, ['A', '2', 'R'])
+        greater_cards = move_table.greater_cards(pack_cards(hand), 'trio_solo', -1)
+        self.assertEqual(greater_cards, [])
+        greater_cards = move_table.greater_cards(pack_cards('333444567'), 'trio_solo_chain_2', -1)
+        for cards in greater_cards:
+            self.assertEqual(CARD_TYPE[0][cards][0][0], 'trio_solo_chain_2')
+            self.assertTrue(contains_cards('333444567', cards))
+        self.assertIn('33344456', greater_cards)
+
+if __name__ == '__main__':
+    unittest.main()
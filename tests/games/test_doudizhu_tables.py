@@ -0,0 +1,80 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from rlcard.games.doudizhu.tables import compile_tables, write_tables, read_tables, load_tables, source_hash, _open_tables
+from rlcard.games.doudizhu.utils import SPECIFIC_MAP, CARD_TYPE, TYPE_CARD
+
+class TestDoudizhuTables(unittest.TestCase):
+
+    def test_write_and_read(self):
+        arrays, meta = compile_tables()
+        model_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(model_dir, 'tables.bin')
+            write_tables(arrays, meta, path)
+            tables = read_tables(path)
+            for name, array in arrays.items():
+                self.assertTrue(np.array_equal(getattr(tables, name), array))
+            self.assertEqual(tables.card_types, meta['card_types'])
+            with self.assertRaises(ValueError):
+                with open(path, 'r+b') as file:
+                    file.write(b'NOTATABL')
+                read_tables(path)
+        finally:
+            shutil.rmtree(model_dir)
+
+    def test_open_tables(self):
+        arrays, meta = compile_tables()
+        model_dir = tempfile.mkdtemp()
+        try:
+            # A file compiled from other JSON files is compiled again
+            path = os.path.join(model_dir, 'tables.bin')
+            write_tables(arrays, dict(meta, source_hash='stale'), path)
+            tables = _open_tables((path,))
+            self.assertEqual(tables.source_hash, source_hash())
+            self.assertEqual(read_tables(path).source_hash, source_hash())
+            self.assertEqual(os.listdir(model_dir), ['tables.bin'])
+
+            # The next path is used when a directory is not writable
+            not_writable = os.path.join(path, 'tables.bin')
+            cache_path = os.path.join(model_dir, 'cache', 'tables.bin')
+            _open_tables((not_writable, cache_path))
+            inode = os.stat(cache_path).st_ino
+            # The up-to-date file is read, not written again
+            _open_tables((not_writable, cache_path))
+            self.assertEqual(os.stat(cache_path).st_ino, inode)
+
+            # The tables are kept in memory when no path is writable
+            tables = _open_tables((not_writable,))
+            self.assertTrue(np.array_equal(tables.moves, arrays['moves']))
+            self.assertFalse(tables.moves.flags.writeable)
+        finally:
+            shutil.rmtree(model_dir)
+
+    def test_load_tables(self):
+        tables = load_tables()
+        self.assertIs(tables, load_tables())
+        self.assertFalse(tables.move_counts.flags.writeable)
+        index = tables.move_index['33344456']
+        self.assertEqual(tables.move_list[index], '33344456')
+        start, end = tables.type_range('trio_solo_chain_2')
+        self.assertTrue(start <= index < end)
+
+    def test_views(self):
+        self.assertEqual(SPECIFIC_MAP['pass'], ['pass'])
+        self.assertEqual(SPECIFIC_MAP['33344456'], ['333444**'])
+        self.assertEqual(CARD_TYPE[0]['3'], [['solo', '0']])
+        self.assertEqual(CARD_TYPE[0]['BR'], [['rocket', '0']])
+        self.assertIn('BR', CARD_TYPE[2])
+        self.assertNotIn('BRR', CARD_TYPE[2])
+        self.assertEqual(len(CARD_TYPE[1]), len(CARD_TYPE[2]))
+        self.assertEqual(TYPE_CARD['bomb']['0'], ['3333'])
+        self.assertEqual(len(TYPE_CARD), 37)
+        with self.assertRaises(KeyError):
+            SPECIFIC_MAP['not a move']
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import numpy as np
+
+from rlcard.games.limitholdem.equity import EquityCalculator
+
+class TestLimitholdemEquity(unittest.TestCase):
+
+    def test_river(self):
+        calculator = EquityCalculator()
+        # A royal flush on the board is shared by everyone
+        self.assertEqual(calculator.equity(['S2', 'H3'], ['SA', 'SK', 'SQ', 'SJ', 'ST']), 0.5)
+        # The nuts
+        self.assertEqual(calculator.equity(['SA', 'SK'], ['SQ', 'SJ', 'ST', 'H2', 'D3']), 1.0)
+        self.assertEqual(calculator.hand_strength(['SA', 'SK'], ['SQ', 'SJ', 'ST', 'H2', 'D3']), 1.0)
+
+    def test_preflop(self):
+        np.random.seed(0)
+        calculator = EquityCalculator(sample_num=2000)
+        # Pocket aces win about 85% against one random hand, 64% against three
+        self.assertAlmostEqual(calculator.equity(['SA', 'HA'], []), 0.85, delta=0.03)
+        self.assertAlmostEqual(calculator.equity(['SA', 'HA'], [], opponent_num=3), 0.64, delta=0.04)
+        self.assertLess(calculator.equity(['S7', 'H2'], []), 0.4)
+        self.assertLess(calculator.hand_strength(['S7', 'H2'], []), calculator.hand_strength(['S3', 'H3'], []))
+
+    def test_cache(self):
+        calculator = EquityCalculator(sample_num=100, cache_size=2)
+        equity = calculator.equity(['SA', 'HK'], ['D2', 'C7', 'S9'])
+        # Isomorphic hands share the cached value
+        self.assertEqual(calculator.equity(['HA', 'SK'], ['C2', 'D7', 'H9']), equity)
+        calculator.equity(['S3', 'H3'], [])
+        calculator.equity(['S4', 'H4'], [])
+        self.assertEqual(len(calculator.cache), 2)
+
+if __name__ == '__main__':
+    unittest.main()
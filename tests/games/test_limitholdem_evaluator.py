@@ -0,0 +1,93 @@
+import unittest
+import random
+import numpy as np
+
+from rlcard.core import Card
+from rlcard.games.limitholdem import evaluator
+from rlcard.games.limitholdem.evaluator import evaluate, evaluate_batch, get_category, compare_strengths
+from rlcard.games.limitholdem.judger import LimitholdemJudger
+from rlcard.games.limitholdem.utils import compare_hands
+from rlcard.games.limitholdem.player import LimitholdemPlayer
+
+class TestLimitholdemEvaluator(unittest.TestCase):
+
+    def test_categories(self):
+        hands = [['SJ', 'ST', 'SQ', 'SK', 'S9', 'H8', 'CA'],
+                 ['CJ', 'SJ', 'HJ', 'DJ', 'C9', 'C8', 'C7'],
+                 ['CJ', 'SJ', 'HJ', 'D9', 'C9', 'C8', 'C7'],
+                 ['CA', 'CQ', 'CT', 'C8', 'C6', 'H4', 'D2'],
+                 ['CJ', 'ST', 'HQ', 'DK', 'D9', 'C8', 'C7'],
+                 ['CJ', 'SJ', 'HJ', 'D9', 'C2', 'C7', 'C4'],
+                 ['CJ', 'SJ', 'H9', 'D9', 'C2', 'C8', 'C7'],
+                 ['CJ', 'SJ', 'H9', 'D3', 'C2', 'C8', 'C7'],
+                 ['CJ', 'S5', 'H9', 'D4', 'C2', 'C8', 'C7']]
+        categories = [get_category(evaluate(hand)) for hand in hands]
+        self.assertEqual(categories, [9, 8, 7, 6, 5, 4, 3, 2, 1])
+
+    def test_straights(self):
+        wheel = evaluate(['SA', 'H2', 'D3', 'C4', 'S5', 'HJ', 'DK'])
+        six_high = evaluate(['S6', 'H2', 'D3', 'C4', 'S5', 'HJ', 'DK'])
+        self.assertEqual(get_category(wheel), evaluator.STRAIGHT)
+        self.assertEqual(get_category(six_high), evaluator.STRAIGHT)
+        self.assertLess(wheel, six_high)
+        steel_wheel = evaluate(['SA', 'S2', 'S3', 'S4', 'S5', 'HA', 'DA'])
+        self.assertEqual(get_category(steel_wheel), evaluator.STRAIGHT_FLUSH)
+        # The ace of a wheel is low
+        self.assertEqual(wheel, evaluate(['HA', 'S2', 'C3', 'D4', 'H5', 'SQ', 'S9']))
+        self.assertGreater(wheel, evaluate(['SA', 'HA', 'DA', 'C4', 'S5', 'HJ', 'DK']))
+        self.assertLess(wheel, evaluate(['S6', 'H7', 'D3', 'C4', 'S5', 'HJ', 'DK']))
+        self.assertLess(steel_wheel, evaluate(['S6', 'S2', 'S3', 'S4', 'S5', 'HA', 'DA']))
+        self.assertGreater(steel_wheel, evaluate(['SA', 'HA', 'DA', 'CA', 'S5', 'HK', 'DK']))
+        # Without a five there is no straight
+        self.assertEqual(get_category(evaluate(['SA', 'H2', 'D3', 'C4', 'S6', 'HJ', 'DK'])), evaluator.HIGH_CARD)
+
+    def test_kickers(self):
+        # The best five cards are compared, the other two are ignored
+        self.assertEqual(evaluate(['CA', 'SA', 'HK', 'DQ', 'CJ', 'S3', 'H2']),
+                         evaluate(['DA', 'HA', 'SK', 'CQ', 'SJ', 'D4', 'C3']))
+        self.assertGreater(evaluate(['CA', 'SA', 'HK', 'DQ', 'CJ', 'S3', 'H2']),
+                           evaluate(['DA', 'HA', 'SK', 'CQ', 'ST', 'D9', 'C3']))
+        # Three pairs, the kicker may come from the third pair
+        self.assertGreater(evaluate(['CA', 'SA', 'HK', 'DK', 'CQ', 'SQ', 'H2']),
+                           evaluate(['DA', 'HA', 'SK', 'CK', 'SJ', 'D4', 'C3']))
+
+    def test_compare_hands(self):
+        # The original evaluator of rlcard.games.limitholdem.utils is an
+        # independent oracle, except for the 5-high and 6-high straights
+        random.seed(0)
+        deck = list(evaluator.CARD2INDEX)
+        low_straights = [set('A2345'), set('23456')]
+        compared = 0
+        while compared < 300:
+            cards = random.sample(deck, 9)
+            hands = [cards[:2] + cards[4:], cards[2:4] + cards[4:]]
+            if any(straight <= set(card[1] for card in hand) for hand in hands for straight in low_straights):
+                continue
+            expected = compare_hands([list(hand) for hand in hands])
+            self.assertEqual(compare_strengths([evaluate(hand) for hand in hands]), expected)
+            compared += 1
+
+    def test_batch(self):
+        random.seed(1)
+        hands = np.array([random.sample(range(52), 7) for _ in range(100)])
+        strengths = evaluate_batch(hands)
+        self.assertEqual(strengths.tolist(), [evaluate(hand) for hand in hands.tolist()])
+        # Hands of 5 and 6 cards
+        self.assertEqual(evaluate_batch(hands[:, :5]).tolist(), [evaluate(hand) for hand in hands[:, :5].tolist()])
+        self.assertEqual(evaluate_batch(hands[:, :6]).tolist(), [evaluate(hand) for hand in hands[:, :6].tolist()])
+
+    def test_compare_strengths(self):
+        self.assertEqual(compare_strengths([3, None, 5]), [0, 0, 1])
+        self.assertEqual(compare_strengths([5, 2, 5]), [1, 0, 1])
+
+    def test_judge_game(self):
+        players = [LimitholdemPlayer(i) for i in range(2)]
+        for player in players:
+            player.in_chips = 4
+        public_cards = [Card('S', 'A'), Card('H', '2'), Card('D', '3'), Card('C', '4'), Card('S', 'J')]
+        hands = [[Card('H', 'A'), Card('D', 'K')] + public_cards, [Card('C', '5'), Card('D', '9')] + public_cards]
+        self.assertEqual(LimitholdemJudger.judge_game(players, hands), [-4, 4])
+        self.assertEqual(LimitholdemJudger.judge_game(players, [hands[0], None]), [4, -4])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,11 @@ import numpy as np
 
 from rlcard.games.mahjong.game import MahjongGame as Game
 from rlcard.games.mahjong.player import MahjongPlayer as Player
+from rlcard.games.mahjong.utils import init_deck, card_encoding_dict
+from rlcard.games.mahjong.dealer import MahjongDealer as Dealer
+from rlcard.games.mahjong.judger import MahjongJudger as Judger
+from rlcard.games.mahjong.card import MahjongCard as Card
+from rlcard.games.mahjong.hu import cards2counts
 
 class TestMahjongMethods(unittest.TestCase):
 
@@ -68,6 +73,44 @@ class TestMahjongMethods(unittest.TestCase):
         success = game.step_back()
         self.assertEqual(success, False)
 
+    def test_card_ids(self):
+        for card in init_deck():
+            self.assertEqual(card.id, card_encoding_dict[card.get_str()])
+
+    def test_player_counts(self):
+        game = Game(allow_step_back=True)
+        state, _ = game.init_game()
+        for _ in range(100):
+            if game.is_over():
+                break
+            for player in game.players:
+                self.assertEqual(player.counts, cards2counts(player.hand))
+            state, _ = game.step(np.random.choice(game.get_legal_actions(state)))
+        while game.step_back():
+            pass
+        for player in game.players:
+            self.assertEqual(player.counts, cards2counts(player.hand))
+
+    def test_judge_pong_chow(self):
+        dealer = Dealer()
+        players = [Player(i) for i in range(4)]
+        players[2].add_card(Card('dots', '5'))
+        players[2].add_card(Card('dots', '5'))
+        players[1].add_card(Card('dots', '3'))
+        players[1].add_card(Card('dots', '4'))
+        dealer.table.append(Card('dots', '5'))
+        self.assertEqual(Judger.judge_pong_gong(dealer, players, 0)[:2], ('pong', players[2]))
+        self.assertEqual(Judger.judge_pong_gong(dealer, players, 2)[0], False)
+        valid_act, player, cards = Judger().judge_chow(dealer, players, 0)
+        self.assertEqual((valid_act, player), ('chow', players[1]))
+        self.assertEqual([card.get_str() for card in cards], ['dots-3', 'dots-4', 'dots-5'])
+        self.assertEqual(Judger().judge_chow(dealer, players, 1)[0], False)
+        # No chow across suits
+        players[1].add_card(Card('characters', '1'))
+        players[1].add_card(Card('characters', '2'))
+        dealer.table.append(Card('bamboo', '9'))
+        self.assertEqual(Judger().judge_chow(dealer, players, 0)[0], False)
+
     def test_player_get_player_id(self):
         player = Player(0)
         self.assertEqual(0, player.get_player_id())
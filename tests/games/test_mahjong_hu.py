@@ -0,0 +1,75 @@
+import unittest
+import random
+
+from rlcard.games.mahjong.card import MahjongCard as Card
+from rlcard.games.mahjong.player import MahjongPlayer as Player
+from rlcard.games.mahjong.judger import MahjongJudger as Judger
+from rlcard.games.mahjong.utils import init_deck
+from rlcard.games.mahjong.hu import cards2counts, suit_sets, count_sets, judge_hu
+
+def brute_force_sets(counts):
+    ''' The maximum number of sets by trying every pong and chow
+    '''
+    best = 0
+    for i, count in enumerate(counts):
+        if count >= 3:
+            counts[i] -= 3
+            best = max(best, 1 + brute_force_sets(counts))
+            counts[i] += 3
+        if i < 27 and i % 9 < 7 and count and counts[i + 1] and counts[i + 2]:
+            for j in range(i, i + 3):
+                counts[j] -= 1
+            best = max(best, 1 + brute_force_sets(counts))
+            for j in range(i, i + 3):
+                counts[j] += 1
+    return best
+
+class TestMahjongHu(unittest.TestCase):
+
+    def test_suit_sets(self):
+        self.assertEqual(suit_sets([1, 1, 1, 0, 0, 0, 0, 0, 0]), (1, -1))
+        self.assertEqual(suit_sets([3, 1, 1, 0, 0, 0, 0, 0, 0]), (1, 1))
+        self.assertEqual(suit_sets([1, 1, 4, 1, 1, 0, 0, 0, 0]), (2, 2))
+        self.assertEqual(suit_sets([0] * 9), (0, -1))
+
+    def test_count_sets(self):
+        random.seed(0)
+        deck = init_deck()
+        for _ in range(100):
+            counts = cards2counts(random.sample(deck, 14))
+            without_pair, with_pair = count_sets(counts)
+            self.assertEqual(without_pair, brute_force_sets(list(counts)))
+            pairs = [i for i, count in enumerate(counts) if count >= 2]
+            expected = -1
+            for i in pairs:
+                counts[i] -= 2
+                expected = max(expected, brute_force_sets(list(counts)))
+                counts[i] += 2
+            self.assertEqual(with_pair, expected)
+
+    def test_judge_hu(self):
+        cards = [Card('bamboo', '1'), Card('bamboo', '2'), Card('bamboo', '3'),
+                 Card('dots', '5'), Card('dots', '5'), Card('dots', '5'),
+                 Card('characters', '7'), Card('characters', '8'), Card('characters', '9'),
+                 Card('winds', 'east'), Card('winds', 'east'), Card('winds', 'east'),
+                 Card('dragons', 'red'), Card('dragons', 'red')]
+        self.assertEqual(judge_hu(cards2counts(cards), 0), (True, 4))
+        self.assertEqual(judge_hu(cards2counts(cards[:-1]), 0), (False, 3))
+        self.assertEqual(judge_hu(cards2counts(cards[:4]), 0), (False, 0))
+        self.assertEqual(judge_hu(cards2counts(cards[3:]), 1), (True, 4))
+
+    def test_judger(self):
+        player = Player(0)
+        player.pile.append([Card('dots', '1')] * 3)
+        for card in [Card('bamboo', '2'), Card('characters', '2'), Card('dots', '3')]:
+            for _ in range(3):
+                player.add_card(card)
+        green = Card('dragons', 'green')
+        player.add_card(green)
+        player.add_card(green)
+        self.assertEqual(Judger().judge_hu(player), (True, 4))
+        player.remove_card(green)
+        self.assertEqual(Judger().judge_hu(player), (False, 3))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import tensorflow as tf
+import numpy as np
+
+import rlcard
+from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.agents.nfsp_agent import NFSPAgent
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.utils.exploitability import PublicTreeWalker, agent_policy, exploitability, nash_conv
+
+class TestExploitability(unittest.TestCase):
+
+    def test_random(self):
+        env = rlcard.make('leduc-holdem')
+        agent = RandomAgent(env.action_num)
+        walker = PublicTreeWalker(env, [agent, agent])
+        values = [walker.best_response_value(player_id) for player_id in range(2)]
+        # The game is symmetric when the first player is random
+        self.assertAlmostEqual(values[0], values[1])
+        self.assertGreater(values[0], 0)
+        self.assertAlmostEqual(nash_conv(env, [agent, agent]), sum(values))
+        self.assertAlmostEqual(exploitability(env, [agent, agent]), sum(values) / 2)
+
+    def test_always_fold(self):
+        env = rlcard.make('leduc-holdem')
+        fold = env.actions.index('fold')
+        def always_fold(state):
+            probs = np.zeros(env.action_num)
+            probs[fold] = 1
+            return probs
+        walker = PublicTreeWalker(env, [always_fold, always_fold])
+        # The best response never folds and wins the ante of the other player
+        self.assertAlmostEqual(walker.best_response_value(0), 1.0)
+        self.assertAlmostEqual(walker.best_response_value(1), 1.0)
+
+    def test_cfr(self):
+        env = rlcard.make('leduc-holdem', allow_step_back=True)
+        agent = CFRAgent(env, variant='cfr+')
+        initial = exploitability(env, [agent, agent])
+        for _ in range(20):
+            agent.train()
+        self.assertLess(exploitability(env, [agent, agent]), initial)
+
+    def test_nfsp(self):
+        env = rlcard.make('leduc-holdem')
+        sess = tf.InteractiveSession()
+        tf.Variable(0, name='global_step', trainable=False)
+        agent = NFSPAgent(sess=sess,
+                          scope='nfsp',
+                          action_num=env.action_num,
+                          state_shape=env.state_shape,
+                          hidden_layers_sizes=[10,10],
+                          q_mlp_layers=[10,10])
+        sess.run(tf.global_variables_initializer())
+        state = env.init_game()[0]
+        probs = agent_policy(agent)(state)
+        self.assertAlmostEqual(probs.sum(), 1.0)
+        self.assertEqual(np.count_nonzero(probs), len(state['legal_actions']))
+        self.assertGreater(exploitability(env, [agent, agent]), 0)
+        sess.close()
+        tf.reset_default_graph()
+
+    def test_unsupported(self):
+        env = rlcard.make('limit-holdem')
+        agent = RandomAgent(env.action_num)
+        with self.assertRaises(ValueError):
+            PublicTreeWalker(env, [agent, agent])
+        with self.assertRaises(ValueError):
+            agent_policy(None)
+
+if __name__ == '__main__':
+    unittest.main()
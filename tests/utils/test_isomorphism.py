@@ -0,0 +1,68 @@
+import unittest
+
+import rlcard
+from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.utils.isomorphism import SuitIsomorphism
+
+class TestIsomorphism(unittest.TestCase):
+
+    def test_canonicalize(self):
+        isomorphism = SuitIsomorphism('SHDC')
+        canonical = isomorphism.canonicalize([['SA', 'HK'], ['D2', 'C7', 'S9']])
+        self.assertEqual(canonical, isomorphism.canonicalize([['HA', 'SK'], ['C2', 'D7', 'H9']]))
+        self.assertEqual(sorted(canonical[0]), sorted(isomorphism.canonicalize([['HK', 'SA'], ['S9', 'C7', 'D2']])[0]))
+        self.assertNotEqual(canonical, isomorphism.canonicalize([['SA', 'SK'], ['D2', 'C7', 'S9']]))
+        # The ranks are kept
+        self.assertEqual([card[1:] for card in canonical[1]], ['2', '7', '9'])
+
+    def test_key(self):
+        isomorphism = SuitIsomorphism('SHDC')
+        key = isomorphism.key([['SA', 'SK'], ['S2', 'H7', 'DT']])
+        self.assertEqual(key, isomorphism.key([['HA', 'HK'], ['H2', 'C7', 'ST']]))
+        self.assertEqual(key, isomorphism.key([['SK', 'SA'], ['DT', 'S2', 'H7']]))
+        self.assertNotEqual(key, isomorphism.key([['SA', 'HK'], ['S2', 'H7', 'DT']]))
+
+    def test_cache(self):
+        isomorphism = SuitIsomorphism('SH', cache_size=2)
+        for groups in ([['SJ'], []], [['HJ'], []], [['SQ'], []], [['SJ'], []]):
+            isomorphism.canonicalize(groups)
+        info = isomorphism.canonical_suits.cache_info()
+        self.assertEqual(info.currsize, 2)
+        self.assertEqual(info.misses, 4)
+
+    def test_preflop_classes(self):
+        env = rlcard.make('limit-holdem')
+        env.enable_canonical_key()
+        deck = list(env.card2index)
+        keys = set()
+        for i, first in enumerate(deck):
+            for second in deck[i+1:]:
+                state = env.extract_state({'hand': [first, second], 'public_cards': [],
+                                           'raise_nums': [0, 0, 0, 0], 'legal_actions': []})
+                keys.add(state['canonical_key'])
+        # 13 pairs, 78 suited and 78 offsuit hands
+        self.assertEqual(len(keys), 169)
+
+    def test_disabled_by_default(self):
+        env = rlcard.make('leduc-holdem')
+        state, _ = env.init_game()
+        self.assertNotIn('canonical_key', state)
+        env.enable_canonical_key()
+        state, _ = env.init_game()
+        self.assertIn('canonical_key', state)
+
+    def test_cfr(self):
+        env = rlcard.make('leduc-holdem', allow_step_back=True)
+        agent = CFRAgent(env)
+        canonical_agent = CFRAgent(env, canonical=True)
+        for _ in range(10):
+            agent.train()
+            canonical_agent.train()
+        self.assertLess(len(canonical_agent.table), len(agent.table))
+        state, _ = env.init_game()
+        self.assertIn(state['canonical_key'], canonical_agent.table)
+        action = canonical_agent.eval_step(state)
+        self.assertIn(action, state['legal_actions'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.utils.rollout import RolloutEngine, SharedTransitionBuffer
+
+class WeightedAgent(object):
+    ''' Plays the legal action with the largest weight
+    '''
+
+    def __init__(self, action_num):
+        self.weights = np.zeros(action_num)
+
+    def step(self, state):
+        legal_actions = state['legal_actions']
+        return legal_actions[int(np.argmax(self.weights[legal_actions]))]
+
+    def eval_step(self, state):
+        return self.step(state)
+
+def make_random_agents(env):
+    return [RandomAgent(env.action_num) for _ in range(env.player_num)]
+
+def make_weighted_agents(env):
+    return [WeightedAgent(env.action_num) for _ in range(env.player_num)]
+
+def set_weights(agents, weights):
+    for agent in agents:
+        agent.weights = weights[0]
+
+class TestRollout(unittest.TestCase):
+
+    def test_buffer(self):
+        buffer = SharedTransitionBuffer(4, 2, 3)
+        state = {'obs': np.zeros(2), 'legal_actions': [0, 1]}
+        for i in range(6):
+            next_state = {'obs': np.full(2, i + 1), 'legal_actions': [i % 3]}
+            buffer.write([state, i, float(i), next_state, i == 5], 1)
+            state = next_state
+        batch = buffer.read(2, 4)
+        self.assertEqual(batch['action'].tolist(), [2, 3, 4, 5])
+        self.assertEqual(batch['obs'][:, 0].tolist(), [2, 3, 4, 5])
+        self.assertEqual(batch['done'].tolist(), [False, False, False, True])
+        self.assertEqual(batch['legal_actions'][1].tolist(), [True, False, False])
+
+    def test_collect(self):
+        engine = RolloutEngine('leduc-holdem', make_random_agents, process_num=2, seed=0)
+        transitions, payoffs = engine.collect(10)
+        self.assertEqual(payoffs.shape, (10, 2))
+        self.assertTrue(np.allclose(payoffs.sum(axis=1), 0))
+        self.assertEqual(transitions['obs'].shape[1], 6)
+        self.assertEqual(transitions['legal_actions'].shape[1], 4)
+        self.assertLessEqual(transitions['done'].sum(), 20)
+        # Every action of the next state of a transition that is not done is legal
+        self.assertTrue(transitions['legal_actions'][~transitions['done']].any(axis=1).all())
+        engine.collect(10)
+        engine.close()
+
+        # The same seed gives the same rollouts
+        engine = RolloutEngine('leduc-holdem', make_random_agents, process_num=2, seed=0)
+        same, _ = engine.collect(10)
+        engine.close()
+        for name in transitions:
+            self.assertTrue(np.array_equal(transitions[name], same[name]))
+
+    def test_broadcast(self):
+        engine = RolloutEngine('leduc-holdem', make_weighted_agents, process_num=2, seed=0,
+                               weight_shapes=[(4,)], set_weights=set_weights)
+        with self.assertRaises(ValueError):
+            engine.broadcast([np.zeros(3)])
+        # Always fold
+        engine.broadcast([np.array([0, 0, 1, 0], dtype=np.float32)])
+        transitions, payoffs = engine.collect(4)
+        self.assertEqual(set(transitions['action'].tolist()), {2})
+        # Always raise
+        engine.broadcast([np.array([0, 1, 0, 0], dtype=np.float32)])
+        transitions, _ = engine.collect(4)
+        self.assertIn(1, transitions['action'].tolist())
+        self.assertNotIn(2, transitions['action'].tolist())
+        engine.close()
+
+if __name__ == '__main__':
+    unittest.main()
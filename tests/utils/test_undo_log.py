@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+
+from rlcard.utils.undo_log import UndoLog
+from rlcard.games.blackjack.game import BlackjackGame
+from rlcard.games.limitholdem.game import LimitholdemGame
+from rlcard.games.leducholdem.game import LeducholdemGame
+from rlcard.games.nolimitholdem.game import NolimitholdemGame
+from rlcard.games.uno.game import UnoGame
+from rlcard.games.mahjong.game import MahjongGame
+from rlcard.games.hearts.game import HeartsGame
+
+class Dummy(object):
+    pass
+
+def snapshot(obj, path=()):
+    ''' Convert the state of a game into nested tuples of plain values
+    '''
+    if isinstance(obj, (list, tuple)):
+        return tuple(snapshot(item, path) for item in obj)
+    if isinstance(obj, dict):
+        return tuple(sorted((str(key), snapshot(value, path)) for key, value in obj.items()))
+    if isinstance(obj, np.ndarray):
+        return tuple(obj.tolist())
+    if hasattr(obj, '__dict__') and not isinstance(obj, UndoLog):
+        if id(obj) in path:
+            return 'cycle'
+        path = path + (id(obj),)
+        return (type(obj).__name__, snapshot(vars(obj), path))
+    if isinstance(obj, UndoLog):
+        return len(obj)
+    if hasattr(obj, '__slots__'):
+        return (type(obj).__name__, tuple(snapshot(getattr(obj, name, None), path) for name in obj.__slots__))
+    return obj
+
+def legal_actions(game):
+    if isinstance(game, BlackjackGame):
+        return ['hit', 'stand']
+    if isinstance(game, MahjongGame):
+        return game.get_legal_actions(game.cur_state)
+    return game.get_legal_actions()
+
+class TestUndoLog(unittest.TestCase):
+
+    def test_undo_step(self):
+        log = UndoLog()
+        self.assertFalse(log.undo_step())
+        obj = Dummy()
+        obj.count = 1
+        obj.cards = ['a', 'b']
+        cards = obj.cards
+        log.begin_step()
+        log.record(obj, 'count', 'cards', 'new')
+        obj.count = 2
+        obj.cards.pop()
+        obj.cards = []
+        obj.new = True
+        self.assertEqual(len(log), 1)
+        self.assertTrue(log.undo_step())
+        self.assertEqual(obj.count, 1)
+        self.assertIs(obj.cards, cards)
+        self.assertEqual(obj.cards, ['a', 'b'])
+        self.assertFalse(hasattr(obj, 'new'))
+        self.assertEqual(len(log), 0)
+
+    def test_record_twice(self):
+        log = UndoLog()
+        obj = Dummy()
+        obj.count = 1
+        log.begin_step()
+        log.record(obj, 'count')
+        obj.count = 2
+        log.record(obj, 'count')
+        obj.count = 3
+        log.undo_step()
+        self.assertEqual(obj.count, 1)
+
+    def test_games_step_back(self):
+        games = [BlackjackGame, LimitholdemGame, LeducholdemGame, NolimitholdemGame,
+                 UnoGame, MahjongGame, HeartsGame]
+        for game_class in games:
+            game = game_class(allow_step_back=True)
+            game.init_game()
+            snapshots = []
+            while not game.is_over() and len(snapshots) < 100:
+                actions = legal_actions(game)
+                snapshots.append(snapshot(game))
+                game.step(actions[np.random.randint(len(actions))])
+            if isinstance(game, HeartsGame) and game.is_over():
+                self.assertTrue(game.step_back())
+            while snapshots:
+                self.assertTrue(game.step_back())
+                self.assertEqual(snapshot(game), snapshots.pop(), game_class.__name__)
+            self.assertFalse(game.step_back())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import numpy as np
 from rlcard.utils.utils import get_random_cards, init_54_deck, init_standard_deck, is_in_cards, is_pair, is_single, rank2int, take_out_cards, print_card, get_random_cards, elegent_form, init_players, get_upstream_player_id, get_downstream_player_id, reorganize, set_global_seed, get_cards_from_ranks
+from rlcard.utils.utils import get_card_id, get_card_from_id, cards2ids, cards2mask
 
 from rlcard.core import Card, Player
 
@@ -24,6 +25,16 @@ class TestUtils(unittest.TestCase):
             get_random_cards(hand, -1)
 
 
+    def test_card_ids(self):
+        deck = init_54_deck()
+        self.assertEqual([card.id for card in deck], list(range(54)))
+        self.assertEqual(get_card_id('SA'), 0)
+        self.assertEqual(get_card_id('CK'), 51)
+        for card in deck:
+            self.assertEqual(get_card_from_id(card.id).get_index(), card.get_index())
+        self.assertEqual(cards2ids([Card('H', '2'), Card('RJ', '')]).tolist(), [14, 53])
+        self.assertEqual(cards2mask([Card('S', 'A'), Card('S', '3')]), 0b101)
+
     def test_is_pair(self):
         self.assertTrue(is_pair([Card('S', 'A'), Card('D', 'A')]))
         self.assertFalse(is_pair([Card('BJ', ''), Card('S', 'A'), Card('D', 'A')]))